@@ -0,0 +1,137 @@
+# bench_climate_redraw.py
+# Tk calls and time per animation tick of SmartClimateApp: the old
+# full-refresh tick against the change-driven one, with the slider idle
+# and while it is being dragged. The app is built offscreen (see
+# render_backend), so no display is needed.
+#
+#   python benchmarks/bench_climate_redraw.py [--ticks 2000]
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fuzzylogicc import SmartClimateApp
+from render_backend import OffscreenRenderer
+
+
+class UnpresentedRenderer(OffscreenRenderer):
+    """Keeps the items but never rasterizes them: only the tick's own calls are timed."""
+
+    def present(self):
+        pass
+
+
+class LegacyClimateApp(SmartClimateApp):
+    """The tick as it was before change-driven redraw: full refresh every time."""
+
+    def update_display(self, _=None):
+        rh = float(self.slider.get())
+        power = (self.dehumid_ctrl.compute(rh) if self.mode.get() == "dehumidifier"
+                 else self.humid_ctrl.compute(rh))
+        self.badge.config(text=f"Room Humidity: {rh:.0f}%")
+        self.value_lbl.config(text=f"{rh:.0f}%  |  Power: {power:.2f}")
+        if self.mode.get() == "dehumidifier":
+            self.desc_lbl.config(text="• IF humidity HIGH → strong drying\n"
+                                      "• IF humidity COMFORTABLE → medium drying\n"
+                                      "• IF humidity LOW → weak drying")
+            self._draw_fan(power)
+        else:
+            self.desc_lbl.config(text="• Low humidity → more moisture\n"
+                                      "• Near target → mist tapers smoothly\n"
+                                      "• High humidity → mist nearly stops")
+            self._draw_humidifier(power)
+
+    def _draw_fan(self, power):
+        for it in [self.tank, self.water_level] + [b["id"] for b in self.bubbles]:
+            self.canvas.itemconfigure(it, state="hidden")
+        for it in [self.fan_housing, self.fan_center] + self.fan_blades:
+            self.canvas.itemconfigure(it, state="normal")
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        cx, cy = w // 2, h // 2
+        r = min(w, h) // 2 - 20
+        self.canvas.coords(self.fan_housing, cx-r, cy-r, cx+r, cy+r)
+        self.canvas.coords(self.fan_center, cx-18, cy-18, cx+18, cy+18)
+        blade, inner = r * 0.85, r * 0.3
+        off = math.radians(8)
+        for idx, bl in enumerate(self.fan_blades):
+            theta = math.radians(self.angle + idx*90)
+            pts = [(cx + inner * math.cos(theta-off), cy + inner * math.sin(theta-off)),
+                   (cx + blade * math.cos(theta-off), cy + blade * math.sin(theta-off)),
+                   (cx + blade * math.cos(theta+off), cy + blade * math.sin(theta+off)),
+                   (cx + inner * math.cos(theta+off), cy + inner * math.sin(theta+off))]
+            self.canvas.coords(bl, *[c for pair in pts for c in pair])
+
+    def _draw_humidifier(self, power):
+        for it in [self.fan_housing, self.fan_center] + self.fan_blades:
+            self.canvas.itemconfigure(it, state="hidden")
+        for it in [self.tank, self.water_level] + [b["id"] for b in self.bubbles]:
+            self.canvas.itemconfigure(it, state="normal")
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        cx, cy = w // 2, h // 2
+        tank_w, tank_h = 120, 140
+        tank_top, tank_bottom = cy + 40, cy + 40 + tank_h
+        self.canvas.coords(self.tank, cx-tank_w//2, tank_top, cx+tank_w//2, tank_bottom)
+        level = tank_bottom - (tank_h * (0.5 + 0.5*power))
+        self.canvas.coords(self.water_level, cx-tank_w//2+4, level, cx+tank_w//2-4, tank_bottom)
+        for b in self.bubbles:
+            if power > 0.05:
+                b["y"] += b["dy"] * (2 + power*5)
+                b["x"] += math.sin(b["y"]/20) * 0.5
+                r = b["r"]
+                self.canvas.coords(b["id"], cx+b["x"]-r, b["y"]-r, cx+b["x"]+r, b["y"]+r)
+                if b["y"] < tank_top - 80:
+                    b["y"] = tank_top + random.randint(0, 20)
+                    b["x"] = random.randint(-20, 20)
+                    b["r"] = random.randint(5, 12)
+            else:
+                self.canvas.itemconfigure(b["id"], state="hidden")
+
+    def animate(self):
+        if self.mode.get() == "dehumidifier":
+            speed = 5 + self.dehumid_ctrl.compute(float(self.slider.get())) * 25
+            self.angle = (self.angle + speed) % 360
+        self.update_display()
+
+
+def make_app(cls, mode, rh):
+    app = cls(renderer=UnpresentedRenderer(560, 330))
+    app.mode.set(mode)
+    app.slider.set(rh)
+    app.update_display()
+    return app
+
+
+def run(app, ticks, drag):
+    widgets = (app.canvas, app.badge, app.value_lbl, app.desc_lbl)
+    for w in widgets:
+        w.frame()
+    app._tick_calls = 0  # the change-driven tick collects its own counts here
+    start = time.perf_counter()
+    for i in range(ticks):
+        if drag:
+            app.slider.set(20 + 70 * (i % 200) / 200)
+        app.animate()
+    elapsed = time.perf_counter() - start
+    calls = app._tick_calls + sum(sum(w.frame().values()) for w in widgets)
+    return calls / ticks, elapsed / ticks * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description="SmartClimateApp Tk calls per tick, before/after")
+    ap.add_argument("--ticks", type=int, default=2000)
+    args = ap.parse_args()
+
+    print(f"{'scenario':<28}{'calls/tick before':>18}{'after':>8}{'us/tick before':>16}{'after':>8}")
+    for mode, rh in (("dehumidifier", 70.0), ("humidifier", 35.0), ("humidifier", 80.0)):
+        for drag in (False, True):
+            before = run(make_app(LegacyClimateApp, mode, rh), args.ticks, drag)
+            after = run(make_app(SmartClimateApp, mode, rh), args.ticks, drag)
+            name = f"{mode} {rh:.0f}% {'dragging' if drag else 'idle'}"
+            print(f"{name:<28}{before[0]:>18.1f}{after[0]:>8.1f}{before[1]:>16.1f}{after[1]:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# bench_controller_service.py
+# Latency and throughput of controller_service.py under a local load
+# generator: gateways that each carry many devices and keep a number of
+# requests in flight. Runs the service in a subprocess per configuration,
+# from no coalescing (--max-batch 1) up to a few ms of batching window.
+# Client and server share the machine, so on few cores the generator's own
+# cost is part of the numbers.
+#
+#   python benchmarks/bench_controller_service.py [--gateways 8] [--devices 500] [--seconds 3]
+import argparse
+import asyncio
+import random
+import re
+import signal
+import subprocess
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from fuzzylogicc import FuzzyHumidifier
+
+CONFIGS = [  # label, service arguments
+    ("no batching", ["--max-batch", "1", "--window", "0"]),
+    ("window 0", ["--window", "0"]),
+    ("window 1 ms", ["--window", "0.001"]),
+    ("window 5 ms", ["--window", "0.005"]),
+]
+
+
+def start_service(args):
+    proc = subprocess.Popen([sys.executable, str(ROOT / "controller_service.py"), "--port", "0", *args],
+                            cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    port = re.search(r":(\d+)$", line.strip())
+    if not port:
+        proc.kill()
+        raise SystemExit(f"service did not start: {line!r}")
+    return proc, int(port.group(1))
+
+
+async def gateway(port, gid, devices, depth, deadline, latencies, check):
+    """Keep `depth` requests in flight for `devices` devices until the deadline."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    rng = random.Random(gid)
+    kinds = ("ctrl", "dehumidifier", "humidifier")
+    sent = deque()  # (send time, device, kind, rh) per outstanding request
+
+    def send():
+        device = rng.randrange(devices)
+        kind = kinds[device % 3]
+        rh = round(rng.uniform(20, 90), 1)
+        sent.append((time.perf_counter(), device, kind, rh))
+        writer.write(f"g{gid}-d{device} {kind} {rh}\n".encode())
+
+    for _ in range(depth):
+        send()
+    while sent:
+        line = await reader.readline()
+        if not line:
+            break
+        t0, device, kind, rh = sent.popleft()
+        latencies.append(time.perf_counter() - t0)
+        if kind == "humidifier":
+            check.append((f"g{gid}-d{device}", rh, float(line.split()[1])))
+        if time.perf_counter() < deadline:
+            send()
+    writer.close()
+
+
+async def load(port, gateways, devices, depth, seconds):
+    latencies, check = [], []
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(gateway(port, g, devices, depth, deadline, latencies, check)
+                           for g in range(gateways)))
+    return latencies, time.perf_counter() - start, check
+
+
+def verify(check):
+    """Each humidifier answer must match a FuzzyHumidifier per device fed the same readings."""
+    ctrls = {}
+    for device, rh, power in check:
+        expected = ctrls.setdefault(device, FuzzyHumidifier()).compute(rh)
+        if expected != power:
+            return False
+    return True
+
+
+def main():
+    ap = argparse.ArgumentParser(description="controller_service latency/throughput under load")
+    ap.add_argument("--gateways", type=int, default=8, help="client connections")
+    ap.add_argument("--devices", type=int, default=500, help="devices per gateway")
+    ap.add_argument("--depth", type=int, default=32, help="requests in flight per gateway")
+    ap.add_argument("--seconds", type=float, default=3.0)
+    args = ap.parse_args()
+
+    print(f"{args.gateways} gateways x {args.devices} devices, {args.depth} in flight each")
+    print(f"{'config':<14}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'per batch':>11}{'exact':>7}")
+    for label, service_args in CONFIGS:
+        proc, port = start_service(service_args)
+        try:
+            latencies, elapsed, check = asyncio.run(
+                load(port, args.gateways, args.devices, args.depth, args.seconds))
+        finally:
+            proc.send_signal(signal.SIGINT)  # the service prints its stats on the way out
+            stats = proc.communicate()[0]
+        per_batch = re.search(r"\(([\d.]+)/batch\)", stats)
+        ms = np.array(latencies) * 1e3
+        print(f"{label:<14}{len(ms) / elapsed:>10.0f}{np.percentile(ms, 50):>9.2f}"
+              f"{np.percentile(ms, 99):>9.2f}{ms.max():>9.2f}"
+              f"{per_batch.group(1) if per_batch else '?':>11}{'yes' if verify(check) else 'NO':>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# bench_crawler.py
+# Crawl a fake catalogue from the local fixture server with different
+# concurrency settings.
+#
+#   python benchmarks/bench_crawler.py [--products 20] [--pages 5] [--latency 0.05]
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from review_crawler import ReviewCrawler
+from fixture_server import start_fixture_server
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Review crawler throughput against a local fixture server")
+    ap.add_argument("--products", type=int, default=20)
+    ap.add_argument("--pages", type=int, default=5, help="review pages per product")
+    ap.add_argument("--latency", type=float, default=0.05, help="simulated server latency (s)")
+    ap.add_argument("--per-host", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = ap.parse_args()
+
+    server = start_fixture_server(pages_per_product=args.pages, latency=args.latency)
+    urls = [f"{server.base_url}/product-reviews/B0FIXTURE{i:03d}/" for i in range(args.products)]
+    expected = args.products * args.pages
+
+    print(f"{args.products} products x {args.pages} pages, {args.latency * 1e3:.0f} ms latency")
+    print(f"{'per-host':>9}{'seconds':>9}{'pages/s':>9}{'reviews':>9}{'peak conns':>12}")
+    for per_host in args.per_host:
+        server.hits = server.max_active = 0
+        crawler = ReviewCrawler(workers=max(per_host, 8), per_host=per_host, max_pages=args.pages)
+        start = time.perf_counter()
+        pages = reviews = 0
+        for _, _, records in crawler.crawl(urls):
+            pages += 1
+            reviews += len(records)
+        elapsed = time.perf_counter() - start
+        assert pages == expected, (pages, expected)
+        assert server.max_active <= per_host, server.max_active
+        print(f"{per_host:>9}{elapsed:>9.2f}{pages / elapsed:>9.1f}{reviews:>9}{server.max_active:>12}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
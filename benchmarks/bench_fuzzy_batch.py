@@ -0,0 +1,63 @@
+# bench_fuzzy_batch.py
+# FuzzyHumidityCtrl.compute called in a loop vs one compute_batch call,
+# on a synthetic sensor history. Also checks the two agree exactly.
+#
+#   python benchmarks/bench_fuzzy_batch.py [--samples 1000000] [--scalar-samples 100000]
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fuzzylogic import FuzzyHumidityCtrl
+
+
+def make_history(n, seed=0):
+    """Per-minute humidity readings with a daily cycle, and setpoints of 30–70 %."""
+    rng = np.random.default_rng(seed)
+    minutes = np.arange(n)
+    humidity = np.clip(50 + 25 * np.sin(2 * np.pi * minutes / 1440) + rng.normal(0, 5, n), 0, 100)
+    setpoint = rng.integers(30, 71, n).astype(float)
+    return humidity, setpoint
+
+
+def scalar_loop(ctrl, humidity, setpoint):
+    out = np.empty(len(humidity))
+    for i, (h, sp) in enumerate(zip(humidity.tolist(), setpoint.tolist())):
+        ctrl.setpoint = sp
+        out[i] = ctrl.compute(h)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Scalar vs batch fuzzy humidity control")
+    ap.add_argument("--samples", type=int, default=1_000_000, help="readings in the batch run")
+    ap.add_argument("--scalar-samples", type=int, default=100_000,
+                    help="readings in the scalar loop (it is much slower)")
+    args = ap.parse_args()
+
+    ctrl = FuzzyHumidityCtrl()
+    humidity, setpoint = make_history(args.samples)
+    n_scalar = min(args.scalar_samples, args.samples)
+
+    start = time.perf_counter()
+    expected = scalar_loop(ctrl, humidity[:n_scalar], setpoint[:n_scalar])
+    t_scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actions = ctrl.compute_batch(humidity, setpoint)
+    t_batch = time.perf_counter() - start
+
+    mismatches = np.count_nonzero(actions[:n_scalar] != expected)
+    scalar_rate = n_scalar / t_scalar
+    batch_rate = args.samples / t_batch
+    print(f"{'mode':<10}{'samples':>10}{'seconds':>10}{'samples/s':>14}")
+    print(f"{'scalar':<10}{n_scalar:>10}{t_scalar:>10.3f}{scalar_rate:>14.0f}")
+    print(f"{'batch':<10}{args.samples:>10}{t_batch:>10.3f}{batch_rate:>14.0f}")
+    print(f"speedup {batch_rate / scalar_rate:.0f}x, {mismatches} of {n_scalar} results differ from compute()")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# bench_fuzzy_engine.py
+# The three hand-written controllers vs the same controllers as
+# fuzzy_engine specs: checks the outputs are identical, then compares a
+# scalar loop over the hand-written code with one vectorized evaluate().
+#
+#   python benchmarks/bench_fuzzy_engine.py [--samples 1000000] [--scalar-samples 100000]
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fuzzylogic import FuzzyHumidityCtrl
+from fuzzylogicc import FuzzyDehumidifier, FuzzyHumidifier
+from fuzzy_engine import compile_spec, HUMIDITY_CTRL, DEHUMIDIFIER, HUMIDIFIER, DEHUMIDIFIER_MAMDANI
+
+
+class SpecHumidifier(FuzzyHumidifier):
+    """FuzzyHumidifier with base_power() from the HUMIDIFIER spec."""
+
+    def __init__(self):
+        super().__init__()
+        self.system = compile_spec(HUMIDIFIER)
+
+    def base_power(self, rh):
+        return self.system(rh=rh)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Hand-written fuzzy controllers vs fuzzy_engine specs")
+    ap.add_argument("--samples", type=int, default=1_000_000)
+    ap.add_argument("--scalar-samples", type=int, default=100_000)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    rh = rng.uniform(0, 100, args.samples)
+    few = rh[:min(args.scalar_samples, args.samples)]
+    ctrl = FuzzyHumidityCtrl(setpoint=50.0)
+
+    cases = [
+        ("FuzzyHumidityCtrl", ctrl.compute, compile_spec(HUMIDITY_CTRL),
+         lambda system, x: system.evaluate(error=x - ctrl.setpoint)),
+        ("FuzzyDehumidifier", FuzzyDehumidifier().compute, compile_spec(DEHUMIDIFIER),
+         lambda system, x: system.evaluate(rh=x)),
+        ("Humidifier base", FuzzyHumidifier().base_power, compile_spec(HUMIDIFIER),
+         lambda system, x: system.evaluate(rh=x)),
+    ]
+
+    print(f"{'controller':<20}{'hand/s':>12}{'spec/s':>14}{'speedup':>9}  differing")
+    for name, hand, system, run in cases:
+        expected, t_hand = timed(lambda xs: np.array([hand(x) for x in xs.tolist()]), few)
+        got, t_spec = timed(run, system, rh)
+        differ = np.count_nonzero(got[:len(few)] != expected)
+        hand_rate, spec_rate = len(few) / t_hand, len(rh) / t_spec
+        print(f"{name:<20}{hand_rate:>12.0f}{spec_rate:>14.0f}{spec_rate / hand_rate:>8.0f}x  {differ}/{len(few)}")
+
+    # Stateful: run the same reading sequence through both humidifiers
+    hand, spec = FuzzyHumidifier(), SpecHumidifier()
+    series = (50 + 20 * np.sin(np.arange(10_000) / 50)).tolist()
+    differ = sum(hand.compute(x) != spec.compute(x) for x in series)
+    print(f"FuzzyHumidifier.compute with spec base: {differ}/{len(series)} steps differ")
+
+    mamdani = compile_spec(DEHUMIDIFIER_MAMDANI)
+    _, t_mamdani = timed(lambda x: mamdani.evaluate(rh=x), rh)
+    print(f"Mamdani dehumidifier (101-point centroid): {len(rh) / t_mamdani:.0f} evaluations/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# bench_fuzzy_mf.py
+# Closed-form membership functions (fuzzy_mf) vs skfuzzy: import time in
+# a fresh interpreter, and per-call latency of FuzzyHumidityCtrl.compute
+# against the previous interp_membership implementation.
+#
+#   python benchmarks/bench_fuzzy_mf.py [--runs 5] [--calls 100000]
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from fuzzylogic import FuzzyHumidityCtrl
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import {module}
+print(json.dumps(time.perf_counter() - t0))
+"""
+
+
+def import_time(module):
+    out = subprocess.run([sys.executable, "-c", PROBE.format(module=module)], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+class SkfuzzyHumidityCtrl(FuzzyHumidityCtrl):
+    """compute() as it was before fuzzy_mf: sampled sets plus interp_membership."""
+
+    def __init__(self, setpoint=50.0):
+        super().__init__(setpoint)
+        import skfuzzy as fuzz
+        self.fuzz = fuzz
+        self.dry_mf = fuzz.trapmf(self.error_universe, list(self.dry_set))
+        self.ok_mf = fuzz.trimf(self.error_universe, list(self.ok_set))
+        self.wet_mf = fuzz.trapmf(self.error_universe, list(self.wet_set))
+
+    def compute(self, current_humidity):
+        error = current_humidity - self.setpoint
+        dry_level = self.fuzz.interp_membership(self.error_universe, self.dry_mf, error)
+        ok_level = self.fuzz.interp_membership(self.error_universe, self.ok_mf, error)
+        wet_level = self.fuzz.interp_membership(self.error_universe, self.wet_mf, error)
+        numerator = (dry_level * -100) + (ok_level * 0) + (wet_level * 100)
+        denominator = dry_level + ok_level + wet_level + 1e-6
+        return max(-100, min(100, numerator / denominator))
+
+
+def per_call_us(ctrl, values):
+    start = time.perf_counter()
+    for v in values:
+        ctrl.compute(v)
+    return (time.perf_counter() - start) / len(values) * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description="fuzzy_mf vs skfuzzy import time and call latency")
+    ap.add_argument("--runs", type=int, default=5, help="fresh interpreters per import measurement")
+    ap.add_argument("--calls", type=int, default=100_000)
+    args = ap.parse_args()
+
+    print(f"{'import':<12}{'median ms':>11}{'min ms':>9}")
+    for module in ("skfuzzy", "fuzzy_mf", "fuzzylogic"):
+        times = [import_time(module) for _ in range(args.runs)]
+        print(f"{module:<12}{statistics.median(times) * 1e3:>11.1f}{min(times) * 1e3:>9.1f}")
+
+    values = np.random.default_rng(0).uniform(0, 100, args.calls).tolist()
+    before, after = SkfuzzyHumidityCtrl(), FuzzyHumidityCtrl()
+    diff = max(abs(before.compute(v) - after.compute(v)) for v in values)
+    t_before, t_after = per_call_us(before, values), per_call_us(after, values)
+    print(f"\ncompute(): skfuzzy {t_before:.2f} us/call, closed form {t_after:.2f} us/call "
+          f"({t_before / t_after:.1f}x), max difference {diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
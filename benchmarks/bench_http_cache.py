@@ -0,0 +1,45 @@
+# bench_http_cache.py
+# Crawl the fixture catalogue repeatedly through the page cache: a cold
+# run, a revalidating run (conditional GETs), a max-age run and an
+# offline run.
+#
+#   python benchmarks/bench_http_cache.py [--products 20] [--pages 5] [--latency 0.02]
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from review_crawler import ReviewCrawler
+from http_cache import ResponseCache
+from fixture_server import start_fixture_server
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Page cache hit rate and bytes saved")
+    ap.add_argument("--products", type=int, default=20)
+    ap.add_argument("--pages", type=int, default=5)
+    ap.add_argument("--latency", type=float, default=0.02)
+    args = ap.parse_args()
+
+    server = start_fixture_server(pages_per_product=args.pages, latency=args.latency)
+    urls = [f"{server.base_url}/product-reviews/B0CACHE{i:03d}/" for i in range(args.products)]
+
+    runs = [("cold", {}), ("revalidate", {}), ("max-age", {"max_age": 3600}), ("offline", {"offline": True})]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        print(f"{'run':<12}{'seconds':>9}{'pages':>7}{'hit rate':>10}{'KB saved':>10}{'KB sent':>9}{'304s':>6}")
+        for name, options in runs:
+            cache = ResponseCache(cache_dir, **options)
+            server.bytes_sent = server.not_modified = 0
+            crawler = ReviewCrawler(workers=8, per_host=4, max_pages=args.pages, cache=cache)
+            start = time.perf_counter()
+            pages = sum(1 for _ in crawler.crawl(urls))
+            elapsed = time.perf_counter() - start
+            print(f"{name:<12}{elapsed:>9.2f}{pages:>7}{cache.hit_rate:>10.0%}"
+                  f"{cache.stats['bytes_saved'] / 1024:>10.0f}{server.bytes_sent / 1024:>9.0f}{server.not_modified:>6}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench_humidifier_replay.py
+# Replaying a humidity log through FuzzyHumidifier: one compute() call per
+# sample against replay(), checking the powers and the final last_rh are
+# bit-identical, plus the peak memory of streaming the log in chunks.
+#
+#   python benchmarks/bench_humidifier_replay.py [--samples 10000 100000 1000000]
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fuzzylogicc import FuzzyHumidifier
+
+
+def sensor_log(n, seed=0):
+    """A random walk around 50%RH with a daily swing, like a minute-by-minute sensor."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    walk = np.cumsum(rng.normal(0, 0.3, n))
+    return np.clip(50 + 15 * np.sin(2 * np.pi * t / 1440) + walk % 20 - 10, 0, 100)
+
+
+def sequential(series):
+    ctrl = FuzzyHumidifier()
+    out = np.array([ctrl.compute(rh) for rh in series.tolist()])
+    return out, ctrl.last_rh
+
+
+def main():
+    ap = argparse.ArgumentParser(description="FuzzyHumidifier per-sample loop vs replay()")
+    ap.add_argument("--samples", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--chunk", type=int, default=65536)
+    args = ap.parse_args()
+
+    FuzzyHumidifier().replay([50.0])  # load SciPy before anything is timed
+    print(f"{'samples':>10}{'loop s':>9}{'replay s':>10}{'speedup':>9}{'identical':>11}{'stream peak MB':>16}")
+    for n in args.samples:
+        series = sensor_log(n)
+
+        start = time.perf_counter()
+        expected, expected_last = sequential(series)
+        t_loop = time.perf_counter() - start
+
+        ctrl = FuzzyHumidifier()
+        start = time.perf_counter()
+        got = ctrl.replay(series, chunk=args.chunk)
+        t_replay = time.perf_counter() - start
+        same = np.array_equal(got, expected) and ctrl.last_rh == expected_last
+
+        # Stream without holding the output: peak stays at a few chunks whatever n is
+        ctrl = FuzzyHumidifier()
+        tracemalloc.start()
+        chunks = (series[i:i + args.chunk] for i in range(0, n, args.chunk))
+        for power in ctrl.replay_chunks(chunks):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"{n:>10}{t_loop:>9.2f}{t_replay:>10.3f}{t_loop / t_replay:>8.1f}x"
+              f"{'yes' if same else 'NO':>11}{peak / 2**20:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# bench_particles.py
+# Frame time of the mist particle update vs particle count: the old list
+# of MistParticle objects against the MistParticles array store, for the
+# physics step alone and for a whole SmartHumidityGUI.update_particles
+# frame, plus the canvas calls each frame makes. Frames draw on an
+# OffscreenRenderer that is never presented, so no display is needed and
+# rasterizing is left out; in a real window every one of those calls is a
+# Tcl round trip.
+#
+#   python benchmarks/bench_particles.py [--counts 100 500 1000 2000] [--frames 200]
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fuzzylogic import SmartHumidityGUI, MistParticles, PARTICLE_COLORS
+from canvas_pool import CallCounter
+from render_backend import OffscreenRenderer
+
+
+class MistParticle:
+    """The per-object particle the GUI used before MistParticles."""
+
+    def __init__(self, x, y, vx, vy, size, color, lifetime):
+        self.x, self.y, self.vx, self.vy = x, y, vx, vy
+        self.size, self.color, self.lifetime = size, color, lifetime
+        self.age = 0
+        self.canvas_id = None
+
+    def update(self):
+        self.x += self.vx
+        self.y += self.vy
+        self.age += 1
+        self.vx *= 0.98
+        self.vy *= 0.98
+        self.vy -= 0.1
+        return self.age < self.lifetime
+
+    def get_alpha(self):
+        return max(0, 1 - (self.age / self.lifetime))
+
+
+def update_objects(canvas, particles):
+    """The old update_particles loop."""
+    active = []
+    for particle in particles:
+        if particle.update():
+            alpha = particle.get_alpha()
+            if particle.canvas_id:
+                canvas.delete(particle.canvas_id)
+            size = particle.size * alpha
+            if size > 0.5:
+                particle.canvas_id = canvas.create_oval(
+                    particle.x - size / 2, particle.y - size / 2,
+                    particle.x + size / 2, particle.y + size / 2,
+                    fill=particle.color, outline="")
+                active.append(particle)
+        elif particle.canvas_id:
+            canvas.delete(particle.canvas_id)
+    return active
+
+
+def physics_objects(particles):
+    for particle in particles:
+        particle.update()
+        particle.get_alpha()
+
+
+def frame_ms(update, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        update()
+    return (time.perf_counter() - start) / frames * 1e3
+
+
+def calls_per_frame(canvas, update):
+    canvas.frame()
+    update()
+    return sum(canvas.frame().values())
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Mist particle frame time vs particle count")
+    ap.add_argument("--counts", type=int, nargs="+", default=[100, 500, 1000, 2000, 5000])
+    ap.add_argument("--frames", type=int, default=200)
+    args = ap.parse_args()
+
+    print(f"{'':>10}{'---- physics ms ----':>30}{'----- frame ms -----':>30}{'-- Tk calls/frame --':>22}")
+    print(f"{'particles':>10}{'objects':>10}{'arrays':>10}{'speedup':>10}{'objects':>10}{'pooled':>10}"
+          f"{'speedup':>10}{'objects':>11}{'pooled':>11}")
+    for n in args.counts:
+        rng = np.random.default_rng(0)
+        # Long-lived, large particles so the population stays at n for the whole run
+        x, y = rng.uniform(0, 450, n), rng.uniform(0, 400, n)
+        vx, vy = rng.uniform(-1, 1, n), rng.uniform(-3, -1, n)
+        size, lifetime = rng.uniform(50, 80, n), np.full(n, 10 * args.frames)
+
+        canvas = CallCounter(OffscreenRenderer(450, 400))
+        objects = [MistParticle(*v, PARTICLE_COLORS[0], lt)
+                   for *v, lt in zip(x.tolist(), y.tolist(), vx.tolist(), vy.tolist(),
+                                     size.tolist(), lifetime.tolist())]
+        state = {"particles": objects}
+
+        def update_old():
+            state["particles"] = update_objects(canvas, state["particles"])
+
+        gui = SmartHumidityGUI(renderer=OffscreenRenderer(450, 400))
+        gui.particles = MistParticles(capacity=n)
+        gui.load_level = 0  # no load shedding: draw every frame
+        gui.particles.spawn(x, y, vx, vy, size, 0, lifetime)
+        update_old()
+        gui.update_particles()  # first frame creates the ovals
+
+        p_old = frame_ms(lambda: physics_objects(objects), args.frames)
+        p_new = frame_ms(gui.particles.step, args.frames)
+        t_old = frame_ms(update_old, args.frames)
+        t_new = frame_ms(gui.update_particles, args.frames)
+        c_old = calls_per_frame(canvas, update_old)
+        gui.update_particles()
+        c_new = sum(gui.frame_calls.values())  # update_particles counts its own frame
+        assert len(state["particles"]) == len(gui.particles) == n
+        print(f"{n:>10}{p_old:>10.2f}{p_new:>10.3f}{p_old / p_new:>9.0f}x"
+              f"{t_old:>10.2f}{t_new:>10.2f}{t_old / t_new:>9.1f}x{c_old:>11}{c_new:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# bench_pipeline.py
+# Per-stage throughput and peak memory of the cselec2 pipeline on the
+# saved review pages in benchmarks/pages, fully offline. Results can be
+# saved as JSON and compared with an earlier run.
+#
+#   python benchmarks/bench_pipeline.py [--repeat 100] [--rounds 5] [--save run.json] [--compare base.json]
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import cselec2
+from cselec2 import extract_reviews_and_stars, clean_html, iter_review_records, score_reviews, analyze_reviews
+
+PAGES_DIR = Path(__file__).resolve().parent / "pages"
+
+
+def lexicon_available():
+    """True if the VADER lexicon can be loaded without going online."""
+    if cselec2.LEXICON_CACHE.exists() or cselec2.BUNDLED_LEXICON.exists():
+        return True
+    try:
+        import nltk
+        nltk.data.find(cselec2.NLTK_LEXICON)
+        return True
+    except (ImportError, LookupError):
+        return False
+
+
+def load_corpus(repeat):
+    """{layout: [html, ...]}, each saved page repeated `repeat` times."""
+    return {page.stem.removeprefix("reviews_"): [page.read_text(encoding="utf-8")] * repeat
+            for page in sorted(PAGES_DIR.glob("*.html"))}
+
+
+def make_stages(pages, score):
+    """(name, fn) pairs; every fn processes the whole set of pages."""
+    extracted = [extract_reviews_and_stars(html) for html in pages]
+    reviews = [r for rs, _ in extracted for r in rs]
+    stars = [s for _, ss in extracted for s in ss]
+    texts = [clean_html(r) for r in reviews]
+
+    stages = [
+        ("extract", lambda: [extract_reviews_and_stars(html) for html in pages]),
+        ("clean", lambda: [clean_html(r) for r in reviews]),
+        ("stream", lambda: [list(iter_review_records([html])) for html in pages]),
+    ]
+    if score:
+        def analyze():
+            with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+                analyze_reviews(reviews, stars, cache=None)
+
+        stages += [
+            ("score", lambda: score_reviews(texts, cache=None)),
+            ("analyze", analyze),
+        ]
+    return stages, len(reviews)
+
+
+def best_time(fn, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(fn):
+    """Peak Python heap allocated while running fn, in bytes."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(repeat, rounds, score):
+    results = {}
+    for layout, pages in load_corpus(repeat).items():
+        stages, n_reviews = make_stages(pages, score)
+        for stage, fn in stages:
+            fn()  # warm up regex caches and the analyzer
+            seconds = best_time(fn, rounds)
+            results[f"{layout}/{stage}"] = {
+                "seconds": seconds,
+                "pages": len(pages),
+                "reviews": n_reviews,
+                "pages_per_s": len(pages) / seconds,
+                "reviews_per_s": n_reviews / seconds,
+                "peak_kb": peak_memory(fn) / 1024,
+            }
+    return results
+
+
+def compare(results, baseline):
+    print(f"\n{'vs baseline':<20}{'reviews/s':>12}{'change':>9}{'peak KB':>10}{'change':>9}")
+    for key, row in results.items():
+        old = baseline["stages"].get(key)
+        if old is None:
+            print(f"{key:<20}{'(new)':>12}")
+            continue
+        speed = row["reviews_per_s"] / old["reviews_per_s"] - 1
+        memory = row["peak_kb"] / old["peak_kb"] - 1 if old["peak_kb"] else 0.0
+        print(f"{key:<20}{row['reviews_per_s']:>12.0f}{speed:>+9.0%}{row['peak_kb']:>10.0f}{memory:>+9.0%}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="cselec2 pipeline throughput and peak memory per stage")
+    ap.add_argument("--repeat", type=int, default=100, help="copies of each saved page in the corpus")
+    ap.add_argument("--rounds", type=int, default=5, help="timed runs per stage, best one is kept")
+    ap.add_argument("--save", help="write the results to this JSON file")
+    ap.add_argument("--compare", help="JSON file from an earlier run to compare against")
+    args = ap.parse_args()
+
+    score = lexicon_available()
+    if not score:
+        print("VADER lexicon not available offline; skipping the score and analyze stages")
+
+    results = run(args.repeat, args.rounds, score)
+    print(f"{'stage':<20}{'pages/s':>10}{'reviews/s':>12}{'peak KB':>10}")
+    for key, row in results.items():
+        print(f"{key:<20}{row['pages_per_s']:>10.0f}{row['reviews_per_s']:>12.0f}{row['peak_kb']:>10.0f}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+    if args.save:
+        report = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+            "rounds": args.rounds,
+            "stages": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
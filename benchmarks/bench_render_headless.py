@@ -0,0 +1,100 @@
+# bench_render_headless.py
+# Frame time of SmartHumidityGUI and SmartClimateApp rendered through the
+# offscreen backend (render_backend.OffscreenRenderer), no display needed.
+# The GUIs are built through their constructors with a renderer, as they
+# would be in a window. Each frame is split into the GUI's own drawing
+# code (the calls it makes on the canvas) and rasterizing the scene in
+# present(); --save writes the last frame of each scenario as a PNG for
+# a visual check.
+#
+#   python benchmarks/bench_render_headless.py [--frames 300] [--save frames/]
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fuzzylogic import SmartHumidityGUI
+from fuzzylogicc import SmartClimateApp
+from render_backend import OffscreenRenderer
+
+
+class TimedRenderer(OffscreenRenderer):
+    """OffscreenRenderer adding up the time its present() calls take."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.raster = 0.0
+
+    def present(self):
+        start = time.perf_counter()
+        image = super().present()
+        self.raster += time.perf_counter() - start
+        return image
+
+
+def living_room(rh):
+    """SmartHumidityGUI offscreen; the slider is moved every frame, which is what spawns mist."""
+    gui = SmartHumidityGUI(renderer=TimedRenderer(450, 400, bg="#ecf0f1"))
+    gui.rng = np.random.default_rng(0)
+    gui.hum_scale.set(rh)
+
+    def frame(i):
+        gui.hum_scale.set(rh + (i % 2) * 0.1)
+        gui.update_display()
+        gui.animate()
+        return sum(gui.frame_calls.values())
+    return gui.renderer, frame, lambda: f"{len(gui.particles)} particles"
+
+
+def climate(mode, rh):
+    """SmartClimateApp offscreen, at its default window's canvas size."""
+    app = SmartClimateApp(renderer=TimedRenderer(560, 330, bg="#ffeaf2"))
+    app.mode.set(mode)
+    app.slider.set(rh)
+    app.update_display()
+
+    def frame(i):
+        before = app._tick_calls
+        app.animate()
+        return app._tick_calls - before
+    return app.renderer, frame, lambda: f"power {app.power:.2f}"
+
+
+SCENARIOS = [
+    ("living room, 20% RH", lambda: living_room(20.0)),
+    ("living room, 85% RH", lambda: living_room(85.0)),
+    ("climate, fan 75%", lambda: climate("dehumidifier", 75.0)),
+    ("climate, humidifier 35%", lambda: climate("humidifier", 35.0)),
+]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless frame time of the climate GUIs")
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--save", type=Path, help="directory for the last frame of each scenario (PNG)")
+    args = ap.parse_args()
+    if args.save:
+        args.save.mkdir(parents=True, exist_ok=True)
+
+    print(f"{'scenario':<32}{'draw ms':>9}{'raster ms':>11}{'frame ms':>10}{'fps':>7}{'calls':>7}{'items':>7}  state")
+    for n, (name, make) in enumerate(SCENARIOS):
+        renderer, frame, state = make()
+        renderer.raster = 0.0
+        calls = 0
+        start = time.perf_counter()
+        for i in range(args.frames):
+            calls += frame(i)  # the GUI presents its own frame
+        elapsed = time.perf_counter() - start
+        per = 1e3 / args.frames
+        total, raster = elapsed * per, renderer.raster * per
+        print(f"{name:<32}{total - raster:>9.2f}{raster:>11.2f}{total:>10.2f}{1e3 / total:>7.0f}"
+              f"{calls / args.frames:>7.0f}{len(renderer):>7}  {state()}")
+        if args.save:
+            renderer.image.save(args.save / f"frame{n}.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# bench_review_parser.py
+# Compare the regex extractor in cselec2 with the streaming parser on the
+# saved review pages in benchmarks/pages.
+#
+#   python benchmarks/bench_review_parser.py [--scale 50] [--rounds 20]
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from cselec2 import extract_reviews_and_stars, review_text, iter_review_records
+
+PAGES_DIR = Path(__file__).resolve().parent / "pages"
+CHUNK_SIZE = 64 * 1024
+
+
+def regex_pass(html):
+    reviews, stars = extract_reviews_and_stars(html)
+    return [(review_text(r), s) for r, s in zip(reviews, stars)], len(reviews), len(stars)
+
+
+def stream_pass(html):
+    chunks = (html[i:i + CHUNK_SIZE] for i in range(0, len(html), CHUNK_SIZE))
+    return list(iter_review_records(chunks))
+
+
+def best_of(fn, html, rounds):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Regex vs streaming review extraction")
+    ap.add_argument("--scale", type=int, default=50,
+                    help="concatenate each page this many times to simulate a large page")
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    print(f"{'page':<28}{'size':>10}{'regex ms':>11}{'stream ms':>11}{'speedup':>9}  pairs regex/stream")
+    for page in sorted(PAGES_DIR.glob("*.html")):
+        html = page.read_text(encoding="utf-8") * args.scale
+        _, n_reviews, n_stars = regex_pass(html)
+        n_records = len(stream_pass(html))
+
+        t_regex = best_of(regex_pass, html, args.rounds)
+        t_stream = best_of(stream_pass, html, args.rounds)
+        sync = "" if n_reviews == n_stars else f" (regex: {n_reviews} reviews vs {n_stars} stars)"
+        print(f"{page.name:<28}{len(html) / 1024:>8.0f}KB{t_regex * 1e3:>11.2f}{t_stream * 1e3:>11.2f}"
+              f"{t_regex / t_stream:>8.2f}x  {min(n_reviews, n_stars)}/{n_records}{sync}")
+
+
+if __name__ == "__main__":
+    main()
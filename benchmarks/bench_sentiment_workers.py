@@ -0,0 +1,51 @@
+# bench_sentiment_workers.py
+# Throughput of cselec2.score_reviews for different worker counts.
+# Review texts are built from the saved pages in benchmarks/pages.
+#
+#   python benchmarks/bench_sentiment_workers.py [--reviews 200000] [--workers 1 2 4 8]
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from cselec2 import iter_review_records, score_reviews
+
+PAGES_DIR = Path(__file__).resolve().parent / "pages"
+
+
+def make_corpus(n, seed=0):
+    """Shuffle sentences from the saved reviews into n synthetic reviews."""
+    sentences = []
+    for page in sorted(PAGES_DIR.glob("*.html")):
+        for text, _ in iter_review_records([page.read_text(encoding="utf-8")]):
+            sentences.extend(s.strip() + "." for s in text.split(".") if s.strip())
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(sentences, k=rng.randint(1, 6))) for _ in range(n)]
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    ap = argparse.ArgumentParser(description="Sentiment scoring throughput vs worker count")
+    ap.add_argument("--reviews", type=int, default=200_000)
+    ap.add_argument("--workers", type=int, nargs="+",
+                    default=sorted({1, 2, 4, cpus} & set(range(1, cpus + 1))))
+    args = ap.parse_args()
+
+    texts = make_corpus(args.reviews)
+    baseline = None
+    print(f"{len(texts)} reviews, {cpus} CPUs")
+    print(f"{'workers':>8}{'seconds':>10}{'reviews/s':>12}{'speedup':>9}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        scores = score_reviews(texts, workers, cache=None)
+        elapsed = time.perf_counter() - start
+        assert len(scores) == len(texts)
+        baseline = baseline or elapsed
+        print(f"{workers:>8}{elapsed:>10.2f}{len(texts) / elapsed:>12.0f}{baseline / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# bench_startup.py
+# Cold and warm startup of cselec2: time to import the module and time to
+# build the sentiment analyzer, each measured in a fresh interpreter.
+#
+#   python benchmarks/bench_startup.py [--runs 5]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import cselec2
+t1 = time.perf_counter()
+cselec2.get_analyzer().polarity_scores("warming up")
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "analyzer": t2 - t1}))
+"""
+
+
+def probe(cache_dir):
+    env = dict(os.environ, CSELEC2_CACHE=cache_dir)
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser(description="cselec2 cold/warm startup time")
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    rows = {"cold": [], "warm": []}
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rows["cold"].append(probe(cache_dir))   # no lexicon cache yet
+            rows["warm"].append(probe(cache_dir))   # cache written by the cold run
+
+    print(f"{'':<6}{'import ms':>11}{'analyzer ms':>13}{'total ms':>10}   (median of {args.runs})")
+    for name, runs in rows.items():
+        imp = sorted(r["import"] for r in runs)[len(runs) // 2]
+        ana = sorted(r["analyzer"] for r in runs)[len(runs) // 2]
+        print(f"{name:<6}{imp * 1e3:>11.1f}{ana * 1e3:>13.1f}{(imp + ana) * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# fixture_server.py
+# Local HTTP server that serves the saved review pages as a fake
+# catalogue, with working "Next page" links.
+#
+#   python benchmarks/fixture_server.py [--port 8765] [--pages 5] [--latency 0.05]
+#
+# /product-reviews/<product>/?pageNumber=N returns page N of <product>;
+# products alternate between the two saved page layouts. Responses carry
+# an ETag and answer If-None-Match with 304.
+import argparse
+import hashlib
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+PAGES_DIR = Path(__file__).resolve().parent / "pages"
+LAST_MODIFIED = "Mon, 01 Apr 2024 00:00:00 GMT"
+NEXT_LINK_RE = re.compile(r'<li class="a-last"><a href="[^"]*">Next page</a></li>')
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so clients can reuse connections
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        match = re.match(r"/product-reviews/([^/]+)/?$", url.path)
+        if not match:
+            self.send_error(404)
+            return
+
+        product = match.group(1)
+        page_no = int(parse_qs(url.query).get("pageNumber", ["1"])[0])
+        with server.lock:
+            server.hits += 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.latency)
+            body = self.render(product, page_no).encode("utf-8")
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+            if self.headers.get("If-None-Match") == etag:
+                server.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            server.bytes_sent += len(body)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def render(self, product, page_no):
+        templates = self.server.templates
+        page = templates[sum(map(ord, product)) % len(templates)]
+        if page_no < self.server.pages_per_product:
+            link = (f'<li class="a-last"><a href="/product-reviews/{product}/'
+                    f'?ie=UTF8&amp;pageNumber={page_no + 1}">Next page</a></li>')
+        else:
+            link = '<li class="a-disabled a-last">Next page</li>'
+        if NEXT_LINK_RE.search(page):
+            return NEXT_LINK_RE.sub(link, page)
+        return page.replace("</body>", f'<ul class="a-pagination">{link}</ul></body>')
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fixture_server(port=0, pages_per_product=5, latency=0.0):
+    """Start the server in a background thread; returns it (base URL in .base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FixtureHandler)
+    server.daemon_threads = True
+    server.templates = [p.read_text(encoding="utf-8") for p in sorted(PAGES_DIR.glob("*.html"))]
+    server.pages_per_product = pages_per_product
+    server.latency = latency
+    server.lock = threading.Lock()
+    server.hits = server.active = server.max_active = 0
+    server.not_modified = server.bytes_sent = 0
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Serve the saved review pages locally")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--pages", type=int, default=5, help="review pages per product")
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = ap.parse_args()
+    server = start_fixture_server(args.port, args.pages, args.latency)
+    print(f"Serving on {server.base_url}/product-reviews/<product>/  (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
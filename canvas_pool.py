@@ -0,0 +1,100 @@
+# canvas_pool.py
+# Helpers for animating many small items on a Tk canvas: a pool of
+# reusable ovals, and a proxy that counts the Tk calls made through it.
+import time
+from collections import Counter
+
+
+class CallCounter:
+    """Wrap a widget and count calls to its methods, per method name.
+
+    Everything else behaves like the wrapped widget. frame() returns the
+    counts since the previous frame() call and starts a new count.
+    """
+
+    def __init__(self, widget):
+        self._widget = widget
+        self.counts = Counter()
+        self.total = Counter()
+
+    def __getattr__(self, name):
+        attr = getattr(self._widget, name)
+        if not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.counts[name] += 1
+            return attr(*args, **kwargs)
+        return counted
+
+    def frame(self) -> Counter:
+        counts, self.counts = self.counts, Counter()
+        self.total += counts
+        return counts
+
+
+class OvalPool:
+    """Pre-created oval items, repositioned with coords() instead of recreated.
+
+    draw() shows one oval per box and hides the rest. Style changes and
+    show/hide are only sent to Tk when an item's state actually changes.
+    The pool grows (doubling) when a frame needs more ovals than it has,
+    and shrinks by half once demand has stayed below a quarter of its size
+    for `shrink_after` seconds.
+    """
+
+    def __init__(self, canvas, size: int = 64, shrink_after: float = 5.0, min_size: int = 64):
+        self.canvas = canvas
+        self.min_size = min_size
+        self.shrink_after = shrink_after
+        self.items = []
+        self._fill = []       # current fill colour per item
+        self._shown = 0       # items[:_shown] are visible
+        self._low_since = None
+        self._grow(size)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _grow(self, size):
+        for _ in range(size - len(self.items)):
+            self.items.append(self.canvas.create_oval(0, 0, 0, 0, fill="", outline="", state="hidden"))
+            self._fill.append("")
+
+    def _shrink(self, size):
+        for item in self.items[size:]:
+            self.canvas.delete(item)
+        del self.items[size:]
+        del self._fill[size:]
+        self._shown = min(self._shown, size)
+
+    def draw(self, boxes, fills):
+        """Show an oval for each (x0, y0, x1, y1) box with the matching fill; hide the others."""
+        n = len(boxes)
+        if n > len(self.items):
+            self._grow(max(n, 2 * len(self.items)))
+
+        canvas, items, current = self.canvas, self.items, self._fill
+        for i, (box, fill) in enumerate(zip(boxes, fills)):
+            canvas.coords(items[i], *box)
+            if fill != current[i]:
+                canvas.itemconfigure(items[i], fill=fill)
+                current[i] = fill
+        for item in items[self._shown:n]:
+            canvas.itemconfigure(item, state="normal")
+        for item in items[n:self._shown]:
+            canvas.itemconfigure(item, state="hidden")
+        self._shown = n
+        self._adapt(n)
+
+    def _adapt(self, demand):
+        size = len(self.items)
+        if size <= self.min_size or demand * 4 > size:
+            self._low_since = None
+            return
+        now = time.monotonic()
+        if self._low_since is None:
+            self._low_since = now
+        elif now - self._low_since >= self.shrink_after:
+            self._shrink(max(self.min_size, size // 2, demand))
+            self._low_since = None
@@ -0,0 +1,252 @@
+# controller_service.py
+# Local asyncio service that evaluates the fuzzy controllers for many
+# devices at once. Requests arriving within a short window are coalesced
+# into one vectorized evaluation per batch.
+#
+# Protocol: one request per line,
+#   <device> <controller> <rh> [setpoint]      controller: ctrl | dehumidifier | humidifier
+# answered in order on the same connection with
+#   <device> <value>          power in [0, 1], or action in [-100, 100] for ctrl
+#   <device> error <reason>
+# A connection can carry any number of devices (e.g. one per building
+# gateway), and requests can be pipelined without waiting for answers.
+#
+#   python controller_service.py [--port 8765] [--window 0.002] [--max-batch 4096]
+import argparse
+import asyncio
+import math
+import time
+
+import numpy as np
+
+from fuzzylogic import FuzzyHumidityCtrl
+from fuzzylogicc import FuzzyHumidifier, smooth_rh
+from fuzzy_engine import compile_spec, DEHUMIDIFIER
+
+KINDS = ("ctrl", "dehumidifier", "humidifier")
+CTRL, DEHUMIDIFIER_KIND, HUMIDIFIER_KIND = range(3)
+
+
+# ----------------------------------------------------------
+#  PER-DEVICE STATE
+# ----------------------------------------------------------
+class DeviceState:
+    """Humidifier trend smoothing (FuzzyHumidifier.last_rh) for every device, in one array.
+
+    Devices get a slot the first time they are seen; the array doubles
+    when it fills up.
+    """
+
+    def __init__(self, capacity: int = 1024, initial: float = 45.0):
+        self.initial = initial
+        self.slots = {}
+        self.last_rh = np.full(capacity, initial)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def slot(self, device: str) -> int:
+        i = self.slots.get(device)
+        if i is None:
+            i = self.slots[device] = len(self.slots)
+            if i == len(self.last_rh):
+                grown = np.full(2 * i, self.initial)
+                grown[:i] = self.last_rh
+                self.last_rh = grown
+        return i
+
+
+# ----------------------------------------------------------
+#  BATCHING
+# ----------------------------------------------------------
+class BatchController:
+    """Collect requests and answer them with one vectorized pass per batch.
+
+    A batch is evaluated `window` seconds after its first request (or on
+    the next loop iteration when window is 0), or at once when it reaches
+    `max_batch` requests. Humidifier results match calling
+    FuzzyHumidifier.compute per device in arrival order, including when one
+    device sends several readings in the same batch.
+    """
+
+    def __init__(self, window: float = 0.002, max_batch: int = 4096):
+        self.window = window
+        self.max_batch = max_batch
+        self.ctrl = FuzzyHumidityCtrl()
+        self.dehumidifier = compile_spec(DEHUMIDIFIER)
+        self.humidifier = FuzzyHumidifier()
+        self.devices = DeviceState()
+
+        self.batches = 0
+        self.requests = 0
+        self.busy = 0.0  # seconds spent evaluating
+        self._timer = None
+        self._reset()
+
+    def _reset(self):
+        self._writers, self._names, self._kinds = [], [], []
+        self._rh, self._setpoint, self._slots, self._ranks = [], [], [], []
+        self._errors = {}   # position in batch -> reason
+        self._seen = {}     # humidifier slot -> readings so far in this batch
+        self._waiters = {}  # writer -> future set once its answers in this batch are written
+
+    def __len__(self):
+        return len(self._names)
+
+    def submit(self, writer, line: str):
+        """Queue one request line; its answer is written to `writer` when the batch runs."""
+        parts = line.split()
+        try:
+            device, kind, rh = parts[0], KINDS.index(parts[1]), float(parts[2])
+            setpoint = float(parts[3]) if len(parts) > 3 else self.ctrl.setpoint
+            # nan or inf would stick in the device's smoothed humidity for good
+            error = None if math.isfinite(rh) and math.isfinite(setpoint) else "rh and setpoint must be finite"
+        except (IndexError, ValueError):
+            error = "expected: <device> <controller> <rh> [setpoint]"
+        if error:
+            self._errors[len(self._names)] = error
+            device, kind, rh, setpoint = parts[0] if parts else "-", CTRL, 0.0, 0.0
+
+        slot = rank = 0
+        if kind == HUMIDIFIER_KIND:
+            slot = self.devices.slot(device)
+            rank = self._seen.get(slot, 0)
+            self._seen[slot] = rank + 1
+
+        self._writers.append(writer)
+        self._names.append(device)
+        self._kinds.append(kind)
+        self._rh.append(rh)
+        self._setpoint.append(setpoint)
+        self._slots.append(slot)
+        self._ranks.append(rank)
+
+        if len(self._names) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = (loop.call_later(self.window, self.flush) if self.window > 0
+                           else loop.call_soon(self.flush))
+
+    async def answered(self, writer):
+        """Return once every request queued for `writer` so far has been answered."""
+        if writer in self._writers:
+            waiter = self._waiters.get(writer)
+            if waiter is None:
+                waiter = self._waiters[writer] = asyncio.get_running_loop().create_future()
+            await waiter
+
+    def evaluate(self, kinds, rh, setpoint, slots, ranks) -> np.ndarray:
+        """Controller output for each request; updates the humidifier state."""
+        out = np.empty(len(rh))
+        mask = kinds == CTRL
+        if mask.any():
+            out[mask] = self.ctrl.compute_batch(rh[mask], setpoint[mask])
+        mask = kinds == DEHUMIDIFIER_KIND
+        if mask.any():
+            out[mask] = self.dehumidifier.evaluate(rh=rh[mask])
+        mask = kinds == HUMIDIFIER_KIND
+        if mask.any():
+            base = np.zeros(len(rh))
+            base[mask] = self.humidifier.base_power_batch(rh[mask])
+            state = self.devices.last_rh
+            # Repeat readings from one device go in later rounds, so each sees the state left by the one before
+            for rank in range(ranks[mask].max() + 1):
+                sel = np.flatnonzero(mask & (ranks == rank))
+                idx, x = slots[sel], rh[sel]
+                last = state[idx]
+                d = np.clip((x - last) / 20, -0.08, 0.08)
+                out[sel] = np.clip(base[sel] - d, 0, 1)
+                state[idx] = smooth_rh(last, x)
+        return out
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._names:
+            return
+        writers, names, errors, waiters = self._writers, self._names, self._errors, self._waiters
+        kinds, rh, setpoint = np.array(self._kinds), np.array(self._rh), np.array(self._setpoint)
+        slots, ranks = np.array(self._slots), np.array(self._ranks)
+        self._reset()
+
+        start = time.perf_counter()
+        values = self.evaluate(kinds, rh, setpoint, slots, ranks).tolist()
+        self.busy += time.perf_counter() - start
+        self.batches += 1
+        self.requests += len(names)
+
+        # One write per connection, answers in arrival order
+        replies = {}
+        for i, (writer, name, value) in enumerate(zip(writers, names, values)):
+            reply = f"{name} error {errors[i]}\n" if i in errors else f"{name} {value!r}\n"
+            replies.setdefault(writer, []).append(reply)
+        for writer, lines in replies.items():
+            if not writer.is_closing():
+                writer.write("".join(lines).encode())
+        for waiter in waiters.values():
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def stats(self) -> str:
+        per_batch = self.requests / self.batches if self.batches else 0.0
+        return (f"{self.requests} requests in {self.batches} batches ({per_batch:.1f}/batch), "
+                f"{len(self.devices)} humidifiers, {self.busy * 1e3:.0f} ms evaluating")
+
+
+# ----------------------------------------------------------
+#  SERVER
+# ----------------------------------------------------------
+def connection_handler(batcher: BatchController):
+    """asyncio.start_server callback feeding one connection's requests to `batcher`."""
+
+    async def handle(reader, writer):
+        try:
+            while line := await reader.readline():
+                batcher.submit(writer, line.decode())
+                if writer.transport.get_write_buffer_size() > 1 << 20:
+                    await writer.drain()  # the client isn't reading its answers
+            # End of input may be a half-close: answer what was sent before closing
+            await batcher.answered(writer)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, window: float = 0.002,
+                max_batch: int = 4096, report: float = 0.0):
+    batcher = BatchController(window, max_batch)
+    server = await asyncio.start_server(connection_handler(batcher), host, port)
+    host, port = server.sockets[0].getsockname()[:2]
+    print(f"listening on {host}:{port}", flush=True)
+    async with server:
+        try:
+            while True:
+                await asyncio.sleep(report or 3600)
+                if report:
+                    print(batcher.stats(), flush=True)
+        finally:
+            print(batcher.stats(), flush=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batched fuzzy controller service")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    ap.add_argument("--window", type=float, default=0.002, help="seconds to coalesce requests")
+    ap.add_argument("--max-batch", type=int, default=4096)
+    ap.add_argument("--report", type=float, default=0.0, help="print stats every N seconds")
+    args = ap.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.window, args.max_batch, args.report))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
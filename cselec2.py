@@ -1,14 +1,116 @@
 import requests
 import re
+import os
+import sys
 import time
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
+import html
+import hashlib
+import marshal
+from pathlib import Path
+from urllib.parse import urljoin
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http_cache import ResponseCache
 
-nltk.download('vader_lexicon')
+# Parsed VADER lexicon, stored as a marshal'd dict so later runs and the
+# scoring workers skip the text parsing
+LEXICON_CACHE = Path(os.environ.get("CSELEC2_CACHE", Path.home() / ".cache" / "cselec2")) / "vader_lexicon.marshal"
+# Drop a copy of vader_lexicon.txt here to run without nltk_data or network
+BUNDLED_LEXICON = Path(__file__).resolve().parent / "vader_lexicon.txt"
+NLTK_LEXICON = "sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt"
+# CSELEC2_HTTP_CACHE=1 keeps the pages main() fetches in an on-disk ResponseCache
+# (revalidated with a conditional GET on the next run); off by default
+HTTP_CACHE = os.environ.get("CSELEC2_HTTP_CACHE", "") not in ("", "0")
 
-def fetch_html(url, headers):
+_analyzer = None
+
+HEADERS = {
+    'Sec-Ch-Ua': '"Chromium";v="118", "Brave";v="118", "Not:A-Brand";v="99"',
+    'Sec-Ch-Ua-Platform': '"Windows"',
+    'Sec-Ch-Ua-Platform-Version': '"15.0.0"',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Sec-Gpc': '1',
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                  'AppleWebKit/537.36 (KHTML, like Gecko) '
+                  'Chrome/118.0.5993.90 Safari/537.36'
+}
+
+def parse_lexicon(text):
+    # Same format SentimentIntensityAnalyzer.make_lex_dict reads
+    lexicon = {}
+    for line in text.split("\n"):
+        if not line.strip():
+            continue
+        word, measure = line.strip().split("\t")[0:2]
+        lexicon[word] = float(measure)
+    return lexicon
+
+def lexicon_url():
+    """Where the lexicon text is read from: the bundled copy, else nltk_data (downloaded once)."""
+    import nltk
+    if BUNDLED_LEXICON.exists():
+        # nltk only opens files on its search path
+        if str(BUNDLED_LEXICON.parent) not in nltk.data.path:
+            nltk.data.path.append(str(BUNDLED_LEXICON.parent))
+        return BUNDLED_LEXICON.name
+    try:
+        nltk.data.find(NLTK_LEXICON)
+    except LookupError:
+        print("VADER lexicon not found locally, downloading it once...")
+        nltk.download('vader_lexicon', quiet=True)
+    return NLTK_LEXICON
+
+def load_lexicon():
+    """Return the VADER lexicon as a dict, from the marshal cache if possible.
+
+    Otherwise the text from lexicon_url() is parsed and the result cached.
+    """
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        with open(LEXICON_CACHE, "rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    import nltk
+    lexicon = parse_lexicon(nltk.data.load(lexicon_url(), cache=False))
+    try:
+        LEXICON_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = LEXICON_CACHE.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            marshal.dump(lexicon, f)
+        os.replace(tmp, LEXICON_CACHE)
+    except OSError as err:
+        print(f"Could not cache lexicon: {err}")
+    return lexicon
+
+def get_analyzer():
+    """Build the SentimentIntensityAnalyzer on first use and reuse it afterwards."""
+    global _analyzer
+    if _analyzer is None:
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+        class CachedLexiconAnalyzer(SentimentIntensityAnalyzer):
+            # The constructor still reads lexicon_url(); only the parsing is replaced
+            def make_lex_dict(self):
+                return load_lexicon()
+
+        _analyzer = CachedLexiconAnalyzer(lexicon_url())
+    return _analyzer
+
+def fetch_html(url, headers, cache=None, session=requests):
+    try:
+        if cache is not None:
+            text = cache.get(url, headers, session=session)
+            if text and "captcha" in text.lower():
+                cache.drop(url)
+                print("⚠️ Amazon returned a CAPTCHA page. Try again later or use VPN.")
+                return None
+            return text
+
+        response = session.get(url, headers=headers, timeout=10)
         if response.status_code == 200:
             # Detect if page is a CAPTCHA block
             if "captcha" in response.text.lower():
@@ -41,8 +143,157 @@ def extract_reviews_and_stars(html_content):
 
     return reviews, stars
 
+def _nested_spans(depth):
+    """Pattern for markup with <span> elements nested up to `depth` deep."""
+    inner = r'(?:[^<]++|<(?!/?span\b))*+'
+    for _ in range(depth):
+        inner = rf'(?:[^<]++|<(?!/?span\b)|<span\b[^>]*+>{inner}</span>)*+'
+    return inner
+
+class ReviewStreamParser:
+    """Single-pass incremental parser that pairs each review body with its star rating.
+
+    Handles both layouts `extract_reviews_and_stars` knows about. One
+    compiled pattern matches whole review bodies (with up to MAX_NESTING
+    levels of <span> inside) and star ratings, so the page is scanned by
+    the regex engine alone. Feed it chunks as they arrive and collect
+    finished (text, star) records with `pop_records()`; an item cut by a
+    chunk boundary is kept and matched once the rest arrives. A star is
+    kept until the next review body closes, so reviews and stars can't
+    drift out of sync.
+    """
+    MAX_NESTING = 3
+    MAX_PENDING = 1 << 20   # an item still open after this many characters is dropped
+
+    # Every item starts at an attribute value, so the scan can jump between '="' occurrences
+    ITEM_RE = re.compile(
+        r'="(?:review-star-rating"[^>]*>[^<]*+(?:<span\b[^>]*>([^<]*+)</span>|</i>)'
+        r'|a-icon-alt"[^>]*>([^<]*+)</span>'
+        r'|(?:review-body"|a-size-base review-text)[^>]*>'
+        rf'({_nested_spans(MAX_NESTING)})</span>'
+        r'|a-last"><a href="([^"]+)")')  # <li class="a-last">: the "Next page" link
+    OPEN_RE = re.compile(r'="(?:review-(?:body|star-rating)"|a-size-base review-text|a-icon-alt"|a-last")')
+    STAR_RE = re.compile(r'([\d.]+) out of 5 stars')
+
+    def __init__(self):
+        self.records = []
+        self._buf = ''
+        self._pending_star = None
+        self.next_page = None       # href of the "Next page" link, if any
+
+    def feed(self, chunk):
+        buf = self._buf + chunk
+        pos = 0
+        records, star = self.records, self._pending_star
+        for m in self.ITEM_RE.finditer(buf):
+            icon_star, alt_star, body, next_page = m.groups()
+            if body is not None:
+                text = review_text(body)
+                if text and star is not None:
+                    records.append((text, star))
+                star = None
+            elif next_page is not None:
+                self.next_page = html.unescape(next_page)
+            else:
+                match = self.STAR_RE.search(icon_star or alt_star or '')
+                if match:
+                    star = match.group(1)
+            pos = m.end()
+        self._pending_star = star
+
+        # Keep an item (or a tag) that was cut in half by the chunk boundary
+        m = self.OPEN_RE.search(buf, pos)
+        if m and len(buf) - m.start() <= self.MAX_PENDING:
+            keep = m.start()
+        else:
+            keep = buf.rfind('<', pos)
+            if keep == -1 or '>' in buf[keep:]:
+                keep = len(buf)
+        self._buf = buf[keep:]
+
+    def close(self):
+        self._buf = ''
+
+    def pop_records(self):
+        records, self.records = self.records, []
+        return records
+
+def iter_review_records(chunks):
+    """Yield (review text, star rating) records from an iterable of HTML chunks."""
+    parser = ReviewStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.pop_records()
+    parser.close()
+    yield from parser.pop_records()
+
+def fetch_review_page(url, headers, session=requests, chunk_size=64 * 1024, cache=None):
+    """Stream a review page and parse it as it downloads.
+
+    Returns ((text, star) records, next page URL or None), or None if the
+    page could not be fetched. With a ResponseCache the page comes from
+    (and goes to) the cache and is parsed in one go.
+    """
+    if cache is not None:
+        text = fetch_html(url, headers, cache, session)
+        if text is None:
+            return None
+        parser = ReviewStreamParser()
+        parser.feed(text)
+        parser.close()
+        next_page = urljoin(url, parser.next_page) if parser.next_page else None
+        return parser.pop_records(), next_page
+
+    try:
+        with session.get(url, headers=headers, timeout=10, stream=True) as response:
+            if response.status_code != 200:
+                print(f"HTTP error: {response.status_code}")
+                return None
+            response.encoding = response.encoding or 'utf-8'
+
+            parser = ReviewStreamParser()
+            records = []
+            tail = ''
+            for chunk in response.iter_content(chunk_size=chunk_size, decode_unicode=True):
+                # Detect if page is a CAPTCHA block, also when the word spans two chunks
+                if "captcha" in (tail + chunk).lower():
+                    print("⚠️ Amazon returned a CAPTCHA page. Try again later or use VPN.")
+                    return None
+                tail = chunk[-len("captcha"):]
+                parser.feed(chunk)
+                records.extend(parser.pop_records())
+            parser.close()
+            records.extend(parser.pop_records())
+            next_page = urljoin(url, parser.next_page) if parser.next_page else None
+            return records, next_page
+    except requests.RequestException as err:
+        print(f"Request failed: {err}")
+        return None
+
+TAG_RE = re.compile(r'<[^>]+>')
+BR_RE = re.compile(r'<br\s*/?>')
+
 def clean_html(raw_html):
-    return re.sub(r'<[^>]+>', '', raw_html).strip()
+    return TAG_RE.sub('', raw_html).strip()
+
+def review_text(raw_html):
+    """Plain text of a review body: tags removed first, then entities decoded (once)."""
+    if '<br' in raw_html:
+        raw_html = BR_RE.sub(' ', raw_html)
+    return html.unescape(clean_html(raw_html))
+
+def normalize_review_text(text):
+    """Tags, entities, whitespace and case folded away, for spotting the same review twice."""
+    return ' '.join(html.unescape(clean_html(text)).split()).casefold()
+
+def score_key(text):
+    """ScoreCache key: the text with whitespace runs collapsed, case kept (VADER boosts capitals)."""
+    return ' '.join(text.split())
+
+def review_hash(text):
+    """64-bit content hash of a review, stable across runs and pages."""
+    digest = hashlib.blake2b(normalize_review_text(text).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
 
 def map_sentiment_to_stars(score):
     if score >= 0.75:
@@ -55,35 +306,171 @@ def map_sentiment_to_stars(score):
         return "★  ★  ☆  ☆  ☆"
     return "★  ☆  ☆  ☆  ☆"
 
-def analyze_reviews(reviews, stars):
-    sia = SentimentIntensityAnalyzer()
+def _init_score_worker():
+    # Build the analyzer once per worker process, not once per shard
+    get_analyzer()
 
-    for idx, (raw_review, star) in enumerate(zip(reviews, stars), 1):
-        text = clean_html(raw_review)
-        sentiment = sia.polarity_scores(text)
-        compound = sentiment['compound']
+def _score_shard(texts):
+    sia = get_analyzer()
+    return [sia.polarity_scores(text) for text in texts]
+
+class ScoreCache:
+    """Bounded LRU cache of VADER scores, keyed by normalized review text.
+
+    Templated reviews ("Great product!", "Works as described") are scored
+    once instead of thousands of times. Keys go through score_key, so
+    "Great product!" and "Great  product!" share an entry, but "GREAT
+    product!" gets its own: VADER scores the capitals higher.
+    Pass `path` to load the cache from disk and save() it back.
+    """
+
+    def __init__(self, max_size=100_000, path=None):
+        self.max_size = max_size
+        self.path = Path(path) if path else None
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+        if self.path and self.path.exists():
+            with open(self.path, "rb") as f:
+                for key, scores in marshal.load(f)[-max_size:]:
+                    self._entries[key] = dict(zip(('neg', 'neu', 'pos', 'compound'), scores))
+
+    def get(self, key):
+        scores = self._entries.get(key)
+        if scores is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return scores
+
+    def put(self, key, scores):
+        self._entries[key] = scores
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+    def save(self):
+        if self.path is None:
+            return
+        items = [(key, (s['neg'], s['neu'], s['pos'], s['compound'])) for key, s in self._entries.items()]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            marshal.dump(items, f)
+        os.replace(tmp, self.path)
 
-        if compound >= 0.5:
-            label = "Positive"
-        elif compound <= -0.5:
-            label = "Negative"
+score_cache = ScoreCache()
+
+def score_reviews(texts, workers=1, shard_size=2000, cache=score_cache):
+    """Return VADER polarity scores for `texts`, in input order.
+
+    Texts already in `cache` (None disables it) are not scored again, and
+    repeats within `texts` are scored once. With workers > 1 the rest is
+    split into shards and scored in a process pool. Small inputs are scored
+    in-process, where starting the pool would cost more than it saves.
+    """
+    texts = list(texts)
+    if cache is None:
+        return _score_texts(texts, workers, shard_size)
+
+    keys = [score_key(text) for text in texts]
+    scores, todo = [], {}
+    for text, key in zip(texts, keys):
+        if key in todo:
+            found = None
+            cache.hits += 1   # a repeat within the batch, scored once with the first
         else:
-            label = "Neutral"
+            found = cache.get(key)
+            if found is None:
+                todo[key] = text
+        scores.append(found)
+
+    for key, result in zip(todo, _score_texts(list(todo.values()), workers, shard_size)):
+        cache.put(key, result)
+        todo[key] = result
+    return [found if found is not None else todo[key] for key, found in zip(keys, scores)]
+
+def _score_texts(texts, workers, shard_size):
+    if workers <= 1 or len(texts) <= shard_size:
+        return _score_shard(texts)
+
+    # Download and cache the lexicon here, so the workers all find the marshal cache
+    get_analyzer()
+    shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+    scores = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_score_worker) as pool:
+        for part in pool.map(_score_shard, shards):
+            scores.extend(part)
+    return scores
+
+def sentiment_label(compound):
+    if compound >= 0.5:
+        return "Positive"
+    elif compound <= -0.5:
+        return "Negative"
+    return "Neutral"
+
+def star_visual(star):
+    """Star rating string as the same visual the sentiment is mapped to; raises ValueError."""
+    actual = float(star)
+    return ("★  " * int(actual) + "☆  " * (5 - int(actual))).strip()
+
+def rating_matches(compound, star):
+    return map_sentiment_to_stars(compound).strip() == star_visual(star)
 
+def review_id(text):
+    return f"{review_hash(text):016x}"
+
+def build_record(url, text, star, sentiment):
+    """One row of analysis output, see review_results.FIELDS."""
+    compound = sentiment['compound']
+    try:
+        star_value = float(star)
+        match = rating_matches(compound, star)
+    except ValueError:
+        star_value = match = None
+    return {"url": url, "review_id": review_id(text), "text": text, "star": star_value,
+            "compound": compound, "label": sentiment_label(compound), "match": match}
+
+def analyze_reviews(reviews, stars, workers=1, sink=None, url=None, cache=score_cache):
+    """analyze_records for the raw review bodies and stars of extract_reviews_and_stars."""
+    records = [(review_text(raw_review), star) for raw_review, star in zip(reviews, stars)]
+    analyze_records(records, workers, sink, url, cache)
+
+def analyze_records(records, workers=1, sink=None, url=None, cache=score_cache):
+    """Print the analysis of every (text, star) record; also write records to `sink` if given."""
+    texts = [text for text, _ in records]
+    sentiments = score_reviews(texts, workers, cache=cache)
+
+    for idx, ((text, star), sentiment) in enumerate(zip(records, sentiments), 1):
+        if sink is not None:
+            sink.write(build_record(url, text, star, sentiment))
+        compound = sentiment['compound']
+        label = sentiment_label(compound)
         expected = map_sentiment_to_stars(compound)
 
         try:
-            actual = float(star)
-            actual_visual = "★  " * int(actual) + "☆  " * (5 - int(actual))
+            actual_visual = star_visual(star)
 
             print(f"\nReview {idx}: {text}")
             print(f"Star Rating: {star}")
             print(f"Sentiment Scores: {sentiment}")
             print(f"Sentiment Label: {label}")
             print(f"Expected Star Rating: {expected}")
-            print(f"Actual Star Representation: {actual_visual.strip()}")
+            print(f"Actual Star Representation: {actual_visual}")
 
-            if expected.strip() == actual_visual.strip():
+            if expected.strip() == actual_visual:
                 print("✅ Sentiment matches star rating.\n")
             else:
                 print("❗ Mismatch between sentiment and rating.\n")
@@ -93,35 +480,25 @@ def analyze_reviews(reviews, stars):
 
 def main():
     url = input("Enter product URL: ").strip()
-
-    headers = {
-        'Sec-Ch-Ua': '"Chromium";v="118", "Brave";v="118", "Not:A-Brand";v="99"',
-        'Sec-Ch-Ua-Platform': '"Windows"',
-        'Sec-Ch-Ua-Platform-Version': '"15.0.0"',
-        'Sec-Fetch-Dest': 'document',
-        'Sec-Fetch-Mode': 'navigate',
-        'Sec-Fetch-Site': 'none',
-        'Sec-Fetch-User': '?1',
-        'Sec-Gpc': '1',
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                      'AppleWebKit/537.36 (KHTML, like Gecko) '
-                      'Chrome/118.0.5993.90 Safari/537.36'
-    }
+    headers = HEADERS
+    cache = ResponseCache() if HTTP_CACHE else None
 
     max_attempts = 3
     for attempt in range(max_attempts):
         print(f"Attempt {attempt + 1} of {max_attempts}...")
-        html = fetch_html(url, headers)
-        if not html:
+        page = fetch_review_page(url, headers, cache=cache)
+        if page is None:
             print("Failed to fetch the page.")
             time.sleep(3)  # wait before retry
             continue
 
-        reviews, stars = extract_reviews_and_stars(html)
+        # Records pair each review with the star shown above it, so extra
+        # star widgets on the page (e.g. the average rating) don't shift them
+        records, _ = page
 
-        if reviews and stars:
-            print(f"\nFound {len(reviews)} reviews and {len(stars)} star ratings.")
-            analyze_reviews(reviews, stars)
+        if records:
+            print(f"\nFound {len(records)} reviews with star ratings.")
+            analyze_records(records)
             break
         else:
             print("Reviews or ratings not found.")
@@ -134,5 +511,15 @@ def main():
     else:
         print("Failed to retrieve reviews and ratings after multiple attempts.")
 
+    if cache is not None:
+        print(cache.report())
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        # python cselec2.py urls.txt -> crawl a whole catalogue. review_crawler imports
+        # cselec2: hand it this module instead of loading a second copy (own caches, own lexicon)
+        sys.modules.setdefault("cselec2", sys.modules[__name__])
+        from review_crawler import crawl_main
+        crawl_main(sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
@@ -1,15 +1,68 @@
 # filter.py
 import sys
+import time
 from pathlib import Path
 from PIL import Image
 from nudenet import NudeDetector  # lightweight CPU detector
+from gifsample import sample_gif_frames
+from tiling import detect_tiled
 
 detector = NudeDetector()   # downloads 25 MB model once, then caches
 
-def main(image_path: str):
-    img = Image.open(image_path).convert("RGB")   # ensure RGB
-    result = detector.detect(image_path)          # list of dicts
-    unsafe = any(r["class"] != "safe" and r["score"] > 0.5 for r in result)
+GIF_FRAME_BUDGET = 8   # max frames scored per animation
+GIF_BATCH_SIZE = 4     # frames per detector call
+TILE_SIZE = 640        # tiling mode: tile edge in pixels
+TILE_OVERLAP = 160     # tiling mode: overlap between neighbouring tiles
+TILE_WORKERS = 4       # tiling mode: tiles scored in parallel
+
+def is_unsafe(result):
+    return any(r["class"] != "safe" and r["score"] > 0.5 for r in result)
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def scan_gif(image_path: str, budget: int = GIF_FRAME_BUDGET, batch_size: int = GIF_BATCH_SIZE):
+    """Score a sample of frames from an animation, stop at the first unsafe batch."""
+    start = time.perf_counter()
+    report = {"unsafe": False, "trigger_frame": None, "detections": [], "frames_scored": 0}
+
+    for batch in _batches(sample_gif_frames(image_path, budget), batch_size):
+        results = detector.detect_batch([arr for _, arr in batch], batch_size=batch_size)
+        report["frames_scored"] += len(batch)
+        hit = next(((idx, res) for (idx, _), res in zip(batch, results) if is_unsafe(res)), None)
+        if hit:
+            report["unsafe"] = True
+            report["trigger_frame"], report["detections"] = hit
+            break
+
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+def scan_tiled(image_path: str, tile: int = TILE_SIZE, overlap: int = TILE_OVERLAP,
+               workers: int = TILE_WORKERS):
+    """Score a large image tile by tile, detections come back in image coordinates."""
+    return detect_tiled(image_path, detector.detect, tile, overlap, workers)
+
+def main(image_path: str, tiled: bool = False):
+    if tiled:
+        result = scan_tiled(image_path)
+        unsafe = is_unsafe(result)
+    elif Path(image_path).suffix.lower() == ".gif":
+        report = scan_gif(image_path)
+        unsafe = report["unsafe"]
+        where = f" (frame {report['trigger_frame']})" if unsafe else ""
+        print(f"Scored {report['frames_scored']} frame(s) in {report['seconds']:.2f}s{where}")
+    else:
+        img = Image.open(image_path).convert("RGB")   # ensure RGB
+        result = detector.detect(image_path)          # list of dicts
+        unsafe = is_unsafe(result)
 
     if unsafe:
         print("🔴 NSFW")
@@ -17,7 +70,8 @@ def main(image_path: str):
         print("🟢 SAFE")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python filter.py path/to/image.jpg")
+    args = [a for a in sys.argv[1:] if a != "--tile"]
+    if len(args) != 1:
+        print("Usage: python filter.py [--tile] path/to/image.jpg")
         sys.exit(1)
-    main(sys.argv[1])
\ No newline at end of file
+    main(args[0], tiled="--tile" in sys.argv)
\ No newline at end of file
@@ -0,0 +1,116 @@
+# frame_scheduler.py
+# Fixed-rate animation loop for the Tk GUIs that adapts to slow frames.
+import time
+
+
+class FrameScheduler:
+    """Call `tick` about `fps` times a second through widget.after().
+
+    - The delay to the next frame is the time left in the current frame
+      period, not a fixed interval, so the rate holds while frames take a
+      few ms. When a frame overruns, the schedule restarts from now instead
+      of queueing catch-up frames, and at least `min_gap` seconds are left
+      for Tk to handle input and redraw.
+    - Load level: when frames keep taking longer than `budget` of the
+      period (or the real frame interval drifts 50% over), the level goes
+      up, one step per `raise_after` frames, up to `max_level`. After
+      `lower_after` frames comfortably within budget it comes back down.
+      on_load(level) lets the GUI shed decorative work.
+    - Once a second the measured fps and average frame cost are updated
+      and on_stats(scheduler) is called, e.g. to refresh a readout.
+    """
+
+    def __init__(self, widget, tick, fps: float = 20.0, on_load=None, on_stats=None,
+                 budget: float = 0.8, max_level: int = 3, raise_after: int = 10,
+                 lower_after: int = 40, min_gap: float = 0.004):
+        self.widget = widget
+        self.tick = tick
+        self.period = 1.0 / fps
+        self.on_load = on_load
+        self.on_stats = on_stats
+        self.budget = budget
+        self.max_level = max_level
+        self.raise_after = raise_after
+        self.lower_after = lower_after
+        self.min_gap = min_gap
+
+        self.level = 0
+        self.frames = 0
+        self.fps = 0.0
+        self.frame_ms = 0.0     # average tick cost over the last second
+        self.worst_ms = 0.0     # slowest tick in the last second
+        self._after_id = None
+        self._next = None
+        self._last_start = None
+        self._over = self._under = 0
+        self._window = (0.0, 0, 0.0, 0.0)  # start, frames, summed cost, worst cost
+
+    def start(self):
+        now = time.perf_counter()
+        self._next = now
+        self._window = (now, 0, 0.0, 0.0)
+        self._after_id = self.widget.after(1, self._frame)
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass  # the window is already gone
+            self._after_id = None
+
+    def _frame(self):
+        start = time.perf_counter()
+        interval = start - self._last_start if self._last_start is not None else self.period
+        self._last_start = start
+        self.tick()
+        end = time.perf_counter()
+        cost = end - start
+        self.frames += 1
+
+        self._adjust_load(cost, interval)
+        self._update_stats(end, cost)
+
+        self._next += self.period
+        if self._next < end + self.min_gap:
+            self._next = end + self.min_gap
+        self._after_id = self.widget.after(max(1, round((self._next - end) * 1000)), self._frame)
+
+    def _adjust_load(self, cost, interval):
+        if cost > self.budget * self.period or interval > 1.5 * self.period:
+            self._over += 1
+            self._under = 0
+        elif cost < 0.5 * self.budget * self.period:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        level = self.level
+        if self._over >= self.raise_after and level < self.max_level:
+            level += 1
+            self._over = 0
+        elif self._under >= self.lower_after and level > 0:
+            level -= 1
+            self._under = 0
+        if level != self.level:
+            self.level = level
+            if self.on_load is not None:
+                self.on_load(level)
+
+    def _update_stats(self, now, cost):
+        started, frames, total, worst = self._window
+        frames, total, worst = frames + 1, total + cost, max(worst, cost)
+        if now - started < 1.0:
+            self._window = (started, frames, total, worst)
+            return
+        self.fps = frames / (now - started)
+        self.frame_ms = total / frames * 1000
+        self.worst_ms = worst * 1000
+        self._window = (now, 0, 0.0, 0.0)
+        if self.on_stats is not None:
+            self.on_stats(self)
+
+    def readout(self) -> str:
+        text = f"{self.fps:.0f} fps · {self.frame_ms:.1f} ms/frame (max {self.worst_ms:.1f})"
+        return text + (f" · load shedding {self.level}" if self.level else "")
@@ -0,0 +1,224 @@
+# fuzzy_engine.py
+# Rule-based fuzzy inference from a declarative spec, compiled to
+# vectorized NumPy kernels.
+#
+# A spec is a plain dict:
+#
+#   {
+#       "method": "sugeno" or "mamdani",
+#       "inputs": {variable: {set name: ("trapmf", (a, b, c, d)) or ("trimf", (a, b, c))}},
+#       "rules": [({variable: set name, ...}, consequent), ...],
+#       "epsilon": 1e-6,          # added to the Sugeno denominator (default 0)
+#       "clip": (lo, hi),         # optional clamp of the crisp output
+#
+#       # Mamdani only
+#       "output": {"universe": (lo, hi, points),
+#                  "sets": {set name: ("trimf", (a, b, c)), ...}},
+#       "default": 0.0,           # crisp output when no rule fires
+#   }
+#
+# A rule fires with the minimum of its antecedent memberships (AND). Sugeno
+# consequents are constants and the output is their weighted average, summed
+# in rule order. Mamdani consequents name an output set; each set is cut at
+# its rule's strength, the cuts are combined with max and the centroid is
+# returned. Use -inf/inf breakpoints for shoulders that never drop to 0.
+import numpy as np
+
+from fuzzy_mf import trapmf, trimf
+
+MEMBERSHIP = {"trapmf": trapmf, "trimf": trimf}
+
+
+# ----------------------------------------------------------
+#  CONTROLLER SPECS
+# ----------------------------------------------------------
+# fuzzylogic.FuzzyHumidityCtrl; the input is humidity - setpoint
+HUMIDITY_CTRL = {
+    "method": "sugeno",
+    "inputs": {
+        "error": {
+            "dry": ("trapmf", (-50, -50, -15, 0)),
+            "ok":  ("trimf", (-15, 0, 15)),
+            "wet": ("trapmf", (0, 15, 50, 50)),
+        },
+    },
+    "rules": [
+        ({"error": "dry"}, -100),
+        ({"error": "ok"}, 0),
+        ({"error": "wet"}, 100),
+    ],
+    "epsilon": 1e-6,
+    "clip": (-100, 100),
+}
+
+# fuzzylogicc.FuzzyDehumidifier
+DEHUMIDIFIER = {
+    "method": "sugeno",
+    "inputs": {
+        "rh": {
+            "low":     ("trapmf", (-np.inf, -np.inf, 30, 50)),
+            "comfort": ("trimf", (40, 55, 70)),
+            "high":    ("trapmf", (60, 80, np.inf, np.inf)),
+        },
+    },
+    "rules": [
+        ({"rh": "low"}, 0.1),
+        ({"rh": "comfort"}, 0.5),
+        ({"rh": "high"}, 0.95),
+    ],
+    "epsilon": 1e-9,
+    "clip": (0, 1),
+}
+
+# fuzzylogicc.FuzzyHumidifier.base_power; the trend smoothing on top of it
+# depends on earlier readings and stays in FuzzyHumidifier.compute
+HUMIDIFIER = {
+    "method": "sugeno",
+    "inputs": {
+        "rh": {
+            "low":  ("trapmf", (-np.inf, -np.inf, 35, 55)),
+            "ok":   ("trimf", (40, 50, 60)),
+            "high": ("trapmf", (45, 70, np.inf, np.inf)),
+        },
+    },
+    "rules": [
+        ({"rh": "low"}, 0.95),
+        ({"rh": "ok"}, 0.45),
+        ({"rh": "high"}, 0.05),
+    ],
+    "epsilon": 1e-9,
+}
+
+# The dehumidifier rules with fuzzy output sets instead of constants
+DEHUMIDIFIER_MAMDANI = {
+    "method": "mamdani",
+    "inputs": DEHUMIDIFIER["inputs"],
+    "output": {
+        "universe": (0, 1, 101),
+        "sets": {
+            "gentle": ("trapmf", (0, 0, 0.1, 0.3)),
+            "medium": ("trimf", (0.2, 0.5, 0.8)),
+            "strong": ("trapmf", (0.7, 0.95, 1, 1)),
+        },
+    },
+    "rules": [
+        ({"rh": "low"}, "gentle"),
+        ({"rh": "comfort"}, "medium"),
+        ({"rh": "high"}, "strong"),
+    ],
+    "default": 0.0,
+}
+
+
+# ----------------------------------------------------------
+#  COMPILER
+# ----------------------------------------------------------
+def _membership(kind, params):
+    if kind not in MEMBERSHIP:
+        raise ValueError(f"Unknown membership function {kind!r}; use trapmf or trimf")
+    mf = MEMBERSHIP[kind]
+    return lambda x: mf(x, params)
+
+
+class FuzzySystem:
+    """A compiled spec. Call evaluate() with one array (or scalar) per input.
+
+    Compiling resolves every name in the rules once, so evaluation is only
+    the membership kernels, one np.minimum per extra antecedent and the
+    defuzzification, each over the whole input array.
+    """
+
+    def __init__(self, spec: dict):
+        self.method = spec.get("method", "sugeno")
+        if self.method not in ("sugeno", "mamdani"):
+            raise ValueError(f"Unknown inference method {self.method!r}")
+        self.inputs = list(spec["inputs"])
+        self.clip = spec.get("clip")
+        self.epsilon = spec.get("epsilon", 0.0)
+        self.default = spec.get("default", 0.0)
+
+        # One kernel per (variable, set) actually used by a rule
+        self._kernels = {}
+        self._rules = []
+        for antecedent, consequent in spec["rules"]:
+            terms = []
+            for var, name in antecedent.items():
+                try:
+                    kind, params = spec["inputs"][var][name]
+                except KeyError:
+                    raise ValueError(f"Rule uses undefined set {var}.{name}") from None
+                self._kernels.setdefault((var, name), _membership(kind, params))
+                terms.append((var, name))
+            if not terms:
+                raise ValueError("Rule without antecedent")
+            self._rules.append((terms, consequent))
+
+        if self.method == "mamdani":
+            lo, hi, points = spec["output"]["universe"]
+            self.universe = np.linspace(lo, hi, points)
+            out_sets = spec["output"]["sets"]
+            curves = []
+            for _, name in self._rules:
+                if name not in out_sets:
+                    raise ValueError(f"Rule uses undefined output set {name!r}")
+                kind, params = out_sets[name]
+                curves.append(_membership(kind, params)(self.universe))
+            self._out_curves = np.array(curves)
+        else:
+            self._consequents = [c for _, c in self._rules]
+
+    def strengths(self, **inputs):
+        """Firing strength of every rule over the flattened inputs, and the input shape."""
+        missing = set(self.inputs) - set(inputs)
+        if missing:
+            raise ValueError(f"Missing input(s): {', '.join(sorted(missing))}")
+        arrays = np.broadcast_arrays(*(np.atleast_1d(np.asarray(inputs[v], dtype=float))
+                                       for v in self.inputs))
+        values = dict(zip(self.inputs, (a.ravel() for a in arrays)))
+        levels = {key: kernel(values[key[0]]) for key, kernel in self._kernels.items()}
+
+        fired = []
+        for terms, _ in self._rules:
+            w = levels[terms[0]]
+            for key in terms[1:]:
+                w = np.minimum(w, levels[key])
+            fired.append(w)
+        return fired, arrays[0].shape
+
+    def evaluate(self, **inputs) -> np.ndarray:
+        fired, shape = self.strengths(**inputs)
+        if self.method == "sugeno":
+            out = self._sugeno(fired)
+        else:
+            out = self._mamdani(np.array(fired).T)
+        if self.clip is not None:
+            out = np.clip(out, *self.clip)
+        return out.reshape(shape)
+
+    def __call__(self, **inputs) -> float:
+        """evaluate() for scalar inputs, returning a float."""
+        return float(self.evaluate(**inputs)[0])
+
+    def _sugeno(self, fired):
+        # Sum in rule order, the way the hand-written controllers do
+        numerator = denominator = None
+        for w, c in zip(fired, self._consequents):
+            term = w * c
+            numerator = term if numerator is None else numerator + term
+            denominator = w if denominator is None else denominator + w
+        return numerator / (denominator + self.epsilon)
+
+    def _mamdani(self, fired, chunk_cells=1 << 20):
+        out = np.empty(len(fired))
+        step = max(1, chunk_cells // (len(self.universe) * len(self._rules)))
+        for i in range(0, len(fired), step):
+            part = fired[i:i + step]
+            aggregated = np.minimum(part[:, :, None], self._out_curves[None]).max(axis=1)
+            area = aggregated.sum(axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                out[i:i + step] = np.where(area > 0, aggregated @ self.universe / area, self.default)
+        return out
+
+
+def compile_spec(spec: dict) -> FuzzySystem:
+    return FuzzySystem(spec)
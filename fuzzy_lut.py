@@ -0,0 +1,260 @@
+# fuzzy_lut.py
+# Compiled (lookup-table) versions of the fuzzy humidity controllers.
+#
+# Every controller here maps one bounded input to one output, so its whole
+# response can be sampled once into a table and answered afterwards by
+# linear interpolation between the two nearest samples.
+#
+# The controllers are Sugeno weighted averages of piecewise-linear
+# memberships, so between two membership breakpoints their output is a
+# ratio of two linear functions. With every breakpoint on the table grid
+# that holds on each table interval, and the largest interpolation error
+# of each interval follows exactly from three samples: the tables report
+# it as max_error, a guaranteed bound. Without breakpoints only the error
+# seen on a denser grid (sampled_error) is reported, which is no bound.
+#
+#   python fuzzy_lut.py [--resolution 0.1 0.01] [--verify 16]
+import argparse
+import time
+
+import numpy as np
+
+from fuzzylogic import FuzzyHumidityCtrl
+from fuzzylogicc import FuzzyDehumidifier, FuzzyHumidifier
+from fuzzy_engine import DEHUMIDIFIER, HUMIDIFIER
+
+
+def spec_breakpoints(spec) -> list:
+    """Finite membership breakpoints of a one-input fuzzy_engine spec."""
+    (sets,) = spec["inputs"].values()
+    return sorted({float(p) for _, params in sets.values() for p in params if np.isfinite(p)})
+
+
+# ----------------------------------------------------------
+#  LOOKUP TABLE
+# ----------------------------------------------------------
+class LookupTable:
+    """Piecewise-linear table of `func` sampled every `resolution` over [lo, hi].
+
+    Outside [lo, hi] the edge value is returned (clamp=True, for responses
+    that are flat there) or `func` itself is called (clamp=False).
+    `vectorized` says func accepts a NumPy array, which makes building the
+    table and verifying it much faster.
+
+    sampled_error is the largest |table - func| found on a grid `verify`
+    times denser than the table, checked when the table is built. It is an
+    estimate (a lower bound on the true maximum): error between the check
+    points is not seen.
+
+    `breakpoints` are the points where func may change formula, e.g.
+    membership breakpoints. Each one inside [lo, hi] must fall on a sample
+    (ValueError otherwise), and between them func must be a ratio of two
+    linear functions, as a Sugeno controller's output is. max_error is then
+    the exact largest error of the table (inf where the samples don't fit
+    that form, e.g. at an undeclared kink), else None. The form itself is
+    assumed: the denser check only raises ValueError if it finds more.
+    """
+
+    def __init__(self, func, lo: float, hi: float, resolution: float = 0.1,
+                 clamp: bool = True, vectorized: bool = False, verify: int = 16,
+                 breakpoints=None):
+        self.func = func
+        self.lo, self.hi = float(lo), float(hi)
+        self.clamp = clamp
+        self.vectorized = vectorized
+        self.size = int(round((self.hi - self.lo) / resolution)) + 1
+        self.step = (self.hi - self.lo) / (self.size - 1)
+        self.x = np.linspace(self.lo, self.hi, self.size)
+        self.y = self._exact(self.x)
+        self._y = self.y.tolist()  # plain floats for the scalar path
+        self.verify_factor = verify
+        self.sampled_error, self.worst_x = self.verify(verify)
+        self.max_error = None
+        if breakpoints is not None:
+            self._check_grid(breakpoints)
+            self.max_error = float(self.interval_errors().max())
+            if self.sampled_error > self.max_error * (1 + 1e-6) + 1e-12:
+                raise ValueError(f"func is not a ratio of linear functions between the breakpoints: "
+                                 f"error {self.sampled_error:.3g} at x={self.worst_x:g} exceeds "
+                                 f"the bound {self.max_error:.3g}")
+
+    def _check_grid(self, breakpoints):
+        for b in breakpoints:
+            if self.lo < b < self.hi:
+                pos = (b - self.lo) / self.step
+                if abs(pos - round(pos)) > 1e-9 * max(1.0, pos):
+                    raise ValueError(f"Breakpoint {b:g} falls between samples (step {self.step:g}); "
+                                     f"pick a resolution that divides the distance from {self.lo:g}")
+
+    def interval_errors(self) -> np.ndarray:
+        """Largest |table - func| on each table interval, for func a ratio of linear functions there.
+
+        On [0, 1] such a function is (a + b*t) / (1 + g*t); the samples at
+        both ends and the midpoint give g, and the error peaks where the
+        slope of func equals the chord's: |y1 - y0| * |s - 1| / (s + 1)
+        with s = sqrt(1 + g).
+        """
+        y0, y1 = self.y[:-1], self.y[1:]
+        ym = self._exact((self.x[:-1] + self.x[1:]) / 2)
+        bow = ym - (y0 + y1) / 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            g = np.where(bow != 0, -2 * bow / (ym - y1), 0.0)
+            s = np.sqrt(1 + g)
+        err = np.abs(y1 - y0) * np.abs(s - 1) / (s + 1)
+        # 1 + g <= 0 means the denominator vanishes in the interval: no bound
+        return np.where(np.isfinite(err), err, np.inf)
+
+    def _exact(self, xs):
+        if self.vectorized:
+            return np.asarray(self.func(xs), dtype=float)
+        return np.array([self.func(v) for v in xs.tolist()], dtype=float)
+
+    def __call__(self, x: float) -> float:
+        """Interpolated value at one point, in constant time."""
+        if not self.lo <= x <= self.hi:
+            if not self.clamp:
+                return float(self.func(x))
+            return self._y[0] if x < self.lo else self._y[-1]
+        pos = (x - self.lo) / self.step
+        i = min(int(pos), self.size - 2)
+        y0 = self._y[i]
+        return y0 + (self._y[i + 1] - y0) * (pos - i)
+
+    def lookup(self, xs) -> np.ndarray:
+        """Interpolated values for an array of points."""
+        xs = np.asarray(xs, dtype=float)
+        out = np.interp(xs, self.x, self.y)
+        if not self.clamp:
+            outside = (xs < self.lo) | (xs > self.hi)
+            if outside.any():
+                out[outside] = self._exact(xs[outside])
+        return out
+
+    def verify(self, factor: int = 16):
+        """(max abs error, where) against func on a grid `factor` times denser; an estimate."""
+        xs = np.linspace(self.lo, self.hi, (self.size - 1) * factor + 1)
+        err = np.abs(self.lookup(xs) - self._exact(xs))
+        worst = int(np.argmax(err))
+        return float(err[worst]), float(xs[worst])
+
+    def report(self) -> str:
+        sampled = (f"max sampled error {self.sampled_error:.2e} at x={self.worst_x:g} "
+                   f"({self.verify_factor}x denser grid)")
+        if self.max_error is None or self.max_error == np.inf:
+            return f"{self.size} samples, step {self.step:g}: {sampled}, no guaranteed bound"
+        return f"{self.size} samples, step {self.step:g}: max error {self.max_error:.2e} (guaranteed), {sampled}"
+
+
+# ----------------------------------------------------------
+#  COMPILED CONTROLLERS
+# ----------------------------------------------------------
+class CompiledHumidityCtrl:
+    """FuzzyHumidityCtrl answered from a table over the error universe.
+
+    The table is indexed by error (humidity - setpoint), so changing
+    setpoint needs no rebuild. Past ±50 the exact controller is used (its
+    memberships drop to zero there).
+    """
+
+    def __init__(self, ctrl: FuzzyHumidityCtrl = None, resolution: float = 0.1, verify: int = 16):
+        self.ctrl = ctrl or FuzzyHumidityCtrl()
+        lo, hi = self.ctrl.error_universe[0], self.ctrl.error_universe[-1]
+        breakpoints = {*self.ctrl.dry_set, *self.ctrl.ok_set, *self.ctrl.wet_set}
+        self.table = LookupTable(lambda e: self.ctrl.compute_batch(e, 0.0), lo, hi, resolution,
+                                 clamp=False, vectorized=True, verify=verify, breakpoints=breakpoints)
+
+    @property
+    def setpoint(self):
+        return self.ctrl.setpoint
+
+    @setpoint.setter
+    def setpoint(self, value):
+        self.ctrl.setpoint = value
+
+    def compute(self, current_humidity: float) -> float:
+        return self.table(current_humidity - self.ctrl.setpoint)
+
+    def compute_batch(self, humidity, setpoint=None) -> np.ndarray:
+        if setpoint is None:
+            setpoint = self.ctrl.setpoint
+        return self.table.lookup(np.asarray(humidity, dtype=float) - np.asarray(setpoint, dtype=float))
+
+
+class CompiledDehumidifier(FuzzyDehumidifier):
+    """FuzzyDehumidifier answered from a table over 0–100 %RH.
+
+    The response is flat below 30 and above 80 %RH, so values outside the
+    table are clamped to its edges.
+    """
+
+    def __init__(self, resolution: float = 0.1, verify: int = 16):
+        self.table = LookupTable(super().compute, 0, 100, resolution, verify=verify,
+                                 breakpoints=spec_breakpoints(DEHUMIDIFIER))
+
+    def compute(self, rh):
+        return self.table(rh)
+
+
+class CompiledHumidifier(FuzzyHumidifier):
+    """FuzzyHumidifier with its stateless base_power() taken from a table.
+
+    The trend smoothing in compute() still runs on every call, since it
+    depends on the previous readings.
+    """
+
+    def __init__(self, resolution: float = 0.1, verify: int = 16):
+        super().__init__()
+        self.table = LookupTable(super().base_power, 0, 100, resolution, verify=verify,
+                                 breakpoints=spec_breakpoints(HUMIDIFIER))
+
+    def base_power(self, rh):
+        return self.table(rh)
+
+
+def compile_controller(ctrl, resolution: float = 0.1, verify: int = 16):
+    """Return the compiled counterpart of a controller instance."""
+    if isinstance(ctrl, FuzzyHumidityCtrl):
+        return CompiledHumidityCtrl(ctrl, resolution, verify)
+    if isinstance(ctrl, FuzzyHumidifier):
+        compiled = CompiledHumidifier(resolution, verify)
+        compiled.last_rh = ctrl.last_rh
+        return compiled
+    if isinstance(ctrl, FuzzyDehumidifier):
+        return CompiledDehumidifier(resolution, verify)
+    raise TypeError(f"No compiled mode for {type(ctrl).__name__}")
+
+
+# ----------------------------------------------------------
+def _calls_per_sec(fn, values):
+    start = time.perf_counter()
+    for v in values:
+        fn(v)
+    return len(values) / (time.perf_counter() - start)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the controller lookup tables and report their error")
+    ap.add_argument("--resolution", type=float, nargs="+", default=[1.0, 0.1, 0.01])
+    ap.add_argument("--verify", type=int, default=16, help="verification grid density vs the table")
+    args = ap.parse_args()
+
+    values = np.random.default_rng(0).uniform(0, 100, 20_000).tolist()
+    exact = {
+        "FuzzyHumidityCtrl": FuzzyHumidityCtrl(),
+        "FuzzyDehumidifier": FuzzyDehumidifier(),
+        "FuzzyHumidifier": FuzzyHumidifier(),
+    }
+    for name, ctrl in exact.items():
+        base_rate = _calls_per_sec(ctrl.compute, values)
+        print(f"{name}: exact {base_rate:,.0f} calls/s")
+        for resolution in args.resolution:
+            start = time.perf_counter()
+            compiled = compile_controller(ctrl, resolution, args.verify)
+            build = time.perf_counter() - start
+            rate = _calls_per_sec(compiled.compute, values)
+            print(f"  resolution {resolution:g}: {compiled.table.report()}, "
+                  f"built in {build * 1e3:.0f} ms, {rate:,.0f} calls/s ({rate / base_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
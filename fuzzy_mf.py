@@ -0,0 +1,79 @@
+# fuzzy_mf.py
+# Closed-form trapezoid and triangle membership functions.
+#
+# Same shapes as skfuzzy.trapmf / skfuzzy.trimf, but evaluated directly at
+# the input instead of sampling the set on a universe and interpolating
+# with skfuzzy.interp_membership. Scalars stay plain Python floats (no
+# NumPy overhead per call); arrays are evaluated in one vectorized pass.
+# skfuzzy itself is only imported by validate().
+import numpy as np
+
+
+def trapmf(x, abcd):
+    """Trapezoid membership of x: 0 up to a, rising to 1 at b, 1 until c, 0 again at d.
+
+    a == b or c == d give a shoulder (1 right at the edge), as in skfuzzy.
+    Membership is 0 outside [a, d], which matches interp_membership's
+    zero_outside_x when the set ends at the edge of its universe.
+    a..d can also be arrays broadcasting against x, one set per element.
+    """
+    a, b, c, d = abcd
+    if isinstance(a, np.ndarray):
+        return _trapmf_per_element(np.asarray(x, dtype=float), a, b, c, d)
+    if isinstance(x, (int, float)) or np.ndim(x) == 0:
+        if x < a or x > d:
+            return 0.0
+        if x < b:
+            return (x - a) / (b - a)
+        if x <= c:
+            return 1.0
+        if x < d:
+            return (d - x) / (d - c)
+        return 0.0
+
+    # Rising edge, falling edge and the plateau at 1, combined with min and
+    # floored at 0; each edge is exactly the scalar formula where it applies
+    x = np.asarray(x, dtype=float)
+    rising = (x - a) / (b - a) if b > a else (x >= b).astype(float)
+    falling = (d - x) / (d - c) if d > c else (x <= c).astype(float)
+    y = np.minimum(rising, falling)
+    np.minimum(y, 1.0, out=y)
+    np.maximum(y, 0.0, out=y)
+    return y
+
+
+def _trapmf_per_element(x, a, b, c, d):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rising = np.where(b > a, (x - a) / (b - a), x >= b)
+        falling = np.where(d > c, (d - x) / (d - c), x <= c)
+    y = np.minimum(rising, falling)
+    np.minimum(y, 1.0, out=y)
+    np.maximum(y, 0.0, out=y)
+    return y
+
+
+def trimf(x, abc):
+    """Triangle membership of x: 0 at a, 1 at b, 0 at c."""
+    a, b, c = abc
+    return trapmf(x, (a, b, b, c))
+
+
+def validate(universe, sets, points=10_001):
+    """Largest difference from skfuzzy for each named set on `universe`.
+
+    `sets` maps a name to ("trapmf", abcd) or ("trimf", abc). The skfuzzy
+    reference samples the set on `universe` and interpolates, exactly what
+    the controllers did before, at `points` inputs spanning a little past
+    both ends of the universe.
+    """
+    import skfuzzy as fuzz
+
+    universe = np.asarray(universe, dtype=float)
+    span = universe[-1] - universe[0]
+    xs = np.linspace(universe[0] - 0.1 * span, universe[-1] + 0.1 * span, points)
+    errors = {}
+    for name, (kind, params) in sets.items():
+        reference = fuzz.interp_membership(universe, getattr(fuzz, kind)(universe, params), xs)
+        mf = trapmf if kind == "trapmf" else trimf
+        errors[name] = float(np.max(np.abs(mf(xs, params) - reference)))
+    return errors
@@ -1,8 +1,10 @@
 import numpy as np
-import skfuzzy as fuzz
+from fuzzy_mf import trapmf, trimf
+from canvas_pool import CallCounter, OvalPool
+from frame_scheduler import FrameScheduler
+from render_backend import TkRenderer, OffscreenVar, OffscreenLabel
 import tkinter as tk
 from tkinter import ttk
-import random
 import math
 
 
@@ -16,10 +18,15 @@ class FuzzyHumidityCtrl:
         # Error universe (difference from target humidity)
         self.error_universe = np.arange(-50, 51, 1)
 
-        # Fuzzy sets for humidity error
-        self.dry_mf  = fuzz.trapmf(self.error_universe, [-50, -50, -15, 0])
-        self.ok_mf   = fuzz.trimf(self.error_universe, [-15, 0, 15])
-        self.wet_mf  = fuzz.trapmf(self.error_universe, [0, 15, 50, 50])
+        # Fuzzy sets for humidity error (breakpoints), evaluated in closed form
+        self.dry_set = (-50, -50, -15, 0)
+        self.ok_set  = (-15, 0, 15)
+        self.wet_set = (0, 15, 50, 50)
+
+        # Sampled curves, for plotting
+        self.dry_mf  = trapmf(self.error_universe, self.dry_set)
+        self.ok_mf   = trimf(self.error_universe, self.ok_set)
+        self.wet_mf  = trapmf(self.error_universe, self.wet_set)
 
         # Singleton outputs (Sugeno style)
         self.out_centers = [-100, 0, 100]
@@ -29,9 +36,9 @@ class FuzzyHumidityCtrl:
         error = current_humidity - self.setpoint   # negative → dry, positive → wet
 
         # Membership degrees
-        dry_level = fuzz.interp_membership(self.error_universe, self.dry_mf, error)
-        ok_level  = fuzz.interp_membership(self.error_universe, self.ok_mf,  error)
-        wet_level = fuzz.interp_membership(self.error_universe, self.wet_mf, error)
+        dry_level = trapmf(error, self.dry_set)
+        ok_level  = trimf(error, self.ok_set)
+        wet_level = trapmf(error, self.wet_set)
 
         # Sugeno defuzzification (weighted average of singletons)
         numerator = (dry_level * -100) + (ok_level * 0) + (wet_level * 100)
@@ -40,59 +47,146 @@ class FuzzyHumidityCtrl:
 
         return max(-100, min(100, action))  # clamp
 
+    def compute_batch(self, humidity, setpoint=None) -> np.ndarray:
+        """Vectorized compute() over arrays of humidity (and setpoints).
+
+        `setpoint` defaults to self.setpoint and broadcasts against
+        `humidity`. Same operations in the same order as compute(), so every
+        element matches the scalar result exactly.
+        """
+        if setpoint is None:
+            setpoint = self.setpoint
+        error = np.asarray(humidity, dtype=float) - np.asarray(setpoint, dtype=float)
+
+        dry_level = trapmf(error, self.dry_set)
+        ok_level  = trimf(error, self.ok_set)
+        wet_level = trapmf(error, self.wet_set)
+
+        numerator = (dry_level * -100) + (ok_level * 0) + (wet_level * 100)
+        denominator = dry_level + ok_level + wet_level + 1e-6
+        return np.clip(numerator / denominator, -100, 100)
+
 
 # ----------------------------------------------------------
-#  MIST PARTICLE CLASS
+#  MIST PARTICLES
 # ----------------------------------------------------------
-class MistParticle:
-    def __init__(self, x, y, vx, vy, size, color, lifetime):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.size = size
-        self.color = color
-        self.lifetime = lifetime
-        self.age = 0
-        self.canvas_id = None
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.age += 1
-        
+PARTICLE_COLORS = ["#3498db", "#e67e22"]  # humidifier (blue), dehumidifier (orange)
+PARTICLE_CAPS = [2000, 600, 250, 100]      # max live particles per load-shedding level
+
+
+class MistParticles:
+    """All mist particles, one preallocated NumPy array per attribute.
+
+    Slots of dead particles go back on a free list and are reused by the
+    next spawn(), so nothing is allocated per particle. When every slot is
+    taken, new particles are dropped until some expire.
+    """
+
+    def __init__(self, capacity: int = 2000):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.age = np.zeros(capacity)
+        self.lifetime = np.ones(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)  # index into PARTICLE_COLORS
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Stack of free slot indices; the top is self._free[self._n_free - 1]
+        self._free = np.arange(capacity)[::-1].copy()
+        self._n_free = capacity
+
+    def __len__(self):
+        return self.capacity - self._n_free
+
+    def spawn(self, x, y, vx, vy, size, kind, lifetime) -> np.ndarray:
+        """Add len(x) particles (array arguments); returns the slots used."""
+        n = min(len(x), self._n_free)
+        idx = self._free[self._n_free - n:self._n_free].copy()
+        self._n_free -= n
+        self.x[idx], self.y[idx] = x[:n], y[:n]
+        self.vx[idx], self.vy[idx] = vx[:n], vy[:n]
+        self.size[idx], self.lifetime[idx] = size[:n], lifetime[:n]
+        self.kind[idx] = kind
+        self.age[idx] = 0
+        self.alive[idx] = True
+        return idx
+
+    def release(self, idx):
+        """Return slots to the free list."""
+        idx = np.asarray(idx)
+        self.alive[idx] = False
+        self._free[self._n_free:self._n_free + len(idx)] = idx
+        self._n_free += len(idx)
+
+    def step(self):
+        """Advance every live particle one frame.
+
+        Returns (visible, expired): slots still worth drawing, and slots
+        that ran out of lifetime or shrank below half a pixel. Expired
+        slots are left for the caller to release().
+        """
+        idx = np.flatnonzero(self.alive)
+        self.x[idx] += self.vx[idx]
+        self.y[idx] += self.vy[idx]
+        self.age[idx] += 1
+
         # Add some drift and size change
-        self.vx *= 0.98  # friction
-        self.vy *= 0.98
-        self.vy -= 0.1   # slight upward movement
-        
-        return self.age < self.lifetime
+        self.vx[idx] *= 0.98  # friction
+        self.vy[idx] *= 0.98
+        self.vy[idx] -= 0.1   # slight upward movement
+
+        visible = (self.age[idx] < self.lifetime[idx]) & (self.draw_size(idx) > 0.5)
+        return idx[visible], idx[~visible]
+
+    def alpha(self, idx):
+        return np.maximum(0, 1 - self.age[idx] / self.lifetime[idx])
 
-    def get_alpha(self):
-        return max(0, 1 - (self.age / self.lifetime))
+    def draw_size(self, idx):
+        return self.size[idx] * self.alpha(idx)
 
 
 # ----------------------------------------------------------
 #  GUI
 # ----------------------------------------------------------
 class SmartHumidityGUI:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Smart Living Room Humidity Controller")
-        self.root.geometry("700x500")
-        self.root.resizable(False, False)
-        self.root.configure(bg="#2c3e50")
+    def __init__(self, renderer=None):
+        """Open the window, or draw on `renderer` (e.g. OffscreenRenderer(450, 400)) without one.
+
+        Offscreen the controls are stand-ins and nothing is scheduled:
+        each animate() call draws and presents one frame.
+        """
+        self.root = None
+        if renderer is None:
+            self.root = tk.Tk()
+            self.root.title("Smart Living Room Humidity Controller")
+            self.root.geometry("700x500")
+            self.root.resizable(False, False)
+            self.root.configure(bg="#2c3e50")
 
         self.ctrl = FuzzyHumidityCtrl(setpoint=50.0)
-        self.mist_particles = []
+        self.particles = MistParticles()
+        self.rng = np.random.default_rng()
         self.animation_running = True
 
         # Main layout
-        self.setup_ui()
+        if renderer is None:
+            self.setup_ui()
+        else:
+            self.setup_offscreen(renderer)
         self.draw_living_room()
-        
+        self.oval_pool = OvalPool(self.canvas)  # created last, so mist is drawn above the room
+        self.frame_calls = {}
+        self.particle_cap = PARTICLE_CAPS[0]
+        self.load_level = 0
+
         # Start animation
-        self.animate()
+        self.scheduler = FrameScheduler(self.root, self.animate, fps=20,
+                                        on_load=self.shed_load, on_stats=self.show_frame_stats)
+        if self.root is not None:
+            self.scheduler.start()
 
     def setup_ui(self):
         # Left control panel
@@ -144,14 +238,29 @@ class SmartHumidityGUI:
                                    font=("Arial", 10), fg="#95a5a6", bg="#34495e")
         self.lbl_devices.pack()
 
+        # Frame rate / frame cost readout
+        self.lbl_fps = tk.Label(left_frame, text="", font=("Arial", 8),
+                                fg="#7f8c8d", bg="#34495e", justify=tk.LEFT)
+        self.lbl_fps.pack(side=tk.BOTTOM, anchor="w")
+
         # Canvas for living room
         canvas_frame = tk.Frame(self.root, bg="#2c3e50")
         canvas_frame.pack(side=tk.RIGHT, padx=20, pady=20)
         
-        self.canvas = tk.Canvas(canvas_frame, width=450, height=400, 
-                               bg="#ecf0f1", highlightthickness=0)
+        # Canvas calls are counted so the per-frame Tk cost can be shown
+        self.renderer = TkRenderer(canvas_frame, width=450, height=400, bg="#ecf0f1", highlightthickness=0)
+        self.canvas = CallCounter(self.renderer)
         self.canvas.pack()
 
+    def setup_offscreen(self, renderer):
+        # The controls of setup_ui, as stand-ins holding the same values
+        self.hum_scale, self.target_scale = OffscreenVar(40), OffscreenVar(50)
+        self.lbl_current, self.lbl_target = OffscreenLabel(text="40%"), OffscreenLabel(text="50%")
+        self.lbl_action, self.lbl_devices = OffscreenLabel(text="Action: 0.0"), OffscreenLabel(text="Both OFF")
+        self.lbl_fps = OffscreenLabel(text="")
+        self.renderer = renderer
+        self.canvas = CallCounter(renderer)
+
     def draw_living_room(self):
         # Room walls
         self.canvas.create_rectangle(20, 20, 430, 380, outline="#34495e", width=4, fill="#f8f9fa")
@@ -200,66 +309,40 @@ class SmartHumidityGUI:
         """Create mist particles based on device type and power"""
         if power < 10:
             return
-            
-        num_particles = int(power / 10)  # More power = more particles
-        
-        for _ in range(num_particles):
-            # Start from device center with some randomness
-            x = self.device_x + random.uniform(-10, 10)
-            y = self.device_y + random.uniform(-10, 10)
-            
-            if device_type == "humidifier":
-                # Blue mist particles going upward and outward
-                vx = random.uniform(-1, 1)
-                vy = random.uniform(-3, -1)
-                color = "#3498db"
-                size = random.uniform(3, 8)
-                lifetime = random.randint(50, 100)
-            else:  # dehumidifier
-                # Orange particles going downward (representing extracted moisture)
-                vx = random.uniform(-0.5, 0.5)
-                vy = random.uniform(0.5, 2)
-                color = "#e67e22"
-                size = random.uniform(2, 5)
-                lifetime = random.randint(30, 60)
-            
-            particle = MistParticle(x, y, vx, vy, size, color, lifetime)
-            self.mist_particles.append(particle)
+
+        n = int(power / 10)  # More power = more particles
+        n = min(n, self.particle_cap - len(self.particles))
+        if n <= 0:
+            return
+        rng = self.rng
+
+        # Start from device center with some randomness
+        x = self.device_x + rng.uniform(-10, 10, n)
+        y = self.device_y + rng.uniform(-10, 10, n)
+
+        if device_type == "humidifier":
+            # Blue mist particles going upward and outward
+            self.particles.spawn(x, y, rng.uniform(-1, 1, n), rng.uniform(-3, -1, n),
+                                 rng.uniform(3, 8, n), 0, rng.integers(50, 101, n))
+        else:  # dehumidifier
+            # Orange particles going downward (representing extracted moisture)
+            self.particles.spawn(x, y, rng.uniform(-0.5, 0.5, n), rng.uniform(0.5, 2, n),
+                                 rng.uniform(2, 5, n), 1, rng.integers(30, 61, n))
 
     def update_particles(self):
         """Update and draw all mist particles"""
-        active_particles = []
-        
-        for particle in self.mist_particles:
-            if particle.update():
-                alpha = particle.get_alpha()
-                # Calculate color with alpha
-                if particle.color == "#3498db":  # blue
-                    intensity = int(255 * alpha)
-                    color = f"#{52:02x}{152:02x}{219:02x}"
-                else:  # orange
-                    intensity = int(255 * alpha)
-                    color = f"#{230:02x}{126:02x}{34:02x}"
-                
-                # Remove old particle from canvas
-                if particle.canvas_id:
-                    self.canvas.delete(particle.canvas_id)
-                
-                # Draw new particle
-                size = particle.size * alpha
-                if size > 0.5:
-                    particle.canvas_id = self.canvas.create_oval(
-                        particle.x - size/2, particle.y - size/2,
-                        particle.x + size/2, particle.y + size/2,
-                        fill=color, outline=""
-                    )
-                    active_particles.append(particle)
-            else:
-                # Remove expired particle
-                if particle.canvas_id:
-                    self.canvas.delete(particle.canvas_id)
-        
-        self.mist_particles = active_particles
+        p = self.particles
+        visible, expired = p.step()
+        p.release(expired)
+        if self.load_level >= 2 and self.scheduler.frames % 2:
+            return  # overloaded: move the mist every frame but redraw every other one
+
+        # Reposition pooled ovals rather than deleting and recreating them
+        half = p.draw_size(visible) / 2
+        x, y = p.x[visible], p.y[visible]
+        boxes = np.column_stack([x - half, y - half, x + half, y + half]).tolist()
+        self.oval_pool.draw(boxes, [PARTICLE_COLORS[k] for k in p.kind[visible].tolist()])
+        self.frame_calls = self.canvas.frame()
 
     def update_setpoint(self, _):
         self.ctrl.setpoint = self.target_scale.get()
@@ -298,14 +381,25 @@ class SmartHumidityGUI:
         self.lbl_devices.config(text=dev_text)
 
     def animate(self):
-        """Main animation loop"""
+        """One animation frame; FrameScheduler calls this ~20 times a second"""
         if self.animation_running:
             self.update_particles()
-            self.root.after(50, self.animate)  # ~20 FPS
+        self.renderer.present()
+
+    def shed_load(self, level):
+        """Fewer particles, and fewer redraws, while frames run over budget"""
+        self.load_level = level
+        self.particle_cap = PARTICLE_CAPS[level]
+
+    def show_frame_stats(self, scheduler):
+        calls = sum(self.frame_calls.values())
+        self.lbl_fps.config(text=f"{scheduler.readout()}\n{len(self.particles)} particles, "
+                                 f"{calls} canvas calls/frame")
 
     def run(self):
         self.root.mainloop()
         self.animation_running = False
+        self.scheduler.stop()
 
 
 # ----------------------------------------------------------
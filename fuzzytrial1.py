@@ -1,5 +1,5 @@
 import numpy as np
-import skfuzzy as fuzz
+from fuzzy_mf import trapmf, trimf
 import tkinter as tk
 from tkinter import ttk
 import random
@@ -16,10 +16,15 @@ class FuzzyHumidityCtrl:
         # Error universe (difference from target humidity)
         self.error_universe = np.arange(-50, 51, 1)
 
-        # Fuzzy sets for humidity error
-        self.dry_mf  = fuzz.trapmf(self.error_universe, [-50, -50, -15, 0])
-        self.ok_mf   = fuzz.trimf(self.error_universe, [-15, 0, 15])
-        self.wet_mf  = fuzz.trapmf(self.error_universe, [0, 15, 50, 50])
+        # Fuzzy sets for humidity error (breakpoints), evaluated in closed form
+        self.dry_set = (-50, -50, -15, 0)
+        self.ok_set  = (-15, 0, 15)
+        self.wet_set = (0, 15, 50, 50)
+
+        # Sampled curves, for plotting
+        self.dry_mf  = trapmf(self.error_universe, self.dry_set)
+        self.ok_mf   = trimf(self.error_universe, self.ok_set)
+        self.wet_mf  = trapmf(self.error_universe, self.wet_set)
 
         # Singleton outputs (Sugeno style)
         self.out_centers = [-100, 0, 100]
@@ -29,9 +34,9 @@ class FuzzyHumidityCtrl:
         error = current_humidity - self.setpoint   # negative → dry, positive → wet
 
         # Membership degrees
-        dry_level = fuzz.interp_membership(self.error_universe, self.dry_mf, error)
-        ok_level  = fuzz.interp_membership(self.error_universe, self.ok_mf,  error)
-        wet_level = fuzz.interp_membership(self.error_universe, self.wet_mf, error)
+        dry_level = trapmf(error, self.dry_set)
+        ok_level  = trimf(error, self.ok_set)
+        wet_level = trapmf(error, self.wet_set)
 
         # Sugeno defuzzification (weighted average of singletons)
         numerator = (dry_level * -100) + (ok_level * 0) + (wet_level * 100)
@@ -0,0 +1,133 @@
+# gifsample.py
+# Pick a small set of frames out of an animated GIF so the classifier
+# doesn't have to score every single frame.
+import struct
+import zlib
+import numpy as np
+from PIL import Image
+
+
+# ----------------------------------------------------------
+#  GIF HEADER WALK (no LZW decoding)
+# ----------------------------------------------------------
+def _skip_sub_blocks(fp):
+    """Skip a chain of GIF data sub-blocks, return the number of data bytes."""
+    total = 0
+    while True:
+        size = fp.read(1)
+        if not size or size[0] == 0:
+            return total
+        total += size[0]
+        fp.seek(size[0], 1)
+
+
+def gif_frame_headers(path):
+    """Return the canvas size and a list of per-frame header info.
+
+    Only block headers are read; image data is skipped, so this is cheap
+    even for long animations.
+    """
+    frames = []
+    with open(path, "rb") as fp:
+        if fp.read(6) not in (b"GIF87a", b"GIF89a"):
+            raise ValueError(f"{path} is not a GIF file")
+        width, height, flags = struct.unpack("<HHB", fp.read(5))
+        fp.read(2)  # background colour + aspect ratio
+        global_palette = None
+        if flags & 0x80:
+            global_palette = zlib.crc32(fp.read(3 << ((flags & 7) + 1)))
+
+        transparent = False
+        while True:
+            block = fp.read(1)
+            if not block or block == b";":
+                break
+            if block == b"!":
+                label = fp.read(1)
+                if label == b"\xf9":
+                    size = fp.read(1)
+                    gce = fp.read(size[0]) if size else b""
+                    if not gce:
+                        break  # truncated or empty control block
+                    transparent = bool(gce[0] & 1)
+                _skip_sub_blocks(fp)
+            elif block == b",":
+                descriptor = fp.read(9)
+                if len(descriptor) < 9:
+                    break  # truncated image descriptor
+                x0, y0, w, h, flags = struct.unpack("<HHHHB", descriptor)
+                palette = global_palette
+                if flags & 0x80:
+                    palette = zlib.crc32(fp.read(3 << ((flags & 7) + 1)))
+                fp.read(1)  # LZW minimum code size
+                frames.append({
+                    "extent": (x0, y0, x0 + w, y0 + h),
+                    "bytes": _skip_sub_blocks(fp),
+                    "transparent": transparent,
+                    "palette": palette,
+                })
+                transparent = False
+            else:
+                break  # corrupt stream, keep what we have
+    return (width, height), frames
+
+
+# ----------------------------------------------------------
+#  FRAME SELECTION
+# ----------------------------------------------------------
+def scene_change_scores(canvas, frames):
+    """Score how much new picture each frame brings in.
+
+    A frame that repaints a large part of the canvas with a lot of
+    compressed data is most likely a cut to a new scene; small or cheap
+    delta frames score low. Opaque full-canvas frames and frames that
+    switch to a different colour table get a bonus.
+    """
+    area = max(canvas[0] * canvas[1], 1)
+    scores = np.zeros(len(frames))
+    for i, f in enumerate(frames):
+        x0, y0, x1, y1 = f["extent"]
+        coverage = min((x1 - x0) * (y1 - y0) / area, 1.0)
+        density = f["bytes"] / area
+        scores[i] = coverage * density
+        if coverage >= 1.0 and not f["transparent"]:
+            scores[i] *= 2
+        if i and f["palette"] != frames[i - 1]["palette"]:
+            scores[i] *= 2
+    return scores
+
+
+def select_frames(n_frames, scores, budget=8):
+    """Return sorted frame indices: half uniform, half by scene change."""
+    if n_frames <= budget:
+        return list(range(n_frames))
+
+    n_uniform = max(1, (budget + 1) // 2)
+    chosen = set(np.linspace(0, n_frames - 1, n_uniform).round().astype(int).tolist())
+
+    for idx in np.argsort(-scores, kind="stable"):
+        if len(chosen) >= budget:
+            break
+        chosen.add(int(idx))
+    return sorted(chosen)
+
+
+def sample_gif_frames(path, budget=8):
+    """Yield (frame_index, BGR array) for the sampled frames of a GIF.
+
+    GIF frames are painted on top of each other, so Pillow still has to run
+    through the frames in between, but only the sampled ones are converted
+    and handed to the classifier. Arrays use the same BGR layout that
+    cv2.imread produces, so detectors see them exactly like a file path.
+    """
+    canvas, headers = gif_frame_headers(path)
+    indices = select_frames(len(headers), scene_change_scores(canvas, headers), budget)
+
+    with Image.open(path) as im:
+        for idx in indices:
+            try:
+                im.seek(idx)
+            except EOFError:
+                break
+            rgb = np.asarray(im.convert("RGB"))
+            yield idx, np.ascontiguousarray(rgb[:, :, ::-1])
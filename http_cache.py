@@ -0,0 +1,130 @@
+# http_cache.py
+# Disk-backed HTTP response cache for the review scrapers.
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("CSELEC2_CACHE", Path.home() / ".cache" / "cselec2")) / "pages"
+
+
+class ResponseCache:
+    """Cache page bodies on disk, keyed by URL.
+
+    - max_age (seconds): entries younger than this are served without any
+      request. None means every use is revalidated with a conditional GET
+      (If-None-Match / If-Modified-Since), which costs a round trip but no
+      body when the page hasn't changed.
+    - offline: never touch the network, serve whatever is cached.
+
+    Every get() is counted in .stats, failed fetches (non-200 answers and
+    network errors) under "errors", so hit_rate is over all requests.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_age=None, offline=False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.offline = offline
+        self.stats = {"requests": 0, "fresh": 0, "revalidated": 0, "misses": 0, "errors": 0,
+                      "bytes_saved": 0}
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.html", self.directory / f"{key}.json"
+
+    def _load(self, url):
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            return meta, body_path.read_text(encoding="utf-8")
+        except (OSError, ValueError):
+            return None, None
+
+    def _write(self, path, text):
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _store(self, url, meta, body=None):
+        body_path, meta_path = self._paths(url)
+        if body is not None:
+            self._write(body_path, body)
+        self._write(meta_path, json.dumps(meta))
+
+    def _count(self, kind, saved=0):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[kind] += 1
+            self.stats["bytes_saved"] += saved
+
+    def get(self, url, headers=None, session=requests, timeout=10):
+        """Return the page body, from cache when possible, or None.
+
+        Raises requests.RequestException on network errors like requests does.
+        """
+        meta, body = self._load(url)
+        if meta is not None:
+            age = time.time() - meta["fetched_at"]
+            if self.offline or (self.max_age is not None and age < self.max_age):
+                self._count("fresh", meta["size"])
+                return body
+        if self.offline:
+            self._count("misses")
+            return None
+
+        conditional = dict(headers or {})
+        if meta is not None:
+            if meta.get("etag"):
+                conditional["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                conditional["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            response = session.get(url, headers=conditional, timeout=timeout)
+        except requests.RequestException:
+            self._count("errors")
+            raise
+        if response.status_code == 304 and meta is not None:
+            meta["fetched_at"] = time.time()
+            self._store(url, meta)
+            self._count("revalidated", meta["size"])
+            return body
+        if response.status_code != 200:
+            self._count("errors")  # throttled, blocked or gone: still a request, never a hit
+            print(f"HTTP error: {response.status_code}")
+            return None
+
+        self._count("misses")
+        self._store(url, {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "size": len(response.content),
+        }, response.text)
+        return response.text
+
+    def drop(self, url):
+        """Forget a cached page, e.g. when it turned out to be a CAPTCHA."""
+        for path in self._paths(url):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    @property
+    def hit_rate(self):
+        hits = self.stats["fresh"] + self.stats["revalidated"]
+        return hits / self.stats["requests"] if self.stats["requests"] else 0.0
+
+    def report(self):
+        s = self.stats
+        return (f"cache: {s['requests']} requests, {self.hit_rate:.0%} hits "
+                f"({s['fresh']} fresh, {s['revalidated']} revalidated, {s['misses']} misses, {s['errors']} errors), "
+                f"{s['bytes_saved'] / 1024:.0f} KB not downloaded")
@@ -0,0 +1,183 @@
+# humidity_sim.py
+# Headless room-humidity simulation driven by the fuzzy controllers,
+# vectorized over thousands of independent rooms.
+#
+# Each room is a single well-mixed moisture store, tracked as %RH:
+#   - leakage pulls it towards the outdoor humidity (daily cycle)
+#   - occupants add a steady trickle, plus random showers / cooking spikes
+#   - the device adds or removes moisture in proportion to its power
+# Room parameters are drawn at random per room, so one run covers a spread
+# of small/large, leaky/tight rooms.
+#
+#   python humidity_sim.py [--controller ctrl] [--rooms 100 1000 10000] [--days 1 30]
+import argparse
+import time
+
+import numpy as np
+
+from fuzzylogic import FuzzyHumidityCtrl
+from fuzzylogicc import smooth_rh
+from fuzzy_engine import compile_spec, DEHUMIDIFIER, HUMIDIFIER
+
+
+# ----------------------------------------------------------
+#  CONTROLLER DRIVERS
+# ----------------------------------------------------------
+# Each driver maps the humidity of every room to the device effect in
+# [-1, 1]: positive adds moisture, negative removes it.
+class CtrlDriver:
+    """FuzzyHumidityCtrl (fuzzylogic.py) via compute_batch.
+
+    The action is negative when the room is drier than the setpoint, so
+    the device effect is -action / 100.
+    """
+
+    def __init__(self, rooms):
+        self.ctrl = FuzzyHumidityCtrl()
+
+    def __call__(self, rh, setpoint):
+        return self.ctrl.compute_batch(rh, setpoint) / -100
+
+
+class DehumidifierDriver:
+    """FuzzyDehumidifier (fuzzylogicc.py), as the DEHUMIDIFIER spec. Ignores the setpoint."""
+
+    def __init__(self, rooms):
+        self.system = compile_spec(DEHUMIDIFIER)
+
+    def __call__(self, rh, setpoint):
+        return -self.system.evaluate(rh=rh)
+
+
+class HumidifierDriver:
+    """FuzzyHumidifier (fuzzylogicc.py): HUMIDIFIER spec plus its trend smoothing, per room."""
+
+    def __init__(self, rooms):
+        self.system = compile_spec(HUMIDIFIER)
+        self.last_rh = np.full(rooms, 45.0)
+
+    def __call__(self, rh, setpoint):
+        # Same steps as FuzzyHumidifier.compute, one element per room
+        base = self.system.evaluate(rh=rh)
+        d = np.clip((rh - self.last_rh) / 20, -0.08, 0.08)
+        power = np.clip(base - d, 0, 1)
+        self.last_rh = smooth_rh(self.last_rh, rh)
+        return power
+
+
+DRIVERS = {"ctrl": CtrlDriver, "dehumidifier": DehumidifierDriver, "humidifier": HumidifierDriver}
+
+
+# ----------------------------------------------------------
+#  ROOM MODEL
+# ----------------------------------------------------------
+class RoomSim:
+    """`rooms` independent rooms advanced together, `dt` seconds per step.
+
+    Per-room rates are in %RH per hour. Statistics are accumulated as the
+    simulation runs, so memory does not grow with the horizon.
+
+    `controller` is a name from DRIVERS or a callable that builds a driver
+    for a given number of rooms. With `copies` > 1 the rooms are simulated
+    that many times side by side, with the same random events in every
+    copy, e.g. to compare controller variants (room i of copy k is element
+    k * rooms + i).
+    """
+
+    def __init__(self, rooms: int, controller="ctrl", setpoint: float = 50.0,
+                 dt: float = 60.0, band: float = 5.0, seed: int = 0, copies: int = 1):
+        self.rooms = rooms * copies
+        self.base_rooms = rooms
+        self.copies = copies
+        self.dt_h = dt / 3600
+        self.band = band
+        self.rng = np.random.default_rng(seed)
+
+        def draw(lo, hi):
+            return np.tile(self.rng.uniform(lo, hi, rooms), copies)
+
+        self.setpoint = np.full(self.rooms, float(setpoint))
+        self.rh = draw(30, 70)
+        self.leak = draw(0.1, 0.8)             # 1/h towards outdoor humidity
+        self.source = draw(0.5, 3.0)           # occupants, %RH/h
+        self.capacity = draw(10, 40)           # device at full power, %RH/h
+        self.outdoor_mean = draw(35, 80)
+        self.outdoor_phase = draw(0, 2 * np.pi)
+        self.event_rate = draw(0.05, 0.3)      # spikes per hour
+        self.driver = (DRIVERS[controller] if isinstance(controller, str) else controller)(self.rooms)
+
+        self.steps = 0
+        self.abs_error = np.zeros(self.rooms)
+        self.band_error = np.zeros(self.rooms)  # distance outside the comfort band
+        self.in_band = np.zeros(self.rooms)
+        self.device_hours = np.zeros(self.rooms)
+
+    def step(self):
+        hours = self.steps * self.dt_h
+        outdoor = self.outdoor_mean + 15 * np.sin(2 * np.pi * hours / 24 + self.outdoor_phase)
+        effect = self.driver(self.rh, self.setpoint)
+        rh = self.rh + ((outdoor - self.rh) * self.leak + self.source + effect * self.capacity) * self.dt_h
+
+        # Showers / cooking: only a few rooms per step, so draw sizes for those alone
+        base = self.base_rooms
+        spiking = np.flatnonzero(self.rng.random(base) < self.event_rate[:base] * self.dt_h)
+        sizes = self.rng.uniform(5, 15, len(spiking))
+        if self.copies > 1:
+            spiking = (spiking + base * np.arange(self.copies)[:, None]).ravel()
+            sizes = np.tile(sizes, self.copies)
+        rh[spiking] += sizes
+        self.rh = np.clip(rh, 0, 100)
+
+        error = np.abs(self.rh - self.setpoint)
+        self.abs_error += error
+        self.band_error += np.maximum(error - self.band, 0)
+        self.in_band += error <= self.band
+        self.device_hours += np.abs(effect) * self.dt_h
+        self.steps += 1
+
+    def run(self, steps: int):
+        for _ in range(steps):
+            self.step()
+        return self
+
+    def summary(self) -> dict:
+        n = max(self.steps, 1)
+        return {
+            "rooms": self.rooms,
+            "hours": self.steps * self.dt_h,
+            "mean_abs_error": float(self.abs_error.mean() / n),
+            "mean_band_error": float(self.band_error.mean() / n),
+            "time_in_band": float(self.in_band.mean() / n),
+            "worst_room_in_band": float(self.in_band.min() / n),
+            "device_hours_per_day": float(self.device_hours.mean() / (self.steps * self.dt_h / 24)) if self.steps else 0.0,
+        }
+
+
+# ----------------------------------------------------------
+def main():
+    ap = argparse.ArgumentParser(description="Simulate many rooms under a fuzzy humidity controller")
+    ap.add_argument("--controller", choices=sorted(DRIVERS), default="ctrl")
+    ap.add_argument("--rooms", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--days", type=float, nargs="+", default=[1, 7])
+    ap.add_argument("--dt", type=float, default=60.0, help="seconds per step")
+    ap.add_argument("--setpoint", type=float, default=50.0)
+    args = ap.parse_args()
+
+    print(f"controller {args.controller}, {args.dt:g}s steps, setpoint {args.setpoint:g}%")
+    print(f"{'rooms':>7}{'days':>6}{'steps':>8}{'seconds':>9}{'steps/s':>10}{'room-steps/s':>14}"
+          f"{'|err|':>7}{'in band':>9}{'worst':>7}")
+    for rooms in args.rooms:
+        for days in args.days:
+            steps = int(days * 86400 / args.dt)
+            sim = RoomSim(rooms, args.controller, args.setpoint, args.dt)
+            start = time.perf_counter()
+            sim.run(steps)
+            elapsed = time.perf_counter() - start
+            s = sim.summary()
+            print(f"{rooms:>7}{days:>6g}{steps:>8}{elapsed:>9.2f}{steps / elapsed:>10.0f}"
+                  f"{rooms * steps / elapsed:>14.3g}{s['mean_abs_error']:>7.1f}"
+                  f"{s['time_in_band']:>9.0%}{s['worst_room_in_band']:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,10 @@ import shutil
 import requests
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog
+import io
 import pyzipper  # 📦 For password-protected ZIP
+from PIL import Image
+from gifsample import sample_gif_frames
 
 # 🔑 Replace with your DeepAI API key
 API_KEY = '19dbbe14-fa2c-4f89-be2e-1bf905cd1ae7'
@@ -15,20 +18,39 @@ SUSPICIOUS_KEYWORDS = ['nsfw', 'nude', 'xxx', 'adult', '18+', 'porn']
 def is_filename_suspicious(filename):
     return any(word in filename.lower() for word in SUSPICIOUS_KEYWORDS)
 
+# 🎞 Max frames sent to the API per animated GIF
+GIF_FRAME_BUDGET = 6
+
 # 🔍 Check image via DeepAI NSFW API
+def nsfw_score(image):
+    r = requests.post(
+        "https://api.deepai.org/api/nsfw-detector",
+        files={'image': image},
+        headers={'api-key': API_KEY}
+    )
+    result = r.json()
+    return result.get("output", {}).get("nsfw_score", 0)
+
 def is_image_nsfw(image_path):
     try:
-        r = requests.post(
-            "https://api.deepai.org/api/nsfw-detector",
-            files={'image': open(image_path, 'rb')},
-            headers={'api-key': API_KEY}
-        )
-        result = r.json()
-        score = result.get("output", {}).get("nsfw_score", 0)
-        return score > 0.6
+        if image_path.lower().endswith('.gif'):
+            return is_gif_nsfw(image_path)
+        with open(image_path, 'rb') as f:
+            return nsfw_score(f) > 0.6
     except:
         return False
 
+# 🎞 Animated GIFs: only the first frame gets classified when uploading the
+# file as-is, so send a sample of frames and stop at the first bad one
+def is_gif_nsfw(image_path):
+    for idx, frame in sample_gif_frames(image_path, GIF_FRAME_BUDGET):
+        buf = io.BytesIO()
+        Image.fromarray(frame[:, :, ::-1]).save(buf, format='PNG')
+        if nsfw_score(buf.getvalue()) > 0.6:
+            print(f"{os.path.basename(image_path)}: flagged at frame {idx}")
+            return True
+    return False
+
 # 🔒 Zip the quarantine folder with password
 def zip_quarantine_folder(folder_path, password):
     quarantine_path = os.path.join(folder_path, "quarantine")
@@ -0,0 +1,153 @@
+# render_backend.py
+# The drawing interface the climate GUIs (fuzzylogic.py, fuzzylogicc.py)
+# render through, with a Tk backend and an offscreen one, so frame cost
+# can be measured and frames checked on machines without a display.
+#
+# The interface is the part of the Tk canvas item API the GUIs use:
+#   create_rectangle / create_oval / create_line / create_polygon(*coords, **options) -> item
+#   coords(item, *coords)          move or reshape an item (no coords: return them)
+#   itemconfigure(item, **options) fill, outline, width, state ("normal" / "hidden")
+#   delete(item)                   an item, or "all"
+#   winfo_width(), winfo_height()
+#   present()                      end of frame
+# Drawing code written against it (canvas_pool.OvalPool included) runs
+# unchanged on either backend. Offscreen, the GUIs replace their other
+# widgets with OffscreenVar (sliders, tk variables) and OffscreenLabel.
+import tkinter as tk
+
+import numpy as np
+
+
+def _pil():
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        raise ImportError("Offscreen rendering needs Pillow: pip install pillow") from None
+    return Image, ImageDraw
+
+
+class TkRenderer(tk.Canvas):
+    """A tk.Canvas with present(), which flushes pending drawing to the screen."""
+
+    def present(self):
+        self.update_idletasks()
+
+
+class OffscreenRenderer:
+    """Retained canvas items rasterized into a PIL image by present().
+
+    Items keep Tk's creation-order stacking and its option defaults; the
+    image of the last present() is in .image, and as an (h, w, 3) uint8
+    array from to_array(). Pillow is only needed once present() is called.
+    """
+
+    DEFAULTS = {
+        "rectangle": {"fill": "", "outline": "black", "width": 1},
+        "oval":      {"fill": "", "outline": "black", "width": 1},
+        "polygon":   {"fill": "black", "outline": "", "width": 1},
+        "line":      {"fill": "black", "width": 1},
+    }
+
+    def __init__(self, width: int, height: int, bg: str = "white"):
+        self.width = width
+        self.height = height
+        self.bg = bg
+        self.image = None
+        self._items = {}  # item -> [kind, coords, options], in stacking order
+        self._next = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def _create(self, kind, coords, options):
+        self._next += 1
+        self._items[self._next] = [kind, [float(c) for c in coords], dict(self.DEFAULTS[kind], **options)]
+        return self._next
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    def create_polygon(self, *coords, **options):
+        return self._create("polygon", coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, options)
+
+    def coords(self, item, *coords):
+        if not coords:
+            return list(self._items[item][1])
+        self._items[item][1] = [float(c) for c in coords]
+
+    def itemconfigure(self, item, **options):
+        self._items[item][2].update(options)
+
+    itemconfig = itemconfigure
+
+    def delete(self, item):
+        if item == "all":
+            self._items.clear()
+        else:
+            self._items.pop(item, None)
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def present(self):
+        """Rasterize every visible item, bottom to top; returns the PIL image."""
+        Image, ImageDraw = _pil()
+        image = Image.new("RGB", (self.width, self.height), self.bg)
+        draw = ImageDraw.Draw(image)
+        for kind, coords, options in self._items.values():
+            if options.get("state") == "hidden":
+                continue
+            fill, width = options["fill"] or None, max(1, round(options["width"]))
+            if kind == "line":
+                if fill:
+                    draw.line(coords, fill=fill, width=width)
+                continue
+            outline = options.get("outline") or None
+            if kind == "polygon":
+                draw.polygon(coords, fill=fill, outline=outline, width=width)
+                continue
+            x0, y0, x1, y1 = coords
+            box = (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+            if kind == "oval":
+                draw.ellipse(box, fill=fill, outline=outline, width=width)
+            else:
+                draw.rectangle(box, fill=fill, outline=outline, width=width)
+        self.image = image
+        return image
+
+    def to_array(self) -> np.ndarray:
+        return np.asarray(self.image if self.image is not None else self.present())
+
+
+class OffscreenVar:
+    """Stands in for a ttk.Scale or tk variable offscreen: get() and set() a value."""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class OffscreenLabel:
+    """Stands in for a label or button offscreen; config() options are kept in .options."""
+
+    def __init__(self, **options):
+        self.options = options
+
+    def config(self, **options):
+        self.options.update(options)
+
+    configure = config
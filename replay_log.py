@@ -0,0 +1,219 @@
+# replay_log.py
+# Offline replay of archived humidity logs through the fuzzy controllers.
+#
+# Input, picked by extension:
+#   .csv / .txt   comma-separated, optional header row; --column is a name
+#                 or 0-based index (default: the last column). The first
+#                 row is a header if the column's field in it is not a
+#                 number; --header / --no-header override that
+#   .npy          1-D array, or 2-D with --column as the column index
+#   anything else raw little-endian values of --dtype (default float64)
+# Output is the controller's power (or action, for ctrl) per reading, as
+# .csv, .npy or raw float64 by the same rule.
+#
+# The log is read and written in chunks of --chunk rows, so memory stays
+# flat however large the file is. Plain reads are used rather than mmap:
+# mapped pages count towards the process RSS as they are touched.
+#
+#   python replay_log.py readings.csv powers.npy --controller humidifier
+#   python replay_log.py readings.npy actions.csv --controller ctrl --setpoint 45
+import argparse
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+from fuzzylogic import FuzzyHumidityCtrl
+from fuzzylogicc import FuzzyHumidifier
+from fuzzy_engine import compile_spec, DEHUMIDIFIER
+
+
+# ----------------------------------------------------------
+#  CONTROLLERS
+# ----------------------------------------------------------
+# Each takes an iterable of humidity chunks and yields one output array per chunk.
+def replay_ctrl(chunks, setpoint):
+    """FuzzyHumidityCtrl: action in [-100, 100], positive when the room is too wet."""
+    ctrl = FuzzyHumidityCtrl()
+    for rh in chunks:
+        yield ctrl.compute_batch(rh, setpoint)
+
+
+def replay_dehumidifier(chunks, setpoint):
+    """FuzzyDehumidifier, as the DEHUMIDIFIER spec. Ignores the setpoint."""
+    system = compile_spec(DEHUMIDIFIER)
+    for rh in chunks:
+        yield system.evaluate(rh=rh)
+
+
+def replay_humidifier(chunks, setpoint):
+    """FuzzyHumidifier, trend smoothing carried across chunks. Ignores the setpoint."""
+    yield from FuzzyHumidifier().replay_chunks(chunks)
+
+
+CONTROLLERS = {
+    "ctrl": ("action", replay_ctrl),
+    "dehumidifier": ("power", replay_dehumidifier),
+    "humidifier": ("power", replay_humidifier),
+}
+
+
+# ----------------------------------------------------------
+#  READERS
+# ----------------------------------------------------------
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def read_csv(path, chunk, column=None, header=None):
+    """Yield float arrays of up to `chunk` rows from one column of a CSV file.
+
+    `header` None decides from the selected column alone, so a header-less
+    log with a timestamp column keeps its first reading.
+    """
+    with open(path, newline="") as f:
+        first = f.readline()
+        fields = [x.strip() for x in first.split(",")]
+        if column is None:
+            col = len(fields) - 1
+        elif str(column).isdigit():
+            col = int(column)
+        elif header is not False and column in fields:
+            col, header = fields.index(column), True
+        else:
+            raise SystemExit(f"{path}: no column {column!r} (columns: {', '.join(fields)})")
+        if col >= len(fields):
+            raise SystemExit(f"{path}: column {col} out of range ({len(fields)} columns)")
+        if header is None:
+            header = not _is_number(fields[col])
+
+        pending = [] if header else [first]
+        while True:
+            lines = pending + list(islice(f, chunk - len(pending)))
+            pending = []
+            if not lines:
+                return
+            yield np.loadtxt(lines, delimiter=",", usecols=col, ndmin=1, dtype=float)
+
+
+def read_npy(path, chunk, column=None):
+    """Yield float arrays of up to `chunk` rows from a .npy file, without loading it whole."""
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                       else np.lib.format.read_array_header_2_0)
+        shape, fortran, dtype = read_header(f)
+        if fortran or len(shape) not in (1, 2) or dtype.hasobject:
+            raise SystemExit(f"{path}: need a 1-D or C-ordered 2-D numeric array, got shape {shape}")
+        width = 1 if len(shape) == 1 else shape[1]
+        if column is None:
+            col = width - 1
+        elif str(column).isdigit():
+            col = int(column)
+        else:
+            raise SystemExit(f"{path}: no column {column!r} (a .npy column is a 0-based index)")
+        if col >= width:
+            raise SystemExit(f"{path}: column {col} out of range ({width} columns)")
+        for start in range(0, shape[0], chunk):
+            block = np.fromfile(f, dtype=dtype, count=min(chunk, shape[0] - start) * width)
+            yield (block if width == 1 else block.reshape(-1, width)[:, col]).astype(float)
+
+
+def read_raw(path, chunk, dtype="float64"):
+    """Yield float arrays of up to `chunk` values from a headerless binary file."""
+    with open(path, "rb") as f:
+        while True:
+            block = np.fromfile(f, dtype=np.dtype(dtype).newbyteorder("<"), count=chunk)
+            if not block.size:
+                return
+            yield block.astype(float)
+
+
+def read_log(path, chunk, column=None, dtype="float64", header=None):
+    suffix = Path(path).suffix.lower()
+    if suffix in (".csv", ".txt"):
+        return read_csv(path, chunk, column, header)
+    if suffix == ".npy":
+        return read_npy(path, chunk, column)
+    return read_raw(path, chunk, dtype)
+
+
+# ----------------------------------------------------------
+#  WRITERS
+# ----------------------------------------------------------
+def _npy_header(rows):
+    """A version 1.0 header for `rows` float64 values, always 128 bytes.
+
+    The fixed size lets it be written first and rewritten in place once
+    the number of rows is known.
+    """
+    text = repr({"descr": "<f8", "fortran_order": False, "shape": (rows,)})
+    return b"\x93NUMPY\x01\x00" + (118).to_bytes(2, "little") + text.ljust(117).encode() + b"\n"
+
+
+def write_log(path, outputs, name):
+    """Write the output chunks to `path`; returns the number of rows written."""
+    suffix = Path(path).suffix.lower()
+    rows = 0
+    with open(path, "wb") as f:
+        if suffix in (".csv", ".txt"):
+            f.write(f"{name}\n".encode())
+        elif suffix == ".npy":
+            f.write(_npy_header(0))
+        for out in outputs:
+            if suffix in (".csv", ".txt"):
+                f.write("".join(map("%.6f\n".__mod__, out.tolist())).encode())
+            else:
+                out.astype("<f8").tofile(f)
+            rows += len(out)
+        if suffix == ".npy":
+            f.seek(0)
+            f.write(_npy_header(rows))
+    return rows
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, or None where it can't be read."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+# ----------------------------------------------------------
+def main():
+    ap = argparse.ArgumentParser(description="Replay a humidity log through a fuzzy controller")
+    ap.add_argument("input", help=".csv, .npy or raw binary humidity log")
+    ap.add_argument("output", help=".csv, .npy or raw float64 output")
+    ap.add_argument("--controller", choices=sorted(CONTROLLERS), default="humidifier")
+    ap.add_argument("--column", help="CSV column name or index, or .npy column index (default: last)")
+    ap.add_argument("--header", action=argparse.BooleanOptionalAction, default=None,
+                    help="whether a CSV input starts with a header row (default: guess from --column)")
+    ap.add_argument("--dtype", default="float64", help="value type of a raw binary input")
+    ap.add_argument("--setpoint", type=float, default=50.0, help="for --controller ctrl")
+    ap.add_argument("--chunk", type=int, default=262144, help="rows per chunk")
+    args = ap.parse_args()
+
+    name, replay = CONTROLLERS[args.controller]
+    start = time.perf_counter()
+    chunks = read_log(args.input, args.chunk, args.column, args.dtype, args.header)
+    rows = write_log(args.output, replay(chunks, args.setpoint), name)
+    elapsed = time.perf_counter() - start
+
+    size_mb = Path(args.input).stat().st_size / 2**20
+    peak = peak_rss_mb()
+    print(f"{args.controller}: {rows} rows from {args.input} ({size_mb:.1f} MB) -> {args.output}")
+    print(f"{elapsed:.2f} s, {rows / max(elapsed, 1e-9):,.0f} rows/s, {size_mb / max(elapsed, 1e-9):.1f} MB/s"
+          + (f", peak RSS {peak:.0f} MB" if peak is not None else ""))
+
+
+if __name__ == "__main__":
+    main()
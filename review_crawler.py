@@ -0,0 +1,204 @@
+# review_crawler.py
+# Crawl the review pages of many products at once and score them with
+# the cselec2 pipeline.
+#
+#   python review_crawler.py urls.txt [--per-host 2] [--workers 8] [--max-pages 10]
+import argparse
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import cselec2
+from cselec2 import HEADERS, fetch_review_page, score_reviews, build_record, ScoreCache
+from http_cache import ResponseCache, DEFAULT_CACHE_DIR
+from review_results import ResultsSink, summarize
+from review_state import ReviewStateStore
+
+
+def read_url_file(path):
+    """One product URL per line; blank lines and # comments are skipped."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+class ReviewCrawler:
+    """Fetch review pages concurrently, following "Next page" links.
+
+    Every worker thread keeps its own requests.Session, so connections are
+    reused across pages, and each host gets at most `per_host` requests in
+    flight no matter how many workers are running. Pass a ResponseCache to
+    revalidate or skip pages fetched by earlier runs.
+
+    stop_on_seen_page: stop following a product's pages once `keep` drops
+    every review of one. Only safe when the reviews are sorted newest
+    first; with the default "top reviews" order, or after an interrupted
+    crawl, unseen reviews can come after a page of known ones.
+    """
+
+    def __init__(self, workers=8, per_host=2, max_pages=10, headers=HEADERS,
+                 attempts=3, retry_delay=3.0, fetch=fetch_review_page, cache=None,
+                 stop_on_seen_page=False):
+        self.workers = workers
+        self.per_host = per_host
+        self.max_pages = max_pages
+        self.stop_on_seen_page = stop_on_seen_page
+        self.headers = headers
+        self.attempts = attempts
+        self.retry_delay = retry_delay
+        self.fetch = fetch
+        self.cache = cache
+        self._local = threading.local()
+        self._host_slots = defaultdict(lambda: threading.BoundedSemaphore(self.per_host))
+        self._slots_lock = threading.Lock()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _slot(self, url):
+        with self._slots_lock:
+            return self._host_slots[urlparse(url).netloc]
+
+    def _fetch_page(self, url):
+        for attempt in range(self.attempts):
+            with self._slot(url):
+                page = self.fetch(url, self.headers, session=self._session(), cache=self.cache)
+            if page is not None:
+                return page
+            if attempt < self.attempts - 1 and not (self.cache and self.cache.offline):
+                time.sleep(self.retry_delay)  # only this worker waits
+        return None
+
+    def crawl(self, product_urls, keep=None):
+        """Yield (product_url, page_url, records) as pages finish downloading.
+
+        Pages of different products are fetched in parallel; the next page
+        of a product is queued as soon as its previous page is parsed.
+        `keep(product_url, records)` can filter the records of each page
+        (see stop_on_seen_page).
+        """
+        product_urls = list(dict.fromkeys(product_urls))
+        seen = set(product_urls)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = {pool.submit(self._fetch_page, url): (url, url, 1) for url in product_urls}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    product, page_url, page_no = running.pop(fut)
+                    page = fut.result()
+                    if page is None:
+                        print(f"Giving up on {page_url}")
+                        continue
+
+                    records, next_page = page
+                    if keep is not None:
+                        kept = keep(product, records)
+                        if self.stop_on_seen_page and records and not kept:
+                            next_page = None
+                        records = kept
+                    if next_page and page_no < self.max_pages and next_page not in seen:
+                        seen.add(next_page)
+                        running[pool.submit(self._fetch_page, next_page)] = (product, next_page, page_no + 1)
+                    yield product, page_url, records
+
+
+def crawl_and_score(product_urls, crawler=None, score_workers=1, sink=None, state=None,
+                    score_cache=None):
+    """Crawl every product and score its reviews page by page.
+
+    Every scored review is written to `sink` (a review_results.ResultsSink)
+    if given. With a review_state.ReviewStateStore only reviews not seen
+    in earlier runs (or earlier pages) are scored, and the state is saved
+    at the end. `score_cache` replaces the shared cselec2.score_cache.
+    Returns {product_url: {"pages", "reviews", "mismatches"}}.
+    """
+    crawler = crawler or ReviewCrawler()
+    summary = defaultdict(lambda: {"pages": 0, "reviews": 0, "mismatches": 0})
+    keep = state.filter_new if state is not None else None
+    if score_cache is None:
+        score_cache = cselec2.score_cache
+
+    for product, page_url, records in crawler.crawl(product_urls, keep):
+        sentiments = score_reviews([text for text, _ in records], score_workers, cache=score_cache)
+        stats = summary[product]
+        stats["pages"] += 1
+        for (text, star), sentiment in zip(records, sentiments):
+            record = build_record(product, text, star, sentiment)
+            if sink is not None:
+                sink.write(record)
+            if record["match"] is None:
+                continue
+            stats["reviews"] += 1
+            stats["mismatches"] += not record["match"]
+        print(f"{page_url}: {len(records)} {'new ' if state is not None else ''}reviews")
+
+    if state is not None:
+        state.save()
+    return dict(summary)
+
+
+def crawl_main(argv=None):
+    ap = argparse.ArgumentParser(description="Crawl and score reviews for a file of product URLs")
+    ap.add_argument("url_file")
+    ap.add_argument("--workers", type=int, default=8, help="pages fetched in parallel")
+    ap.add_argument("--per-host", type=int, default=2, help="max concurrent requests per host")
+    ap.add_argument("--max-pages", type=int, default=10, help="review pages followed per product")
+    ap.add_argument("--cache", default=str(DEFAULT_CACHE_DIR), help="page cache directory")
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--max-age", type=float, default=None,
+                    help="serve cached pages younger than this many seconds without revalidating")
+    ap.add_argument("--offline", action="store_true", help="only use cached pages")
+    ap.add_argument("--out", help="write every scored review to this .jsonl, .csv or .parquet file")
+    ap.add_argument("--state", help="directory remembering reviews already scored; only new ones get scored")
+    ap.add_argument("--stop-on-seen-page", action="store_true",
+                    help="with --state, stop at the first page with no new reviews (newest-first listings only)")
+    ap.add_argument("--score-cache", help="file to load/save the sentiment score cache")
+    args = ap.parse_args(argv)
+
+    cache = None if args.no_cache else ResponseCache(args.cache, args.max_age, args.offline)
+    crawler = ReviewCrawler(args.workers, args.per_host, args.max_pages, cache=cache,
+                            stop_on_seen_page=args.stop_on_seen_page)
+    sink = ResultsSink(args.out) if args.out else None
+    scores = ScoreCache(path=args.score_cache) if args.score_cache else cselec2.score_cache
+    start = time.perf_counter()
+    try:
+        state = ReviewStateStore(args.state) if args.state else None
+        summary = crawl_and_score(read_url_file(args.url_file), crawler, sink=sink, state=state,
+                                  score_cache=scores)
+    finally:
+        if sink is not None:
+            sink.close()
+        scores.save()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'product':<60}{'pages':>6}{'reviews':>9}{'mismatch':>10}")
+    for product, stats in summary.items():
+        rate = stats["mismatches"] / stats["reviews"] if stats["reviews"] else 0.0
+        print(f"{product[:59]:<60}{stats['pages']:>6}{stats['reviews']:>9}{rate:>9.0%}")
+    if sink is not None:
+        worst = summarize(args.out)[:5]
+        print(f"\n{sink.written} records written to {args.out}; highest mismatch rates:")
+        for product, reviews, mismatches, rate in worst:
+            print(f"  {rate:>5.0%}  {mismatches}/{reviews}  {product}")
+    pages = sum(s["pages"] for s in summary.values())
+    print(f"\n{pages} pages in {elapsed:.1f}s ({pages / elapsed:.1f} pages/s)")
+    if cache is not None:
+        print(cache.report())
+    stats = scores.stats()
+    print(f"score cache: {stats['entries']} entries, {stats['hit_rate']:.0%} hits "
+          f"({stats['hits']} of {stats['hits'] + stats['misses']})")
+
+
+if __name__ == "__main__":
+    crawl_main()
@@ -0,0 +1,167 @@
+# review_results.py
+# Write review analysis records to JSONL, CSV or Parquet as they are
+# produced, and summarise the mismatch rate per product afterwards.
+import csv
+import json
+from pathlib import Path
+
+import numpy as np
+
+FIELDS = ["url", "review_id", "text", "star", "compound", "label", "match"]
+FORMATS = {".jsonl": "jsonl", ".json": "jsonl", ".csv": "csv", ".parquet": "parquet"}
+
+
+def _format_for(path, fmt):
+    fmt = fmt or FORMATS.get(Path(path).suffix.lower())
+    if fmt not in ("jsonl", "csv", "parquet"):
+        raise ValueError(f"Unknown results format for {path}; use .jsonl, .csv or .parquet")
+    return fmt
+
+
+def _parquet():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+class ResultsSink:
+    """Append review records to a file, at most `buffer_size` held in memory.
+
+    Records are dicts with the keys in FIELDS. Each flush writes one block
+    (a row group for Parquet), so memory stays bounded however long the
+    crawl runs. Use as a context manager or call close().
+    """
+
+    def __init__(self, path, fmt=None, buffer_size=1000):
+        self.path = Path(path)
+        self.fmt = _format_for(path, fmt)
+        self.buffer_size = buffer_size
+        self.written = 0
+        self._buffer = []
+        self._writer = None
+
+        if self.fmt == "parquet":
+            pa = _parquet()
+            self._schema = pa.schema([("url", pa.string()), ("review_id", pa.string()),
+                                      ("text", pa.string()), ("star", pa.float64()),
+                                      ("compound", pa.float64()), ("label", pa.string()),
+                                      ("match", pa.bool_())])
+            self._writer = pa.parquet.ParquetWriter(self.path, self._schema)
+        else:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            if self.fmt == "csv":
+                self._writer = csv.DictWriter(self._file, fieldnames=FIELDS)
+                self._writer.writeheader()
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        if self.fmt == "parquet":
+            pa = _parquet()
+            columns = {name: [r[name] for r in self._buffer] for name in FIELDS}
+            self._writer.write_table(pa.table(columns, schema=self._schema))
+        elif self.fmt == "csv":
+            self._writer.writerows(self._buffer)
+            self._file.flush()
+        else:
+            self._file.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self._buffer))
+            self._file.flush()
+        self.written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+        if self.fmt == "parquet":
+            self._writer.close()
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ----------------------------------------------------------
+#  SUMMARY
+# ----------------------------------------------------------
+def _read_columns(path, fmt):
+    """Return the url and match columns of a results file as numpy arrays.
+
+    With pyarrow every format is read column-wise, parsing only url and
+    match; without it CSV and JSONL are read row by row.
+    """
+    try:
+        pa = _parquet()
+    except ImportError:
+        if fmt == "parquet":
+            raise
+        return _read_rows(path, fmt)
+
+    if fmt == "parquet":
+        table = pa.parquet.read_table(path, columns=["url", "match"])
+    elif fmt == "csv":
+        import pyarrow.csv
+        table = pa.csv.read_csv(path, convert_options=pa.csv.ConvertOptions(
+            include_columns=["url", "match"], column_types={"url": pa.string(), "match": pa.bool_()}))
+    elif Path(path).stat().st_size == 0:  # pyarrow.json rejects an empty file
+        return np.array([], dtype=object), np.array([], dtype=bool)
+    else:
+        import pyarrow.json
+        schema = pa.schema([("url", pa.string()), ("match", pa.bool_())])
+        table = pa.json.read_json(path, parse_options=pa.json.ParseOptions(
+            explicit_schema=schema, unexpected_field_behavior="ignore"))
+    match = table.column("match")
+    valid = match.is_valid().to_numpy(zero_copy_only=False)
+    urls = table.column("url").to_numpy(zero_copy_only=False)
+    return urls[valid], match.fill_null(False).to_numpy(zero_copy_only=False)[valid]
+
+
+def _read_rows(path, fmt):
+    if fmt == "csv":
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = [(r["url"], r["match"]) for r in csv.DictReader(f)]
+        urls = np.asarray([u for u, _ in rows], dtype=object)
+        match = [None if m == "" else m == "True" for _, m in rows]
+    else:
+        urls, match = [], []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                r = json.loads(line)
+                urls.append(r["url"])
+                match.append(r["match"])
+        urls = np.asarray(urls, dtype=object)
+
+    valid = np.array([m is not None for m in match], dtype=bool)
+    match = np.array([bool(m) for m in match], dtype=bool)
+    return urls[valid], match[valid]
+
+
+def summarize(path, fmt=None):
+    """Mismatch rate per product URL, worst first.
+
+    Returns a list of (url, reviews, mismatches, rate). Reviews with an
+    unreadable star rating are left out.
+    """
+    urls, match = _read_columns(path, _format_for(path, fmt))
+    if not len(urls):
+        return []
+    products, inverse = np.unique(urls.astype(str), return_inverse=True)
+    reviews = np.bincount(inverse)
+    mismatches = np.bincount(inverse, weights=~match).astype(int)
+    rates = mismatches / reviews
+    order = np.argsort(-rates, kind="stable")
+    return [(str(products[i]), int(reviews[i]), int(mismatches[i]), float(rates[i])) for i in order]
@@ -0,0 +1,108 @@
+# review_state.py
+# Remember which reviews were already scored, per product, across runs.
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from cselec2 import review_hash
+
+DEFAULT_STATE_DIR = Path(os.environ.get("CSELEC2_CACHE", Path.home() / ".cache" / "cselec2")) / "state"
+ASIN_RE = re.compile(r"/(?:dp|gp/product|product-reviews)/([A-Z0-9]{10})(?![A-Z0-9])")
+
+
+def product_key(url):
+    """Amazon ASIN when the URL has one, otherwise a hash of the URL."""
+    match = ASIN_RE.search(url)
+    if match:
+        return match.group(1)
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+class ReviewStateStore:
+    """Per-product set of review content hashes, stored on disk.
+
+    Each product is one .npy file with a sorted uint64 array (8 bytes per
+    review, so a million reviews is 8 MB), memory-mapped on load and
+    checked with a binary search. New hashes are kept in memory until
+    save() merges them in.
+    """
+
+    def __init__(self, directory=DEFAULT_STATE_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._known = {}     # product key -> sorted uint64 array from disk
+        self._pending = {}   # product key -> set of hashes added this run
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.directory / f"{key}.npy"
+
+    def _load(self, key):
+        if key not in self._known:
+            try:
+                self._known[key] = np.load(self._path(key), mmap_mode="r")
+            except FileNotFoundError:
+                self._known[key] = np.empty(0, dtype=np.uint64)
+        return self._known[key]
+
+    def seen(self, product, hashes):
+        """Boolean mask: which of `hashes` were recorded before for this product."""
+        key = product_key(product)
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        with self._lock:
+            known = self._load(key)
+            pending = self._pending.get(key, ())
+            mask = np.zeros(len(hashes), dtype=bool)
+            if len(known):
+                idx = np.searchsorted(known, hashes)
+                idx[idx == len(known)] = 0
+                mask = known[idx] == hashes
+            if pending:
+                mask |= np.fromiter((int(h) in pending for h in hashes), bool, len(hashes))
+        return mask
+
+    def add(self, product, hashes):
+        key = product_key(product)
+        with self._lock:
+            self._pending.setdefault(key, set()).update(int(h) for h in hashes)
+
+    def filter_new(self, product, records):
+        """Drop (text, star) records already seen for this product and remember the rest.
+
+        Duplicates within `records` itself are dropped too.
+        """
+        hashes = [review_hash(text) for text, _ in records]
+        seen = self.seen(product, hashes)
+        new, new_hashes = [], set()
+        for record, h, old in zip(records, hashes, seen):
+            if not old and h not in new_hashes:
+                new.append(record)
+                new_hashes.add(h)
+        self.add(product, new_hashes)
+        return new
+
+    def count(self, product):
+        key = product_key(product)
+        with self._lock:
+            return len(self._load(key)) + len(self._pending.get(key, ()))
+
+    def save(self):
+        """Merge the hashes added this run into the on-disk files."""
+        with self._lock:
+            for key, pending in self._pending.items():
+                if not pending:
+                    continue
+                merged = np.concatenate([self._load(key), np.fromiter(pending, np.uint64, len(pending))])
+                merged.sort()
+                merged = merged[np.concatenate([[True], merged[1:] != merged[:-1]])]
+                path = self._path(key)
+                tmp = path.with_name(f"{key}.tmp.npy")
+                np.save(tmp, merged)
+                self._known[key] = None   # drop the memory map before replacing the file
+                os.replace(tmp, path)
+                self._known[key] = np.load(path, mmap_mode="r")
+            self._pending = {}
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "benchmarks")]
+
+
+@pytest.fixture
+def fixture_server():
+    """The saved review pages served locally (benchmarks/fixture_server.py), 3 pages per product."""
+    from fixture_server import start_fixture_server
+    server = start_fixture_server(pages_per_product=3, latency=0.02)
+    yield server
+    server.shutdown()
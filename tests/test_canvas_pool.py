@@ -0,0 +1,22 @@
+from canvas_pool import CallCounter, OvalPool
+from render_backend import OffscreenRenderer
+
+
+def test_oval_pool_only_sends_changes():
+    renderer = OffscreenRenderer(100, 100)
+    canvas = CallCounter(renderer)
+    pool = OvalPool(canvas, size=4, min_size=4)
+    canvas.frame()
+
+    boxes = [(0, 0, 5, 5), (10, 10, 15, 15)]
+    pool.draw(boxes, ["red", "blue"])
+    assert canvas.frame() == {"coords": 2, "itemconfigure": 4}
+    pool.draw(boxes, ["red", "blue"])
+    assert canvas.frame() == {"coords": 2}
+
+    pool.draw(boxes * 3, ["red"] * 6)   # grows past its 4 ovals
+    assert len(pool) == 8
+    assert (renderer.to_array() != 255).any()
+    pool.draw([], [])
+    renderer.present()
+    assert (renderer.to_array() == 255).all()   # every oval hidden again
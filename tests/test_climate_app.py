@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+
+import fuzzylogicc
+from fuzzylogicc import CONTROL_PERIOD, FuzzyHumidifier, SmartClimateApp
+from render_backend import OffscreenRenderer
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(fuzzylogicc, "time", SimpleNamespace(perf_counter=lambda: now[0]))
+    return now
+
+
+def humidifier_app(rh):
+    app = SmartClimateApp(renderer=OffscreenRenderer(560, 330))
+    app.mode.set("humidifier")
+    app.slider.set(rh)
+    app.update_display()
+    return app
+
+
+def test_repaints_do_not_advance_the_humidifier(clock):
+    app = humidifier_app(30.0)
+    last_rh, power = app.humid_ctrl.last_rh, app.power
+    for _ in range(50):
+        app.update_display()   # e.g. <Configure> on every resize step
+        app.animate()
+    assert app.humid_ctrl.last_rh == last_rh and app.power == power
+
+
+def test_humidifier_readings_follow_the_control_clock(clock):
+    app = humidifier_app(30.0)
+    reference = FuzzyHumidifier()
+    reference.compute(30.0)
+
+    for _ in range(10):
+        clock[0] += CONTROL_PERIOD / 4
+        app.animate()
+    # 2.5 periods passed: two more readings, however many frames were drawn
+    expected = [reference.compute(30.0) for _ in range(2)][-1]
+    assert app.humid_ctrl.last_rh == reference.last_rh and app.power == expected
+
+    clock[0] += 60.0           # a stalled window replays at most a second of readings
+    app.animate()
+    for _ in range(20):
+        reference.compute(30.0)
+    assert app.humid_ctrl.last_rh == reference.last_rh
+
+
+def test_slider_moves_are_readings(clock):
+    app = humidifier_app(30.0)
+    app.slider.set(60.0)
+    app.update_display()
+    reference = FuzzyHumidifier()
+    reference.compute(30.0)
+    assert app.power == reference.compute(60.0)
+    assert app.humid_ctrl.last_rh == reference.last_rh
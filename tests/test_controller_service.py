@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from controller_service import BatchController, connection_handler
+from fuzzylogicc import FuzzyHumidifier, smooth_rh
+
+
+async def exchange(batcher, payload: bytes) -> bytes:
+    """Send `payload`, shut down the sending side, and read every answer."""
+    server = await asyncio.start_server(connection_handler(batcher), "127.0.0.1", 0)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(payload)
+        writer.write_eof()
+        reply = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    return reply
+
+
+@pytest.mark.parametrize("window", [0.0, 0.05])
+def test_half_closed_client_gets_its_answers(window):
+    batcher = BatchController(window=window)
+    reply = asyncio.run(exchange(batcher, b"dev humidifier 40\ndev humidifier 42\n"))
+
+    ctrl = FuzzyHumidifier()
+    assert reply.decode() == f"dev {float(ctrl.compute(40.0))!r}\ndev {float(ctrl.compute(42.0))!r}\n"
+
+
+def test_non_finite_readings_are_rejected():
+    batcher = BatchController(window=0.0)
+    reply = asyncio.run(exchange(batcher, b"dev humidifier nan\ndev ctrl inf\ndev humidifier 40\n"))
+
+    lines = reply.decode().splitlines()
+    assert lines[:2] == ["dev error rh and setpoint must be finite"] * 2
+    assert lines[2] == f"dev {float(FuzzyHumidifier().compute(40.0))!r}"
+    assert batcher.devices.last_rh[batcher.devices.slot("dev")] == smooth_rh(FuzzyHumidifier().last_rh, 40.0)
@@ -0,0 +1,51 @@
+import time
+
+from frame_scheduler import FrameScheduler
+
+
+class Widget:
+    """Collects the after() callbacks so the test runs the frames itself."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append((ms, callback))
+        return len(self.pending)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def run(self, frames):
+        for _ in range(frames):
+            _, callback = self.pending.pop(0)
+            callback()
+
+
+def test_load_level_rises_on_slow_frames_and_falls_when_fast():
+    widget, levels = Widget(), []
+    slow = [True]
+
+    def tick():
+        if slow[0]:
+            time.sleep(0.003)
+
+    scheduler = FrameScheduler(widget, tick, fps=1000, on_load=levels.append,
+                               raise_after=3, lower_after=4, max_level=2)
+    scheduler.start()
+    widget.run(10)
+    assert levels == [1, 2] and scheduler.level == 2
+
+    slow[0] = False
+    scheduler.period = 1.0   # every frame is now far within budget
+    widget.run(10)
+    assert levels == [1, 2, 1, 0]
+    assert scheduler.frames == 20
+
+
+def test_overrun_leaves_min_gap_instead_of_catching_up():
+    widget = Widget()
+    scheduler = FrameScheduler(widget, lambda: time.sleep(0.02), fps=100, min_gap=0.004)
+    scheduler.start()
+    widget.run(3)
+    assert all(ms >= 4 for ms, _ in widget.pending)
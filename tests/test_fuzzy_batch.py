@@ -0,0 +1,21 @@
+import numpy as np
+
+from fuzzylogic import FuzzyHumidityCtrl
+
+
+def test_compute_batch_matches_compute_exactly():
+    ctrl = FuzzyHumidityCtrl(setpoint=47.5)
+    rh = np.concatenate([np.linspace(-10, 110, 2401), [32.5, 47.5, 62.5]])
+    expected = [ctrl.compute(x) for x in rh.tolist()]
+    assert ctrl.compute_batch(rh).tolist() == expected
+
+
+def test_setpoint_broadcasts():
+    ctrl = FuzzyHumidityCtrl()
+    rh = np.linspace(20, 80, 7)
+    setpoints = np.array([[40.0], [50.0], [60.0]])
+    got = ctrl.compute_batch(rh, setpoints)
+    assert got.shape == (3, 7)
+    for row, sp in zip(got, setpoints[:, 0]):
+        ctrl.setpoint = sp
+        assert row.tolist() == [ctrl.compute(x) for x in rh.tolist()]
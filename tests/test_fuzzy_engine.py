@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from fuzzy_engine import compile_spec, DEHUMIDIFIER, DEHUMIDIFIER_MAMDANI, HUMIDIFIER, HUMIDITY_CTRL
+from fuzzylogic import FuzzyHumidityCtrl
+from fuzzylogicc import FuzzyDehumidifier, FuzzyHumidifier
+
+RH = np.concatenate([np.linspace(-5, 105, 4401), np.arange(0, 101, 5.0)])
+
+
+def test_humidity_ctrl_spec():
+    ctrl = FuzzyHumidityCtrl(setpoint=50.0)
+    got = compile_spec(HUMIDITY_CTRL).evaluate(error=RH - ctrl.setpoint)
+    np.testing.assert_allclose(got, [ctrl.compute(x) for x in RH.tolist()], rtol=0, atol=1e-12)
+
+
+def test_dehumidifier_spec():
+    got = compile_spec(DEHUMIDIFIER).evaluate(rh=RH)
+    np.testing.assert_allclose(got, [FuzzyDehumidifier().compute(x) for x in RH.tolist()], rtol=0, atol=1e-12)
+
+
+def test_humidifier_spec():
+    got = compile_spec(HUMIDIFIER).evaluate(rh=RH)
+    np.testing.assert_allclose(got, [FuzzyHumidifier().base_power(x) for x in RH.tolist()], rtol=0, atol=1e-12)
+
+
+def test_mamdani_output_follows_the_rules():
+    system = compile_spec(DEHUMIDIFIER_MAMDANI)
+    low, comfort, high = system.evaluate(rh=[20.0, 55.0, 90.0])
+    assert low < 0.2 and comfort == pytest.approx(0.5) and high > 0.8
+    assert system(rh=55.0) == pytest.approx(0.5)
+
+
+def test_shapes_broadcast():
+    system = compile_spec(HUMIDITY_CTRL)
+    assert system.evaluate(error=np.zeros((2, 3))).shape == (2, 3)
+
+
+@pytest.mark.parametrize("change, message", [
+    (lambda s: s["rules"].append(({"error": "soaked"}, 1)), "undefined set"),
+    (lambda s: s["rules"].append(({}, 1)), "without antecedent"),
+    (lambda s: s.update(method="tsukamoto"), "Unknown inference method"),
+])
+def test_invalid_specs(change, message):
+    spec = dict(HUMIDITY_CTRL, rules=list(HUMIDITY_CTRL["rules"]))
+    change(spec)
+    with pytest.raises(ValueError, match=message):
+        compile_spec(spec)
+
+
+def test_missing_input():
+    with pytest.raises(ValueError, match="Missing input"):
+        compile_spec(DEHUMIDIFIER).evaluate(humidity=50.0)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from fuzzy_lut import CompiledDehumidifier, CompiledHumidifier, CompiledHumidityCtrl, LookupTable
+
+
+def test_out_of_range_fallback_returns_a_float():
+    table = LookupTable(np.square, 0, 1, 0.1, clamp=False, vectorized=True)
+    value = table(3.0)
+    assert type(value) is float and value == 9.0
+
+
+def test_sampled_error_matches_a_denser_check():
+    table = LookupTable(np.sin, 0, 3, 0.05, vectorized=True)
+    xs = np.linspace(0, 3, 10_001)
+    assert table.sampled_error <= np.abs(table.lookup(xs) - np.sin(xs)).max() * (1 + 1e-9)
+    assert table.sampled_error < 0.05 ** 2 / 8 * 1.01   # h^2/8 * max|f''| for linear interpolation
+
+
+def test_compiled_ctrl_matches_exact():
+    compiled = CompiledHumidityCtrl()
+    for rh in (12.5, 47.3, 50.0, 88.8):
+        assert abs(compiled.compute(rh) - compiled.ctrl.compute(rh)) < 1e-6
+
+
+def test_max_error_of_a_ratio_of_linear_functions_is_exact():
+    table = LookupTable(lambda x: 1 / x, 1, 3, 0.5, vectorized=True, breakpoints=[])
+    # On [1, 1.5] the chord minus 1/x peaks at x = sqrt(1.5)
+    x = np.sqrt(1.5)
+    assert table.max_error == pytest.approx(1 + (1 / 1.5 - 1) * (x - 1) / 0.5 - 1 / x, rel=1e-9)
+
+
+@pytest.mark.parametrize("compiled", [CompiledHumidityCtrl, CompiledDehumidifier, CompiledHumidifier])
+@pytest.mark.parametrize("resolution", [1.0, 0.25])
+def test_controller_tables_stay_within_their_bound(compiled, resolution):
+    table = compiled(resolution=resolution).table
+    xs = np.linspace(table.lo, table.hi, 200_001)
+    assert table.max_error is not None
+    assert np.abs(table.lookup(xs) - table._exact(xs)).max() <= table.max_error * (1 + 1e-6) + 1e-12
+
+
+def test_breakpoints_must_fall_on_samples():
+    with pytest.raises(ValueError, match="falls between samples"):
+        CompiledDehumidifier(resolution=0.3)
+
+
+def test_undeclared_kink_has_no_bound():
+    table = LookupTable(lambda x: np.abs(x - 0.2), 0, 1, 0.5, vectorized=True, breakpoints=[])
+    assert table.max_error == np.inf
+    assert "no guaranteed bound" in table.report()
+
+
+def test_report_says_when_there_is_no_bound():
+    assert "no guaranteed bound" in LookupTable(np.sin, 0, 3, 0.5, vectorized=True).report()
+    assert "(guaranteed)" in CompiledHumidifier().table.report()
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from fuzzy_mf import trapmf, trimf, validate
+from fuzzylogic import FuzzyHumidityCtrl
+
+
+def test_matches_skfuzzy_on_the_controller_sets():
+    ctrl = FuzzyHumidityCtrl()
+    sets = {"dry": ("trapmf", ctrl.dry_set), "ok": ("trimf", ctrl.ok_set), "wet": ("trapmf", ctrl.wet_set)}
+    errors = validate(ctrl.error_universe, sets)
+    assert max(errors.values()) < 1e-12
+
+
+@pytest.mark.parametrize("x", [-60.0, -50.0, -20.0, -15.0, -7.5, 0.0, 3.0, 15.0, 50.0, 60.0])
+def test_scalar_and_array_paths_agree(x):
+    for mf, params in ((trapmf, (-50, -50, -15, 0)), (trimf, (-15, 0, 15)), (trapmf, (0, 15, 50, 50))):
+        assert mf(x, params) == mf(np.array([x]), params)[0]
+
+
+def test_per_element_sets():
+    x = np.array([0.5, 0.5, 2.0])
+    a, b, c, d = (np.array(v, dtype=float) for v in ([0, 0, 1], [1, 0.5, 2], [2, 1, 2], [3, 1, 3]))
+    expected = [trapmf(xi, (ai, bi, ci, di)) for xi, ai, bi, ci, di in zip(x, a, b, c, d)]
+    assert trapmf(x, (a, b, c, d)).tolist() == expected
@@ -0,0 +1,33 @@
+from PIL import Image
+
+from gifsample import gif_frame_headers
+
+
+def make_gif(path, n=3):
+    frames = [Image.new("L", (8, 8), 60 * i).convert("P") for i in range(n)]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=50, transparency=0)
+    return path.read_bytes()
+
+
+def test_headers_of_a_whole_file(tmp_path):
+    make_gif(tmp_path / "a.gif")
+    canvas, frames = gif_frame_headers(tmp_path / "a.gif")
+    assert canvas == (8, 8) and len(frames) == 3
+
+
+def test_truncated_files_keep_the_frames_read_so_far(tmp_path):
+    data = make_gif(tmp_path / "a.gif")
+    _, whole = gif_frame_headers(tmp_path / "a.gif")
+    path = tmp_path / "cut.gif"
+    for end in range(13, len(data)):
+        path.write_bytes(data[:end])
+        _, frames = gif_frame_headers(path)
+        assert len(frames) <= len(whole)
+
+
+def test_empty_graphic_control_block(tmp_path):
+    data = make_gif(tmp_path / "a.gif")
+    at = data.index(b"!\xf9")
+    path = tmp_path / "empty.gif"
+    path.write_bytes(data[:at] + b"!\xf9\x00" + data[at + 8:])
+    gif_frame_headers(path)
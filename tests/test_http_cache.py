@@ -0,0 +1,23 @@
+import pytest
+import requests
+
+from http_cache import ResponseCache
+
+
+def test_revalidation_and_errors_are_counted(fixture_server, tmp_path):
+    cache = ResponseCache(tmp_path)
+    page = f"{fixture_server.base_url}/product-reviews/B0CACHE001/"
+
+    assert cache.get(page) and cache.get(page)
+    assert cache.get(f"{fixture_server.base_url}/missing") is None
+    assert cache.stats["requests"] == 3
+    assert (cache.stats["misses"], cache.stats["revalidated"], cache.stats["errors"]) == (1, 1, 1)
+    assert cache.hit_rate == pytest.approx(1 / 3)
+    assert "1 errors" in cache.report()
+
+
+def test_network_errors_are_counted(tmp_path):
+    cache = ResponseCache(tmp_path)
+    with pytest.raises(requests.RequestException):
+        cache.get("http://127.0.0.1:9/", timeout=1)
+    assert cache.stats["requests"] == cache.stats["errors"] == 1
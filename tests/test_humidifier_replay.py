@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from fuzzylogicc import FuzzyHumidifier
+
+
+def sequential(series, start=45):
+    humidifier = FuzzyHumidifier()
+    humidifier.last_rh = start
+    return np.array([humidifier.compute(rh) for rh in series]), humidifier.last_rh
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(4)
+    return np.clip(50 + np.cumsum(rng.normal(0, 2, 2000)), 0, 100)
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 256, 65536])
+def test_replay_matches_compute(series, chunk):
+    expected, last_rh = sequential(series)
+    humidifier = FuzzyHumidifier()
+    powers = humidifier.replay(series, chunk=chunk)
+    np.testing.assert_allclose(powers, expected, rtol=0, atol=1e-12)
+    assert humidifier.last_rh == pytest.approx(last_rh, abs=1e-9)
+
+
+def test_replay_chunks_carries_state_across_chunks(series):
+    expected, last_rh = sequential(series)
+    humidifier = FuzzyHumidifier()
+    chunks = [series[:300], [], series[300:301], series[301:]]
+    powers = list(humidifier.replay_chunks(chunks))
+    assert [len(p) for p in powers] == [300, 0, 1, len(series) - 301]
+    np.testing.assert_allclose(np.concatenate(powers), expected, rtol=0, atol=1e-12)
+    assert humidifier.last_rh == pytest.approx(last_rh, abs=1e-9)
+
+
+def test_replay_continues_after_compute(series):
+    humidifier = FuzzyHumidifier()
+    head = [humidifier.compute(rh) for rh in series[:10]]
+    tail = humidifier.replay(series[10:])
+    expected, _ = sequential(series)
+    np.testing.assert_allclose(np.concatenate([head, tail]), expected, rtol=0, atol=1e-12)
+
+
+def test_replay_empty_series():
+    humidifier = FuzzyHumidifier()
+    assert humidifier.replay([]).shape == (0,)
+    assert humidifier.last_rh == 45
@@ -0,0 +1,47 @@
+import numpy as np
+
+from fuzzylogicc import FuzzyHumidifier
+from humidity_sim import HumidifierDriver, RoomSim
+
+
+class IdleDriver:
+    def __init__(self, rooms):
+        pass
+
+    def __call__(self, rh, setpoint):
+        return np.zeros_like(rh)
+
+
+def test_humidifier_driver_matches_the_controller_per_room():
+    rng = np.random.default_rng(1)
+    readings = rng.uniform(20, 80, (50, 4))
+    driver = HumidifierDriver(4)
+    rooms = [FuzzyHumidifier() for _ in range(4)]
+    for rh in readings:
+        expected = [ctrl.compute(x) for ctrl, x in zip(rooms, rh.tolist())]
+        np.testing.assert_allclose(driver(rh, None), expected, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(driver.last_rh, [ctrl.last_rh for ctrl in rooms], rtol=0, atol=1e-12)
+
+
+def test_same_seed_same_run():
+    a = RoomSim(50, seed=3).run(200)
+    b = RoomSim(50, seed=3).run(200)
+    assert np.array_equal(a.rh, b.rh) and a.summary() == b.summary()
+    assert ((a.rh >= 0) & (a.rh <= 100)).all()
+
+
+def test_copies_see_the_same_rooms_and_events():
+    sim = RoomSim(30, "humidifier", copies=3, seed=5).run(500)
+    copies = sim.rh.reshape(3, 30)
+    assert np.array_equal(copies[0], copies[1]) and np.array_equal(copies[0], copies[2])
+    single = RoomSim(30, "humidifier", seed=5).run(500)
+    assert np.array_equal(single.rh, copies[0])
+
+
+def test_controller_keeps_rooms_closer_to_the_setpoint():
+    controlled = RoomSim(200, "ctrl", seed=0).run(24 * 60).summary()
+    idle = RoomSim(200, IdleDriver, seed=0).run(24 * 60).summary()
+    assert controlled["hours"] == idle["hours"] == 24
+    assert controlled["mean_abs_error"] < idle["mean_abs_error"]
+    assert controlled["time_in_band"] > idle["time_in_band"]
+    assert idle["device_hours_per_day"] == 0
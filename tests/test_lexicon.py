@@ -0,0 +1,39 @@
+import nltk
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+import cselec2
+
+
+def use_lexicon(monkeypatch, tmp_path, text):
+    bundled = tmp_path / "vader_lexicon.txt"
+    bundled.write_text(text, encoding="utf-8")
+    monkeypatch.setattr(cselec2, "BUNDLED_LEXICON", bundled)
+    monkeypatch.setattr(cselec2, "LEXICON_CACHE", tmp_path / "cache" / "vader_lexicon.marshal")
+    monkeypatch.setattr(cselec2, "_analyzer", None)
+    monkeypatch.setattr(nltk.data, "path", list(nltk.data.path))
+
+
+def test_analyzer_is_built_by_its_constructor_and_cached(monkeypatch, tmp_path):
+    use_lexicon(monkeypatch, tmp_path, "good\t1.9\t0.9\t[2]\n\nbad\t-2.5\t0.7\t[-3]\n")
+    sia = cselec2.get_analyzer()
+    assert isinstance(sia, SentimentIntensityAnalyzer)
+    assert sia.lexicon == {"good": 1.9, "bad": -2.5}
+    assert sia.polarity_scores("good")["compound"] > 0 > sia.polarity_scores("bad")["compound"]
+    assert cselec2.get_analyzer() is sia
+    assert cselec2.LEXICON_CACHE.exists()
+
+
+def test_later_builds_take_the_parsed_lexicon_from_the_cache(monkeypatch, tmp_path):
+    use_lexicon(monkeypatch, tmp_path, "good\t1.9\t0.9\t[2]\n")
+    cselec2.get_analyzer()
+    (tmp_path / "vader_lexicon.txt").write_text("great\t3.1\t0.5\t[3]\n", encoding="utf-8")
+    monkeypatch.setattr(cselec2, "_analyzer", None)
+    assert cselec2.get_analyzer().lexicon == {"good": 1.9}
+
+
+def test_worker_pool_scores_like_one_process(monkeypatch, tmp_path):
+    use_lexicon(monkeypatch, tmp_path, "good\t1.9\t0.9\t[2]\nbad\t-2.5\t0.7\t[-3]\n")
+    texts = [f"{'good ' * (i % 3)}{'bad ' * (i % 2)}review {i}" for i in range(25)]
+    sequential = cselec2.score_reviews(texts, cache=None)
+    assert cselec2.score_reviews(texts, workers=2, shard_size=4, cache=None) == sequential
+    assert len({s["compound"] for s in sequential}) > 1
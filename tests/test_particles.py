@@ -0,0 +1,26 @@
+import numpy as np
+
+from fuzzylogic import MistParticles
+
+
+def spawn(particles, n, lifetime=5):
+    ones = np.ones(n)
+    return particles.spawn(ones * 10, ones * 10, ones, ones, ones * 8, 0, np.full(n, lifetime))
+
+
+def test_spawn_is_capped_and_slots_are_reused():
+    particles = MistParticles(capacity=10)
+    first = spawn(particles, 6)
+    assert len(particles) == 6 and len(spawn(particles, 6)) == 4
+    particles.release(first)
+    assert len(particles) == 4
+    assert sorted(spawn(particles, 6).tolist()) == sorted(first.tolist())
+
+
+def test_step_expires_particles_by_age():
+    particles = MistParticles(capacity=8)
+    spawn(particles, 3, lifetime=2)
+    visible, expired = particles.step()
+    assert len(visible) == 3 and len(expired) == 0
+    visible, expired = particles.step()
+    assert len(visible) == 0 and len(expired) == 3
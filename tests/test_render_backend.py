@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from fuzzylogic import SmartHumidityGUI
+from fuzzylogicc import SmartClimateApp
+from render_backend import OffscreenRenderer
+
+RED, BLUE, WHITE = (255, 0, 0), (0, 0, 255), (255, 255, 255)
+
+
+def pixel(renderer, x, y):
+    return tuple(renderer.to_array()[y, x])
+
+
+def test_items_are_drawn_in_creation_order():
+    renderer = OffscreenRenderer(40, 30)
+    assert renderer.to_array().shape == (30, 40, 3)
+    assert (renderer.to_array() == 255).all()
+
+    below = renderer.create_rectangle(0, 0, 20, 20, fill="red", outline="")
+    renderer.create_oval(10, 10, 30, 30, fill="blue", outline="")
+    renderer.present()
+    assert pixel(renderer, 5, 5) == RED
+    assert pixel(renderer, 20, 20) == BLUE          # the oval covers the rectangle
+    assert pixel(renderer, 35, 5) == WHITE
+
+    renderer.itemconfigure(below, fill="blue")
+    renderer.coords(below, 30, 0, 20, 8)            # corners in any order, like Tk
+    assert renderer.coords(below) == [30.0, 0.0, 20.0, 8.0]
+    renderer.present()
+    assert pixel(renderer, 5, 5) == WHITE and pixel(renderer, 25, 4) == BLUE
+
+
+def test_hidden_and_deleted_items_are_not_drawn():
+    renderer = OffscreenRenderer(20, 20, bg="black")
+    line = renderer.create_line(0, 10, 20, 10, fill="red", width=3)
+    polygon = renderer.create_polygon(0, 0, 19, 0, 0, 19)   # filled black by default, like Tk
+    renderer.present()
+    assert pixel(renderer, 10, 10) == RED and pixel(renderer, 2, 2) == (0, 0, 0)
+
+    renderer.itemconfig(line, state="hidden")
+    renderer.present()
+    assert pixel(renderer, 10, 10) == (0, 0, 0)
+
+    renderer.delete(polygon)
+    assert len(renderer) == 1
+    renderer.delete("all")
+    assert len(renderer) == 0
+
+
+def device_color(app, renderer):
+    x0, y0, x1, y1 = renderer.coords(app.device)
+    return pixel(renderer, int((x0 + x1) / 2) + 19, int((y0 + y1) / 2))   # the ring outside the inner disc
+
+
+@pytest.mark.parametrize("humidity, color", [(80, (0x34, 0x98, 0xdb)), (20, (0xe6, 0x7e, 0x22)), (50, (0x95, 0xa5, 0xa6))])
+def test_humidity_gui_frame(humidity, color):
+    renderer = OffscreenRenderer(450, 400)
+    gui = SmartHumidityGUI(renderer=renderer)
+    gui.hum_scale.set(humidity)
+    gui.update_display()
+    for _ in range(5):
+        gui.animate()
+    assert renderer.image.size == (450, 400)
+    assert device_color(gui, renderer) == color
+
+
+def test_climate_app_frame_follows_the_mode():
+    renderer = OffscreenRenderer(560, 330)
+    app = SmartClimateApp(renderer=renderer)
+    app.animate()
+    dehumidifier = renderer.to_array().copy()
+    app.mode.set("humidifier")
+    app.update_display()
+    app.animate()
+    assert renderer.to_array().shape == (330, 560, 3)
+    assert (renderer.to_array() != dehumidifier).any()
@@ -0,0 +1,91 @@
+import sys
+
+import numpy as np
+import pytest
+
+import replay_log
+from fuzzylogicc import FuzzyHumidifier
+from replay_log import read_log, write_log
+
+READINGS = np.array([45.0, 52.5, 61.25, 38.0, 70.0, 49.5, 33.75])
+
+
+def collect(chunks):
+    return np.concatenate(list(chunks))
+
+
+def write_csv(path, text):
+    path.write_text(text)
+    return path
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 100])
+def test_csv_with_header(tmp_path, chunk):
+    rows = "".join(f"2024-01-01T00:{i:02d},{rh}\n" for i, rh in enumerate(READINGS))
+    path = write_csv(tmp_path / "log.csv", "time,rh\n" + rows)
+    np.testing.assert_array_equal(collect(read_log(path, chunk)), READINGS)
+    np.testing.assert_array_equal(collect(read_log(path, chunk, column="rh")), READINGS)
+    np.testing.assert_array_equal(collect(read_log(path, chunk, column="1")), READINGS)
+
+
+def test_csv_timestamp_column_is_not_a_header(tmp_path):
+    rows = "".join(f"2024-01-01T00:{i:02d},{rh}\n" for i, rh in enumerate(READINGS))
+    path = write_csv(tmp_path / "log.csv", rows)
+    np.testing.assert_array_equal(collect(read_log(path, 4)), READINGS)
+
+
+def test_csv_header_flag(tmp_path):
+    path = write_csv(tmp_path / "log.txt", "".join(f"{rh}\n" for rh in READINGS))
+    np.testing.assert_array_equal(collect(read_log(path, 4, header=False)), READINGS)
+    np.testing.assert_array_equal(collect(read_log(path, 4, header=True)), READINGS[1:])
+
+
+def test_csv_unknown_column(tmp_path):
+    path = write_csv(tmp_path / "log.csv", "time,rh\n0,45\n")
+    with pytest.raises(SystemExit, match="no column 'temp'"):
+        collect(read_log(path, 4, column="temp"))
+    with pytest.raises(SystemExit, match="out of range"):
+        collect(read_log(path, 4, column="2"))
+
+
+@pytest.mark.parametrize("shape", [(7,), (7, 3)])
+def test_npy(tmp_path, shape):
+    data = READINGS if len(shape) == 1 else np.column_stack([READINGS * 0, READINGS, READINGS * 2])
+    path = tmp_path / "log.npy"
+    np.save(path, data.astype(np.float32))
+    column = None if len(shape) == 1 else "1"
+    np.testing.assert_array_equal(collect(read_log(path, 3, column=column)), READINGS)
+
+
+def test_npy_column_must_be_an_index(tmp_path):
+    path = tmp_path / "log.npy"
+    np.save(path, np.column_stack([READINGS, READINGS]))
+    with pytest.raises(SystemExit, match="no column 'rh'"):
+        collect(read_log(path, 3, column="rh"))
+
+
+def test_raw(tmp_path):
+    path = tmp_path / "log.bin"
+    READINGS.astype("<f4").tofile(path)
+    np.testing.assert_array_equal(collect(read_log(path, 3, dtype="float32")), READINGS)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".npy", ".bin"])
+def test_write_round_trip(tmp_path, suffix):
+    path = tmp_path / f"out{suffix}"
+    assert write_log(path, [READINGS[:4], np.empty(0), READINGS[4:]], "power") == len(READINGS)
+    if suffix == ".npy":
+        np.testing.assert_array_equal(np.load(path), READINGS)
+    elif suffix == ".csv":
+        assert path.read_text().splitlines()[0] == "power"
+    np.testing.assert_allclose(collect(read_log(path, 3)), READINGS, atol=1e-6)
+
+
+def test_main_replays_humidifier(tmp_path, monkeypatch, capsys):
+    source = write_csv(tmp_path / "in.csv", "".join(f"{rh}\n" for rh in READINGS))
+    target = tmp_path / "out.npy"
+    monkeypatch.setattr(sys, "argv", ["replay_log.py", str(source), str(target), "--chunk", "2"])
+    replay_log.main()
+    humidifier = FuzzyHumidifier()
+    np.testing.assert_allclose(np.load(target), [humidifier.compute(rh) for rh in READINGS], atol=1e-12)
+    assert "7 rows" in capsys.readouterr().out
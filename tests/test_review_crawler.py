@@ -0,0 +1,108 @@
+import time
+
+from cselec2 import fetch_review_page
+from review_crawler import ReviewCrawler
+from review_state import ReviewStateStore
+
+
+def product_urls(server, n):
+    return [f"{server.base_url}/product-reviews/B0CRAWL{i:03d}/" for i in range(n)]
+
+
+def test_follows_pagination_within_per_host_limit(fixture_server):
+    crawler = ReviewCrawler(workers=8, per_host=2, max_pages=10)
+    pages = list(crawler.crawl(product_urls(fixture_server, 6)))
+
+    assert len(pages) == 6 * 3
+    assert all(records for _, _, records in pages)
+    assert fixture_server.max_active == 2
+
+
+def test_max_pages(fixture_server):
+    crawler = ReviewCrawler(workers=4, per_host=4, max_pages=2)
+    pages = list(crawler.crawl(product_urls(fixture_server, 3)))
+    assert len(pages) == 3 * 2
+    assert fixture_server.hits == 3 * 2
+
+
+def test_retries_failed_fetches_after_a_delay(fixture_server):
+    calls = []
+
+    def flaky(url, headers, **kwargs):
+        calls.append(time.perf_counter())
+        if len(calls) < 3:
+            return None
+        return fetch_review_page(url, headers, **kwargs)
+
+    crawler = ReviewCrawler(workers=1, per_host=1, max_pages=1, attempts=3, retry_delay=0.1, fetch=flaky)
+    pages = list(crawler.crawl(product_urls(fixture_server, 1)))
+
+    assert len(pages) == 1 and pages[0][2]
+    assert len(calls) == 3
+    assert calls[1] - calls[0] >= 0.1 and calls[2] - calls[1] >= 0.1
+
+
+def test_gives_up_after_last_attempt(fixture_server):
+    calls = []
+
+    def failing(url, headers, **kwargs):
+        calls.append(url)
+        return None
+
+    crawler = ReviewCrawler(workers=2, per_host=2, attempts=2, retry_delay=0.0, fetch=failing)
+    assert list(crawler.crawl(product_urls(fixture_server, 2))) == []
+    assert len(calls) == 2 * 2
+
+
+def test_duplicate_product_urls_are_crawled_once(fixture_server):
+    urls = product_urls(fixture_server, 2)
+    crawler = ReviewCrawler(workers=4, per_host=4, max_pages=10)
+    pages = list(crawler.crawl(urls + urls[::-1]))
+
+    assert len(pages) == 2 * 3
+    assert len({page_url for _, page_url, _ in pages}) == len(pages)
+    assert fixture_server.hits == 2 * 3
+
+
+def listing(pages):
+    """A fetch function serving `pages` (lists of records) for every product, with Next links."""
+    def fetch(url, headers, **kwargs):
+        base, _, n = url.partition("?page=")
+        n = int(n or 1)
+        next_page = f"{base}?page={n + 1}" if n < len(pages) else None
+        return [(f"{base} {text}", star) for text, star in pages[n - 1]], next_page
+    return fetch
+
+
+def test_reviews_seen_in_earlier_runs_are_skipped(tmp_path):
+    urls = [f"https://example.com/product-reviews/B0CRAWL{i:03d}/" for i in range(2)]
+    pages = [[("great", "5.0"), ("fine", "4.0")], [("awful", "1.0")], [("meh", "3.0")]]
+
+    # An interrupted first run: only page 1 of each product got scored
+    state = ReviewStateStore(tmp_path)
+    crawler = ReviewCrawler(workers=2, per_host=2, max_pages=1, fetch=listing(pages))
+    assert [len(records) for _, _, records in crawler.crawl(urls, keep=state.filter_new)] == [2, 2]
+    state.save()
+
+    # Page 1 has nothing new now, but the pages after it still get crawled
+    state = ReviewStateStore(tmp_path)
+    crawler = ReviewCrawler(workers=2, per_host=2, max_pages=10, fetch=listing(pages))
+    second = list(crawler.crawl(urls, keep=state.filter_new))
+    assert sorted(len(records) for _, _, records in second) == [0, 0, 1, 1, 1, 1]
+    state.save()
+
+    state = ReviewStateStore(tmp_path)
+    third = list(crawler.crawl(urls, keep=state.filter_new))
+    assert len(third) == 2 * 3 and not any(records for _, _, records in third)
+
+
+def test_stop_on_seen_page(tmp_path):
+    urls = [f"https://example.com/product-reviews/B0CRAWL{i:03d}/" for i in range(2)]
+    pages = [[("great", "5.0")], [("awful", "1.0")], [("meh", "3.0")]]
+    state = ReviewStateStore(tmp_path)
+    first = ReviewCrawler(workers=2, per_host=2, max_pages=1, fetch=listing(pages))
+    list(first.crawl(urls, keep=state.filter_new))
+
+    crawler = ReviewCrawler(workers=2, per_host=2, fetch=listing(pages), stop_on_seen_page=True)
+    second = list(crawler.crawl(urls, keep=state.filter_new))
+    assert [records for _, _, records in second] == [[], []]
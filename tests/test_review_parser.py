@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import cselec2
+from cselec2 import extract_reviews_and_stars, iter_review_records
+
+PAGES_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "pages"
+CLASSIC = (PAGES_DIR / "reviews_classic.html").read_text(encoding="utf-8")
+
+
+def test_classic_page_has_an_extra_star_widget():
+    # The average rating uses the same a-icon-alt markup as the review stars
+    reviews, stars = extract_reviews_and_stars(CLASSIC)
+    assert len(stars) == len(reviews) + 1
+
+
+def test_records_pair_each_review_with_its_own_star():
+    records = list(iter_review_records([CLASSIC[i:i + 700] for i in range(0, len(CLASSIC), 700)]))
+    assert len(records) == 10
+    assert records[0] == ("Stopped working after a week. Terrible build quality and support never "
+                          "answered my emails.", "1.0")
+    assert records[5] == ("Works as described.", "5.0")
+
+
+def test_main_analyzes_paired_records(fixture_server, monkeypatch):
+    product = next(f"B0MAIN{i:04d}" for i in range(100) if sum(map(ord, f"B0MAIN{i:04d}")) % 2 == 0)
+    url = f"{fixture_server.base_url}/product-reviews/{product}/"
+    analyzed = []
+    monkeypatch.setattr("builtins.input", lambda prompt: url)
+    monkeypatch.setattr(cselec2, "analyze_records", analyzed.append)
+
+    cselec2.main()
+
+    assert analyzed == [list(iter_review_records([CLASSIC]))]
@@ -0,0 +1,42 @@
+import pytest
+
+import review_results
+from review_results import ResultsSink, summarize
+
+
+def record(url, n, match):
+    return {"url": url, "review_id": f"{n:016x}", "text": f'Review, "{n}"\nsecond line', "star": 4.0,
+            "compound": 0.5, "label": "Positive", "match": match}
+
+
+RECORDS = ([record("https://a", i, i % 4 != 0) for i in range(8)]      # 2 of 8 mismatched
+           + [record("https://b", i, i % 2 == 0) for i in range(8, 12)]  # 2 of 4
+           + [record("https://c", 12, True), record("https://c", 13, None)])
+EXPECTED = [("https://b", 4, 2, 0.5), ("https://a", 8, 2, 0.25), ("https://c", 1, 0, 0.0)]
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".csv", ".parquet"])
+def test_summary_round_trip(tmp_path, suffix):
+    path = tmp_path / f"results{suffix}"
+    with ResultsSink(path, buffer_size=5) as sink:
+        sink.write_many(RECORDS)
+    assert sink.written == len(RECORDS)
+    assert summarize(path) == EXPECTED
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".csv"])
+def test_summary_without_pyarrow(tmp_path, monkeypatch, suffix):
+    path = tmp_path / f"results{suffix}"
+    with ResultsSink(path) as sink:
+        sink.write_many(RECORDS)
+
+    def no_pyarrow():
+        raise ImportError
+    monkeypatch.setattr(review_results, "_parquet", no_pyarrow)
+    assert summarize(path) == EXPECTED
+
+
+def test_empty_results(tmp_path):
+    path = tmp_path / "results.jsonl"
+    ResultsSink(path).close()
+    assert summarize(path) == []
@@ -0,0 +1,25 @@
+from review_state import ReviewStateStore, product_key
+
+
+def test_product_key_is_the_asin():
+    assert product_key("https://www.amazon.com/dp/B0EXAMPLE1/ref=x") == "B0EXAMPLE1"
+    assert product_key("https://www.amazon.com/product-reviews/B0EXAMPLE1/?pageNumber=2") == "B0EXAMPLE1"
+
+
+def test_longer_ids_are_not_truncated_to_an_asin():
+    urls = [f"http://127.0.0.1/product-reviews/B0FIXTURE{i:03d}/" for i in range(4)]
+    assert len({product_key(url) for url in urls}) == 4
+
+
+def test_neighbouring_products_keep_separate_state(tmp_path):
+    records = [("Great product!", "5.0"), ("Broke after a week.", "1.0")]
+    a, b = (f"http://127.0.0.1/product-reviews/B0FIXTURE{i:03d}/" for i in range(2))
+
+    state = ReviewStateStore(tmp_path)
+    assert state.filter_new(a, records) == records
+    state.save()
+
+    state = ReviewStateStore(tmp_path)
+    assert state.filter_new(a, records) == []
+    assert state.filter_new(b, records) == records
+    assert state.count(a) == state.count(b) == 2
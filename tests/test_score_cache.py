@@ -0,0 +1,39 @@
+import cselec2
+from cselec2 import ScoreCache, score_reviews
+
+
+def fake_scores(texts, workers, shard_size):
+    return [{"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": text.count("!") / 10} for text in texts]
+
+
+def test_repeats_are_scored_once_and_counted_as_hits(monkeypatch):
+    scored = []
+    monkeypatch.setattr(cselec2, "_score_texts", lambda texts, *a: scored.extend(texts) or fake_scores(texts, *a))
+    cache = ScoreCache()
+
+    scores = score_reviews(["Great product!", "Great  product!", "Meh", "Great product!"], cache=cache)
+    assert scored == ["Great product!", "Meh"]
+    assert scores[0] == scores[1] == scores[3]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    score_reviews(["Meh"], cache=cache)
+    assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_capitals_get_their_own_entry(monkeypatch):
+    monkeypatch.setattr(cselec2, "_score_texts", fake_scores)
+    cache = ScoreCache()
+    score_reviews(["Great product!", "GREAT product!"], cache=cache)
+    assert len(cache) == 2 and cache.misses == 2
+
+
+def test_save_and_reload(monkeypatch, tmp_path):
+    monkeypatch.setattr(cselec2, "_score_texts", fake_scores)
+    path = tmp_path / "scores.marshal"
+    cache = ScoreCache(path=path)
+    expected = score_reviews(["Works as described!!"], cache=cache)
+    cache.save()
+
+    cache = ScoreCache(path=path)
+    assert score_reviews(["Works as described!!"], cache=cache) == expected
+    assert cache.hits == 1
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from tiling import detect_tiled, iter_tiles, nms
+
+
+@pytest.fixture
+def picture():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (150, 230, 3), dtype=np.uint8)
+
+
+def tiles(path, **kw):
+    return {(x0, y0): arr for x0, y0, arr in iter_tiles(path, **kw)}
+
+
+@pytest.mark.parametrize("fmt", ["ppm", "bmp"])
+def test_streamed_bands_match_a_whole_decode(tmp_path, picture, fmt):
+    Image.fromarray(picture).save(tmp_path / f"big.{fmt}")
+    Image.fromarray(picture).save(tmp_path / "big.png")
+    streamed = tiles(tmp_path / f"big.{fmt}", tile=64, overlap=16)
+    decoded = tiles(tmp_path / "big.png", tile=64, overlap=16)
+    assert streamed.keys() == decoded.keys()
+    for (x0, y0), arr in streamed.items():
+        np.testing.assert_array_equal(arr, decoded[x0, y0])
+        np.testing.assert_array_equal(arr, picture[y0:y0 + 64, x0:x0 + 64, ::-1])
+
+
+def test_tiles_cover_the_edges(tmp_path, picture):
+    Image.fromarray(picture).save(tmp_path / "big.ppm")
+    starts = tiles(tmp_path / "big.ppm", tile=64, overlap=16).keys()
+    assert sorted({x for x, _ in starts}) == [0, 48, 96, 144, 166]
+    assert sorted({y for _, y in starts}) == [0, 48, 86]
+
+
+def test_nms_is_per_class():
+    boxes = [{"class": "a", "score": 0.9, "box": [0, 0, 10, 10]},
+             {"class": "a", "score": 0.8, "box": [1, 1, 10, 10]},
+             {"class": "b", "score": 0.7, "box": [1, 1, 10, 10]},
+             {"class": "a", "score": 0.6, "box": [50, 50, 10, 10]}]
+    assert [d["score"] for d in nms(boxes)] == [0.9, 0.7, 0.6]
+
+
+def test_detections_are_merged_in_image_coordinates(tmp_path, picture):
+    picture[100:110, 120:130] = 0
+    Image.fromarray(picture).save(tmp_path / "big.ppm")
+
+    def detect(bgr):
+        ys, xs = np.nonzero((bgr == 0).all(axis=2))
+        if not len(xs) or xs.max() - xs.min() < 9 or ys.max() - ys.min() < 9:
+            return []   # cut by the tile edge
+        return [{"class": "dark", "score": 0.5, "box": [int(xs.min()), int(ys.min()), 10, 10]}]
+
+    found = detect_tiled(tmp_path / "big.ppm", detect, tile=64, overlap=32, workers=2)
+    assert [d["box"] for d in found] == [[120, 100, 10, 10]]
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from fuzzy_mf import trapmf, trimf
+from tune_fuzzy import SPACES, evolve_search, load_checkpoint, save_checkpoint
+
+
+@pytest.mark.parametrize("controller", sorted(SPACES))
+def test_default_candidate_gives_back_the_spec(controller):
+    space = SPACES[controller]
+    assert space.to_spec(space.default()) == space.spec
+
+
+def test_per_element_breakpoints_match_the_scalar_sets():
+    x = np.linspace(-10, 110, 241)
+    sets = [(0, 20, 40, 60), (30, 30, 50, 70), (-np.inf, -np.inf, 35, 55), (45, 70, np.inf, np.inf)]
+    a, b, c, d = (np.repeat(np.array(p, dtype=float), len(x)) for p in zip(*sets))
+    got = trapmf(np.tile(x, len(sets)), (a, b, c, d)).reshape(len(sets), -1)
+    for row, abcd in zip(got, sets):
+        np.testing.assert_array_equal(row, trapmf(x, abcd))
+    np.testing.assert_array_equal(trapmf(x, (np.full(len(x), 40.0), 50.0, 50.0, 60.0)), trimf(x, (40, 50, 60)))
+
+
+def run_evolve(args, space, state, rounds=None):
+    """Drive evolve_search with a made-up cost; returns (candidates per round, last saved state)."""
+    search = evolve_search(space, args, state)
+    seen, costs, saved = [], None, state
+    for _ in range(rounds or args.generations):
+        try:
+            candidates, state = search.send(costs)
+        except StopIteration:
+            break
+        costs = np.abs(candidates - space.default()).sum(axis=1)
+        seen.append(candidates)
+        saved = dict(state, costs=costs.tolist())
+    return seen, saved
+
+
+def test_evolve_resumes_where_it_stopped():
+    space = SPACES["humidifier"]
+    args = SimpleNamespace(seed=3, batch=8, generations=5)
+    full, _ = run_evolve(args, space, {})
+
+    first, saved = run_evolve(args, space, {}, rounds=2)
+    rest, _ = run_evolve(args, space, saved)
+    assert len(first) + len(rest) == len(full) == 5
+    for a, b in zip(first + rest, full):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_finished_evolve_continues_with_more_generations(tmp_path):
+    space = SPACES["humidifier"]
+    settings = {"controller": "humidifier", "seed": 3, "generations": 3}
+    path = tmp_path / "run.json"
+    _, saved = run_evolve(SimpleNamespace(seed=3, batch=8, generations=3), space, {})
+    save_checkpoint(path, {"settings": settings, "state": saved})
+
+    with pytest.raises(SystemExit, match="different settings"):
+        load_checkpoint(path, dict(settings, seed=4))
+    run = load_checkpoint(path, dict(settings, generations=5))
+    assert run["settings"]["generations"] == 5
+    more, _ = run_evolve(SimpleNamespace(seed=3, batch=8, generations=5), space, run["state"])
+    assert len(more) == 2
+    np.testing.assert_array_equal(more[0][:2], np.array(saved["population"])[np.argsort(saved["costs"])[:2]])
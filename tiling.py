@@ -0,0 +1,130 @@
+# tiling.py
+# Score very large images as overlapping tiles instead of one big
+# downscaled picture, then merge the per-tile detections.
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+
+# Formats whose pixel rows Pillow reads straight from the file, and the
+# bytes per pixel for the raw layouts we can read in bands
+_BAND_FORMATS = ("PPM", "BMP")
+_RAW_BYTES = {"L": 1, "P": 1, "RGB": 3, "BGR": 3,
+              "RGBA": 4, "BGRA": 4, "RGBX": 4, "BGRX": 4}
+
+
+# ----------------------------------------------------------
+#  BAND READER
+# ----------------------------------------------------------
+def _raw_layout(im):
+    """Return (offset, rawmode, stride, orientation) if rows can be read directly."""
+    if im.format not in _BAND_FORMATS or len(im.tile) != 1 or im.tile[0][0] != "raw":
+        return None
+    _, extents, offset, args = im.tile[0]
+    if extents != (0, 0) + im.size:
+        return None
+    if isinstance(args, str):
+        args = (args, 0, 1)
+    rawmode, stride, orientation = (tuple(args) + (0, 1))[:3]
+    if rawmode not in _RAW_BYTES:
+        return None
+    stride = stride or im.size[0] * _RAW_BYTES[rawmode]
+    return offset, rawmode, stride, orientation or 1
+
+
+def _read_band(path, layout, y0, y1):
+    """Decode rows [y0, y1) of a raw image without touching the other rows."""
+    offset, rawmode, stride, orientation = layout
+    with Image.open(path) as im:
+        width, height = im.size
+        first_row = y0 if orientation > 0 else height - y1
+        im.tile = [("raw", (0, 0, width, y1 - y0), offset + first_row * stride,
+                    (rawmode, stride, orientation))]
+        im._size = (width, y1 - y0)
+        return np.asarray(im.convert("RGB"))
+
+
+def _starts(length, tile, step):
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile + 1, step))
+    if starts[-1] != length - tile:
+        starts.append(length - tile)
+    return starts
+
+
+def iter_tiles(path, tile=640, overlap=160):
+    """Yield (x0, y0, BGR array) for overlapping tiles covering the image.
+
+    Uncompressed PPM and BMP files are streamed one band of rows at a
+    time, so the full-resolution bitmap is never held in memory.
+    Other formats have to be decoded whole and are then cut up.
+    """
+    step = max(tile - overlap, 1)
+    with Image.open(path) as im:
+        width, height = im.size
+        layout = _raw_layout(im)
+        full = None if layout else np.asarray(im.convert("RGB"))
+
+    for y0 in _starts(height, tile, step):
+        y1 = min(y0 + tile, height)
+        band = full[y0:y1] if full is not None else _read_band(path, layout, y0, y1)
+        for x0 in _starts(width, tile, step):
+            rgb = band[:, x0:x0 + tile]
+            yield x0, y0, np.ascontiguousarray(rgb[:, :, ::-1])
+
+
+# ----------------------------------------------------------
+#  CROSS-TILE NMS
+# ----------------------------------------------------------
+def nms(detections, iou_threshold=0.45):
+    """Greedy per-class non-maximum suppression on [x, y, w, h] boxes."""
+    kept = []
+    for cls in {d["class"] for d in detections}:
+        group = [d for d in detections if d["class"] == cls]
+        boxes = np.array([d["box"] for d in group], dtype=float)
+        scores = np.array([d["score"] for d in group])
+        x1, y1 = boxes[:, 0], boxes[:, 1]
+        x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+        areas = boxes[:, 2] * boxes[:, 3]
+
+        order = np.argsort(-scores, kind="stable")
+        while order.size:
+            i = order[0]
+            kept.append(group[i])
+            rest = order[1:]
+            iw = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+            ih = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+            inter = iw * ih
+            iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
+            order = rest[iou <= iou_threshold]
+    return sorted(kept, key=lambda d: -d["score"])
+
+
+# ----------------------------------------------------------
+#  TILED DETECTION
+# ----------------------------------------------------------
+def detect_tiled(path, detect, tile=640, overlap=160, workers=4):
+    """Run `detect` on every tile in a thread pool, return merged detections.
+
+    `detect` takes a BGR array and returns NudeDetector-style dicts with
+    "class", "score" and "box" ([x, y, w, h] in tile coordinates). At most
+    2 * workers tiles are in flight, which bounds memory on huge images.
+    """
+    found = []
+    pending = deque()
+
+    def collect(fut, x0, y0):
+        for d in fut.result():
+            x, y, w, h = d["box"]
+            found.append(dict(d, box=[x + x0, y + y0, w, h]))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for x0, y0, arr in iter_tiles(path, tile, overlap):
+            pending.append((pool.submit(detect, arr), x0, y0))
+            if len(pending) >= 2 * workers:
+                collect(*pending.popleft())
+        while pending:
+            collect(*pending.popleft())
+
+    return nms(found)
@@ -0,0 +1,339 @@
+# tune_fuzzy.py
+# Search the membership breakpoints of the fuzzy controllers against the
+# headless room simulation in humidity_sim.py.
+#
+# A candidate is one value per tunable breakpoint (see SPACES); the
+# breakpoints of each set are kept in order, so any candidate is a valid
+# set of trapezoids/triangles. Its cost is how far humidity strays outside
+# the comfort band (%RH per step, averaged over rooms) plus
+# --energy-weight times the device running hours per day.
+#
+# A batch of candidates is simulated together: one RoomSim runs the same
+# rooms, with the same random events, once per candidate, each copy with
+# its own breakpoints. Batches are spread over a process pool, and the
+# search state is checkpointed after each round so a long search can be
+# stopped and resumed with the same command.
+#
+#   python tune_fuzzy.py --controller humidifier --method evolve --generations 20
+#   python tune_fuzzy.py --controller ctrl --method grid --levels 3 --checkpoint ctrl.json
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+
+from fuzzy_engine import HUMIDITY_CTRL, DEHUMIDIFIER, HUMIDIFIER
+from fuzzy_mf import trapmf
+from fuzzylogicc import smooth_rh
+from humidity_sim import RoomSim
+
+
+# ----------------------------------------------------------
+#  PARAMETER SPACES
+# ----------------------------------------------------------
+class Space:
+    """The tunable breakpoints of a single-input Sugeno spec.
+
+    `knobs` lists (set name, breakpoint index, lo, hi); every other
+    breakpoint (e.g. the ±inf shoulders) stays as in the spec.
+    """
+
+    def __init__(self, spec: dict, knobs):
+        self.spec = spec
+        (self.var, self.sets), = spec["inputs"].items()
+        self.knobs = knobs
+        self.lo = np.array([k[2] for k in knobs], dtype=float)
+        self.hi = np.array([k[3] for k in knobs], dtype=float)
+
+    def __len__(self):
+        return len(self.knobs)
+
+    def default(self) -> np.ndarray:
+        return np.array([self.sets[name][1][i] for name, i, _, _ in self.knobs], dtype=float)
+
+    def breakpoints(self, candidates) -> dict:
+        """(a, b, c, d) arrays per set, one element per candidate, each sorted."""
+        candidates = np.atleast_2d(candidates)
+        points = {}
+        for name, (kind, params) in self.sets.items():
+            cols = np.tile(np.array(params, dtype=float), (len(candidates), 1))
+            for j, (knob_set, i, _, _) in enumerate(self.knobs):
+                if knob_set == name:
+                    cols[:, i] = candidates[:, j]
+            cols.sort(axis=1)
+            if kind == "trimf":
+                cols = cols[:, [0, 1, 1, 2]]
+            points[name] = cols.T
+        return points
+
+    def to_spec(self, candidate) -> dict:
+        """A copy of the spec with the candidate's breakpoints, for fuzzy_engine.compile_spec."""
+        points = self.breakpoints(candidate)
+        sets = {}
+        for name, (kind, _) in self.sets.items():
+            a, b, c, d = (float(v[0]) for v in points[name])
+            sets[name] = (kind, (a, b, d) if kind == "trimf" else (a, b, c, d))
+        return dict(self.spec, inputs={self.var: sets})
+
+
+SPACES = {
+    "ctrl": Space(HUMIDITY_CTRL, [
+        ("dry", 2, -40, 0), ("dry", 3, -20, 10),
+        ("ok", 0, -30, 0), ("ok", 1, -10, 10), ("ok", 2, 0, 30),
+        ("wet", 0, -10, 20), ("wet", 1, 0, 40),
+    ]),
+    "dehumidifier": Space(DEHUMIDIFIER, [
+        ("low", 2, 20, 45), ("low", 3, 35, 65),
+        ("comfort", 0, 30, 50), ("comfort", 1, 45, 65), ("comfort", 2, 55, 80),
+        ("high", 0, 45, 75), ("high", 1, 60, 95),
+    ]),
+    "humidifier": Space(HUMIDIFIER, [
+        ("low", 2, 20, 50), ("low", 3, 35, 70),
+        ("ok", 0, 30, 50), ("ok", 1, 40, 60), ("ok", 2, 50, 70),
+        ("high", 0, 35, 65), ("high", 1, 50, 85),
+    ]),
+}
+
+
+# ----------------------------------------------------------
+#  VECTORIZED EVALUATION
+# ----------------------------------------------------------
+class PopulationDriver:
+    """RoomSim driver where each block of `rooms` rooms runs one candidate's breakpoints.
+
+    Same effect per room as the humidity_sim drivers for the controller,
+    with the Sugeno rules of the spec evaluated on per-room breakpoints.
+    """
+
+    def __init__(self, controller, candidates, rooms):
+        space = SPACES[controller]
+        self.controller = controller
+        self.sets = {name: [np.repeat(p, rooms) for p in points]
+                     for name, points in space.breakpoints(candidates).items()}
+        self.rules = [(next(iter(ante.values())), out) for ante, out in space.spec["rules"]]
+        self.epsilon = space.spec.get("epsilon", 0.0)
+        self.last_rh = np.full(len(candidates) * rooms, 45.0)
+
+    def fuzzy(self, x):
+        numerator = denominator = 0.0
+        for name, out in self.rules:
+            w = trapmf(x, self.sets[name])
+            numerator = numerator + w * out
+            denominator = denominator + w
+        return numerator / (denominator + self.epsilon)
+
+    def __call__(self, rh, setpoint):
+        if self.controller == "ctrl":
+            return np.clip(self.fuzzy(rh - setpoint), -100, 100) / -100
+        if self.controller == "dehumidifier":
+            return -np.clip(self.fuzzy(rh), 0, 1)
+        d = np.clip((rh - self.last_rh) / 20, -0.08, 0.08)
+        power = np.clip(self.fuzzy(rh) - d, 0, 1)
+        self.last_rh = smooth_rh(self.last_rh, rh)
+        return power
+
+
+def evaluate(controller, candidates, settings) -> np.ndarray:
+    """Cost of each candidate (rows of `candidates`), all in one vectorized simulation."""
+    candidates = np.atleast_2d(candidates)
+    rooms = settings["rooms"]
+    sim = RoomSim(rooms, lambda n: PopulationDriver(controller, candidates, rooms),
+                  settings["setpoint"], settings["dt"], settings["band"], settings["seed"],
+                  copies=len(candidates))
+    sim.run(int(settings["days"] * 86400 / settings["dt"]))
+    steps, days = sim.steps, sim.steps * sim.dt_h / 24
+    band_error = sim.band_error.reshape(len(candidates), rooms).mean(axis=1) / steps
+    device_hours = sim.device_hours.reshape(len(candidates), rooms).mean(axis=1) / days
+    return band_error + settings["energy_weight"] * device_hours
+
+
+class Evaluator:
+    """Evaluate candidate batches in-process, or split across a process pool."""
+
+    def __init__(self, controller, settings, workers=1):
+        self.controller = controller
+        self.settings = settings
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def __call__(self, candidates) -> np.ndarray:
+        if self.pool is None or len(candidates) < 2:
+            return evaluate(self.controller, candidates, self.settings)
+        parts = np.array_split(candidates, min(self.workers, len(candidates)))
+        futures = [self.pool.submit(evaluate, self.controller, part, self.settings) for part in parts]
+        return np.concatenate([f.result() for f in futures])
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+# ----------------------------------------------------------
+#  SEARCH METHODS
+# ----------------------------------------------------------
+# Each takes the space, the options and the saved state, and yields
+# (candidates, state after this round) until the search is done; the
+# caller sends the candidates' costs back into the generator. A saved
+# state also carries the costs of its round (state["costs"]). The random
+# draws depend only on the seed and the round, so a resumed search
+# proposes the same candidates as an uninterrupted one.
+def grid_search(space, args, state):
+    axes = [np.linspace(lo, hi, args.levels) for lo, hi in zip(space.lo, space.hi)]
+    total = args.levels ** len(space)
+    start = state.get("next", 0)
+    grid = product(*axes)
+    for _ in range(start):
+        next(grid)
+    while start < total:
+        count = min(args.batch, total - start)
+        batch = np.array([next(grid) for _ in range(count)])
+        start += count
+        yield batch, {"next": start}
+
+
+def random_search(space, args, state):
+    rounds = -(-args.samples // args.batch)
+    for r in range(state.get("round", 0), rounds):
+        rng = np.random.default_rng([args.seed, r])
+        count = min(args.batch, args.samples - r * args.batch)
+        yield rng.uniform(space.lo, space.hi, (count, len(space))), {"round": r + 1}
+
+
+def evolve_search(space, args, state):
+    """Elitist evolution: keep the best quarter, refill with mutated crossovers of tournament winners."""
+    span = space.hi - space.lo
+    if "population" in state:
+        population, costs = np.array(state["population"]), np.array(state["costs"])
+        first = state["generation"] + 1
+    else:
+        rng = np.random.default_rng([args.seed, 0])
+        population = rng.uniform(space.lo, space.hi, (args.batch, len(space)))
+        population[0] = space.default()
+        costs = yield population, {"generation": 0, "population": population.tolist()}
+        first = 1
+
+    elite = max(1, args.batch // 4)
+    for gen in range(first, args.generations):
+        rng = np.random.default_rng([args.seed, gen])
+        order = np.argsort(costs)
+        parents = population[order[:elite]]
+
+        pairs = rng.integers(0, len(population), (args.batch - elite, 2, 2))
+        winners = np.where(costs[pairs[..., 0]] <= costs[pairs[..., 1]], pairs[..., 0], pairs[..., 1])
+        mix = rng.random((args.batch - elite, len(space))) < 0.5
+        children = np.where(mix, population[winners[:, 0]], population[winners[:, 1]])
+        sigma = 0.15 * span * (1 - gen / args.generations) + 0.01 * span
+        children = np.clip(children + rng.normal(0, 1, children.shape) * sigma, space.lo, space.hi)
+
+        candidates = np.concatenate([parents, children])
+        costs = yield candidates, {"generation": gen, "population": candidates.tolist()}
+        population = candidates
+
+
+METHODS = {"grid": grid_search, "random": random_search, "evolve": evolve_search}
+
+
+# ----------------------------------------------------------
+#  CHECKPOINTS
+# ----------------------------------------------------------
+# Settings a checkpoint may be resumed with changed: a finished evolve
+# search can be carried on from its last population with more generations.
+EXTENDABLE = ("generations",)
+
+
+def _fixed(settings):
+    return {k: v for k, v in settings.items() if k not in EXTENDABLE}
+
+
+def load_checkpoint(path, settings):
+    if not path or not Path(path).exists():
+        return None
+    with open(path) as f:
+        saved = json.load(f)
+    if _fixed(saved["settings"]) != _fixed(settings):
+        raise SystemExit(f"{path} was written for different settings; use another --checkpoint")
+    saved["settings"] = settings
+    return saved
+
+
+def save_checkpoint(path, data):
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+# ----------------------------------------------------------
+def main():
+    ap = argparse.ArgumentParser(description="Tune fuzzy membership breakpoints against a room simulation")
+    ap.add_argument("--controller", choices=sorted(SPACES), default="humidifier")
+    ap.add_argument("--method", choices=sorted(METHODS), default="evolve")
+    ap.add_argument("--levels", type=int, default=3, help="grid points per breakpoint")
+    ap.add_argument("--samples", type=int, default=512, help="random search candidates")
+    ap.add_argument("--generations", type=int, default=15)
+    ap.add_argument("--batch", type=int, default=64, help="candidates per round / population size")
+    ap.add_argument("--rooms", type=int, default=200, help="rooms simulated per candidate")
+    ap.add_argument("--days", type=float, default=1.0)
+    ap.add_argument("--dt", type=float, default=120.0, help="seconds per step")
+    ap.add_argument("--setpoint", type=float, default=50.0)
+    ap.add_argument("--band", type=float, default=5.0, help="comfort band, ±%%RH")
+    ap.add_argument("--energy-weight", type=float, default=0.1, help="cost per device hour per day")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--checkpoint", help="JSON file to save progress to and resume from")
+    args = ap.parse_args()
+
+    space = SPACES[args.controller]
+    settings = {"controller": args.controller, "method": args.method, "rooms": args.rooms,
+                "days": args.days, "dt": args.dt, "setpoint": args.setpoint, "band": args.band,
+                "energy_weight": args.energy_weight, "seed": args.seed, "batch": args.batch,
+                "levels": args.levels, "samples": args.samples, "generations": args.generations}
+    run = load_checkpoint(args.checkpoint, settings)
+    evaluator = Evaluator(args.controller, settings, args.workers)
+    start = time.perf_counter()
+    try:
+        if run is None:
+            baseline = float(evaluator(space.default()[None])[0])
+            run = {"settings": settings, "state": {}, "evaluated": 0, "baseline": baseline,
+                   "best": {"cost": baseline, "params": space.default().tolist()}}
+            save_checkpoint(args.checkpoint, run)
+        else:
+            print(f"resuming from {args.checkpoint}: {run['evaluated']} evaluated, "
+                  f"best {run['best']['cost']:.3f}")
+        print(f"{args.controller}, {args.method} search over {len(space)} breakpoints; "
+              f"baseline cost {run['baseline']:.3f}")
+
+        search = METHODS[args.method](space, args, run["state"])
+        costs = None
+        while True:
+            try:
+                candidates, state = search.send(costs)
+            except StopIteration:
+                break
+            costs = evaluator(candidates)
+            i = int(np.argmin(costs))
+            if costs[i] < run["best"]["cost"]:
+                run["best"] = {"cost": float(costs[i]), "params": candidates[i].tolist()}
+            run["state"] = dict(state, costs=costs.tolist())
+            run["evaluated"] += len(candidates)
+            save_checkpoint(args.checkpoint, run)
+            elapsed = time.perf_counter() - start
+            print(f"{run['evaluated']:>7} evaluated  round best {costs[i]:.3f}  "
+                  f"best {run['best']['cost']:.3f}  {elapsed:6.1f}s")
+    finally:
+        evaluator.close()
+
+    best = space.to_spec(np.array(run["best"]["params"]))
+    print(f"\nbest cost {run['best']['cost']:.3f} (baseline {run['baseline']:.3f})")
+    for name, (kind, params) in best["inputs"][space.var].items():
+        print(f"  {name:<8} {kind}{tuple(round(p, 2) for p in params)}")
+
+
+if __name__ == "__main__":
+    main()